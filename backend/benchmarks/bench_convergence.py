@@ -0,0 +1,92 @@
+"""
+Multi-hop convergence: the legacy per-node shortest-path detector vs the
+current one (the rule can never fire, so no walk is run), plus the
+downstream reach counts behind it: frontier batches under a key budget
+vs sparse matrix powers, as graph density grows.
+
+Usage (from backend/):
+    python benchmarks/bench_convergence.py [--nodes 5000] [--degrees 2 5 10]
+        [--max-keys 262144]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import networkx as nx
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from benchmarks.synthetic import make_transactions
+from core.graph_builder import build_columnar_graph
+from core.graph_search import (
+    DEFAULT_MAX_KEYS,
+    SCIPY_AVAILABLE,
+    downstream_reach,
+    downstream_reach_sparse,
+)
+from core.pattern_detector import detect_multi_hop_convergence
+
+
+def legacy_detect_multi_hop_convergence(G, max_hops=3):
+    """
+    The original implementation, kept here as the baseline.
+    """
+    results = {}
+
+    for node in G.nodes():
+        paths = nx.single_source_shortest_path(G, node, cutoff=max_hops)
+        endpoints = [path[-1] for path in paths.values() if len(path) > 2]
+        results[node] = len(endpoints) >= 3 and len(set(endpoints)) < len(endpoints)
+
+    return results
+
+
+def measure(fn, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=5_000)
+    parser.add_argument("--degrees", type=int, nargs="+", default=[2, 5, 10])
+    parser.add_argument("--max-hops", type=int, default=3)
+    parser.add_argument("--max-keys", type=int, default=DEFAULT_MAX_KEYS)
+    args = parser.parse_args()
+
+    print(f"{'avg degree':>10} {'method':>10} {'seconds':>9} {'peak MB':>9}")
+
+    for degree in args.degrees:
+        graph = build_columnar_graph(
+            make_transactions(args.nodes * degree, n_wallets=args.nodes)
+        )
+        G = graph.nx_graph
+        store = graph.pairs
+        indptr, successors = store.out_adjacency()
+
+        runs = [
+            ("legacy", legacy_detect_multi_hop_convergence, (G, args.max_hops), {}),
+            ("detector", detect_multi_hop_convergence, (graph, args.max_hops), {}),
+            ("reach", downstream_reach, (indptr, successors, args.max_hops),
+             {"max_keys": args.max_keys}),
+        ]
+        if SCIPY_AVAILABLE:
+            runs.append(("sparse", downstream_reach_sparse,
+                         (graph.num_nodes, store.pair_src, store.pair_dst, args.max_hops), {}))
+
+        for name, fn, fn_args, kwargs in runs:
+            seconds, peak = measure(fn, *fn_args, **kwargs)
+            print(f"{degree:>10} {name:>10} {seconds:>9.3f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Edge feature extraction on a synthetic exchange hot wallet.
+
+The legacy implementation rescans the hub's out/in edges for every edge,
+so it is quadratic in the hub degree; the columnar one sorts once.
+
+Usage (from backend/):
+    python benchmarks/bench_edge_features.py [--hub-degree 50000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from benchmarks.synthetic import make_wallet_pool
+from core.graph_builder import build_columnar_graph
+from core.feature_extractor import extract_edge_features
+
+
+def legacy_extract_edge_features(G):
+    """
+    The original implementation, kept here as the baseline.
+    """
+    edge_features = {}
+
+    for u, v, data in G.edges(data=True):
+        amount = data["amount"]
+        timestamp = data["timestamp"]
+
+        prev_times = [
+            d["timestamp"]
+            for _, _, d in G.out_edges(u, data=True)
+            if d["timestamp"] < timestamp
+        ]
+
+        if prev_times:
+            time_delta = (timestamp - max(prev_times)).total_seconds()
+        else:
+            time_delta = 0.0
+
+        incoming_amounts = [
+            d["amount"] for _, _, d in G.in_edges(u, data=True)
+        ]
+        if incoming_amounts:
+            peeling_ratio = amount / (max(incoming_amounts) + 1e-9)
+        else:
+            peeling_ratio = 1.0
+
+        edge_features[(u, v)] = {
+            "amount": amount,
+            "time_delta": time_delta,
+            "peeling_ratio": peeling_ratio,
+        }
+
+    return edge_features
+
+
+def make_hub(degree: int, seed: int = 0) -> pd.DataFrame:
+    """
+    One hub that receives from `degree` wallets and pays out to `degree`
+    other wallets.
+    """
+    rng = np.random.default_rng(seed)
+    pool = make_wallet_pool(2 * degree + 1, seed)
+    hub, senders, receivers = pool[0], pool[1:degree + 1], pool[degree + 1:]
+
+    src = np.concatenate([senders, np.full(degree, hub, dtype=object)])
+    dst = np.concatenate([np.full(degree, hub, dtype=object), receivers])
+    offsets = rng.integers(0, 30 * 24 * 3600, size=2 * degree)
+
+    return pd.DataFrame({
+        "Source_Wallet_ID": src,
+        "Dest_Wallet_ID": dst,
+        "Timestamp": pd.Timestamp("2025-01-01") + pd.to_timedelta(offsets, unit="s"),
+        "Amount": rng.exponential(1.0, size=2 * degree),
+        "Token_Type": "ETH",
+    })
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hub-degree", type=int, default=50_000)
+    parser.add_argument("--legacy-degrees", type=int, nargs="*",
+                        default=[1_000, 2_000, 4_000],
+                        help="the legacy baseline is quadratic; keep these small")
+    args = parser.parse_args()
+
+    degrees = sorted(set(args.legacy_degrees) | {args.hub_degree})
+
+    print(f"{'hub degree':>12} {'columnar s':>12} {'legacy s':>12}")
+    for degree in degrees:
+        graph = build_columnar_graph(make_hub(degree))
+        columnar = timed(extract_edge_features, graph)
+
+        legacy = ""
+        if degree in args.legacy_degrees:
+            legacy = f"{timed(legacy_extract_edge_features, graph.to_networkx()):12.3f}"
+
+        print(f"{degree:>12,} {columnar:>12.3f} {legacy:>12}")
+
+
+if __name__ == "__main__":
+    main()
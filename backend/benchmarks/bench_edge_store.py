@@ -0,0 +1,71 @@
+"""
+Memory cost per transaction: columnar graph + EdgeStore vs nx.MultiDiGraph.
+
+Usage (from backend/):
+    python benchmarks/bench_edge_store.py [--edges 200000] [--pairs-ratio 0.3]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+import networkx as nx
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from benchmarks.synthetic import make_transactions
+from core.graph_builder import build_columnar_graph
+
+
+def traced(fn):
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def build_multidigraph(df):
+    G = nx.MultiDiGraph()
+    G.add_edges_from(
+        (u, v, {"amount": a, "timestamp": t, "token_type": k})
+        for u, v, a, t, k in zip(
+            df["Source_Wallet_ID"],
+            df["Dest_Wallet_ID"],
+            df["Amount"],
+            df["Timestamp"],
+            df["Token_Type"],
+        )
+    )
+    return G
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, default=200_000)
+    parser.add_argument("--wallets", type=int, default=500,
+                        help="small pools produce many parallel transfers")
+    args = parser.parse_args()
+
+    df = make_transactions(args.edges, n_wallets=args.wallets)
+
+    def columnar():
+        graph = build_columnar_graph(df)
+        graph.pairs
+        return graph
+
+    graph, columnar_bytes = traced(columnar)
+    _, multi_bytes = traced(lambda: build_multidigraph(df))
+
+    n = args.edges
+    print(f"transactions         : {n:,}")
+    print(f"wallet pairs         : {graph.num_pairs:,}")
+    print(f"columns + EdgeStore  : {graph.nbytes + graph.pairs.nbytes:,} bytes (array nbytes)")
+    print(f"columnar (traced)    : {columnar_bytes / n:8.1f} bytes / transaction")
+    print(f"nx.MultiDiGraph      : {multi_bytes / n:8.1f} bytes / transaction")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Hand-off from the feature / risk phases to GNN inference at N nodes:
+
+    rows       -> the dict path: X filled row by row from node_features /
+                  base_risks, edge_index from Python lists, torch.tensor()
+                  copies
+    copies     -> normalized feature table, vectorized fill, np.stack'ed
+                  edge_index, torch.tensor() copies
+    zero-copy  -> normalization and risk columns written into one float32
+                  buffer, torch.from_numpy() on it and on the pair CSR
+
+Each variant runs in a forked child; peak memory is reported both as the
+NumPy / Python allocations seen by tracemalloc and as the RSS high-water
+mark (includes torch tensors; Linux only).
+
+Usage (from backend/):
+    python benchmarks/bench_gnn_handoff.py [--nodes 1000000] [--edges 3000000]
+        [--skip-rows]
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import torch
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from benchmarks.synthetic import make_transactions
+from core.feature_extractor import NODE_FEATURES, extract_node_features
+from core.gnn_cpu import SimpleRiskGNN, run_gnn_inference
+from core.gnn_preparer import GNN_FEATURES, RISK_FEATURES, prepare_gnn_data
+from core.graph_builder import build_columnar_graph
+from core.normalizer import min_max_normalize
+
+
+def rows_handoff(graph, features, base_risks, model):
+    """
+    The original path, kept here as the baseline.
+    """
+    table = min_max_normalize(features)
+    wallets = graph.wallets.tolist()
+    wallet_to_idx = {w: i for i, w in enumerate(wallets)}
+
+    X = np.zeros((len(wallets), len(GNN_FEATURES)), dtype=np.float32)
+    for wallet, idx in wallet_to_idx.items():
+        nf = table[wallet]
+        br = base_risks.get(wallet, {})
+        X[idx] = [nf[name] for name in NODE_FEATURES] + [
+            br.get(name, 0.0) for name in RISK_FEATURES
+        ]
+
+    src, dst = [], []
+    store = graph.pairs
+    for u, v in zip(store.pair_src.tolist(), store.pair_dst.tolist()):
+        src.append(wallet_to_idx[wallets[u]])
+        dst.append(wallet_to_idx[wallets[v]])
+    edge_index = np.array([src, dst], dtype=np.int64)
+
+    with torch.no_grad():
+        return model(torch.tensor(X), torch.tensor(edge_index)).numpy()
+
+
+def copies_handoff(graph, features, base_risks, model):
+    gnn_data = prepare_gnn_data(graph, min_max_normalize(features), base_risks)
+    X = torch.tensor(gnn_data["X"], dtype=torch.float32)
+    edge_index = torch.tensor(np.stack(gnn_data["edge_index"]), dtype=torch.long)
+
+    with torch.no_grad():
+        return model(X, edge_index).numpy()
+
+
+def zero_copy_handoff(graph, features, base_risks, model):
+    gnn_data = prepare_gnn_data(graph, features, base_risks, normalize=True)
+    return run_gnn_inference(gnn_data, model=model)
+
+
+VARIANTS = {
+    "rows": rows_handoff,
+    "copies": copies_handoff,
+    "zero-copy": zero_copy_handoff,
+}
+
+
+def _status_kb(field):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _run(name, inputs, conn):
+    # Reset the RSS high-water mark to the current RSS
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+    rss_start = _status_kb("VmRSS")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    scores = VARIANTS[name](*inputs)
+    seconds = time.perf_counter() - start
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    rss_peak = _status_kb("VmHWM")
+    rss = None if rss_start is None or rss_peak is None else (rss_peak - rss_start) * 1024
+    conn.send((seconds, traced_peak, rss, np.asarray(scores).reshape(-1)))
+    conn.close()
+
+
+def run_variant(name, inputs):
+    ctx = mp.get_context("fork")
+    parent, child = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_run, args=(name, inputs, child))
+    process.start()
+    result = parent.recv()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--edges", type=int, default=3_000_000)
+    parser.add_argument("--skip-rows", action="store_true",
+                        help="skip the slow row-by-row baseline")
+    args = parser.parse_args()
+
+    graph = build_columnar_graph(make_transactions(args.edges, n_wallets=args.nodes))
+    features = extract_node_features(graph)
+
+    # Synthetic base risks for every wallet (scores do not matter here)
+    rng = np.random.default_rng(0)
+    scores = rng.random((graph.num_nodes, len(RISK_FEATURES))).tolist()
+    base_risks = {
+        w: dict(zip(RISK_FEATURES, row)) for w, row in zip(graph.wallets.tolist(), scores)
+    }
+    graph.pairs.in_adjacency()
+
+    torch.manual_seed(0)
+    model = SimpleRiskGNN(len(GNN_FEATURES)).eval()
+    inputs = (graph, features, base_risks, model)
+
+    print(f"nodes: {graph.num_nodes:,}  pairs: {graph.num_pairs:,}"
+          f"  threads: {torch.get_num_threads()}")
+    print(f"{'variant':>10} {'seconds':>9} {'traced MB':>10} {'RSS MB':>8} {'max diff':>9}")
+
+    reference = None
+    for name in VARIANTS:
+        if name == "rows" and args.skip_rows:
+            continue
+        seconds, traced, rss, out = run_variant(name, inputs)
+        if reference is None:
+            reference = out
+        rss_mb = "-" if rss is None else f"{rss / 2**20:.0f}"
+        diff = np.abs(out - reference).max()
+        print(f"{name:>10} {seconds:>9.2f} {traced / 2**20:>10.0f} {rss_mb:>8} {diff:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
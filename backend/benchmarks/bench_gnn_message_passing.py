@@ -0,0 +1,97 @@
+"""
+SimpleRiskGNN message passing: legacy per-edge Python loop vs index_add_
+scatter vs a precomputed sparse CSR adjacency, at growing edge counts and
+intra-op thread counts.
+
+Usage (from backend/):
+    python benchmarks/bench_gnn_message_passing.py [--edges 10000 100000 1000000]
+        [--threads 1 4] [--legacy-max-edges 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import torch
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from core.gnn_cpu import SimpleRiskGNN, build_normalized_adjacency
+
+NUM_FEATURES = 12
+
+
+def legacy_forward(model, X, edge_index):
+    """
+    The original forward pass, kept here as the baseline.
+    """
+    N = X.size(0)
+    agg = torch.zeros_like(X)
+    src, dst = edge_index
+
+    for i in range(src.size(0)):
+        agg[dst[i]] += X[src[i]]
+
+    deg = torch.zeros(N)
+    for d in dst:
+        deg[d] += 1
+
+    deg = deg.unsqueeze(1).clamp(min=1)
+    agg = agg / deg
+
+    out = model.linear(agg)
+    return torch.sigmoid(out).squeeze()
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, torch.get_num_threads()])
+    parser.add_argument("--legacy-max-edges", type=int, default=100_000)
+    args = parser.parse_args()
+    threads_list = sorted(set(args.threads))
+
+    torch.manual_seed(0)
+    model = SimpleRiskGNN(NUM_FEATURES).eval()
+
+    print(f"{'edges':>9} {'threads':>7} {'method':>8} {'seconds':>9} {'max diff':>9}")
+
+    for num_edges in args.edges:
+        num_nodes = max(num_edges // 5, 1)
+        X = torch.rand(num_nodes, NUM_FEATURES)
+        edge_index = torch.randint(0, num_nodes, (2, num_edges))
+
+        for threads in threads_list:
+            torch.set_num_threads(threads)
+
+            with torch.no_grad():
+                t_scatter, scatter = timed(model, X, edge_index)
+                t_build, adj = timed(build_normalized_adjacency, edge_index, num_nodes)
+                t_sparse, sparse = timed(model, X, adj=adj)
+
+                rows = [
+                    ("scatter", t_scatter, scatter),
+                    ("adj", t_build, None),
+                    ("sparse", t_sparse, sparse),
+                ]
+                # The loop is single-threaded Python; time it once per size
+                reference = scatter
+                if num_edges <= args.legacy_max_edges and threads == threads_list[0]:
+                    t_legacy, reference = timed(legacy_forward, model, X, edge_index)
+                    rows.insert(0, ("legacy", t_legacy, reference))
+
+            for name, seconds, out in rows:
+                diff = "-" if out is None else f"{(out - reference).abs().max().item():.1e}"
+                print(f"{num_edges:>9} {threads:>7} {name:>8} {seconds:>9.4f} {diff:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Full-batch vs mini-batch GNN inference: time, peak NumPy working memory
+(tracemalloc; X and the CSR are allocated beforehand and not counted) and
+max score difference, for several edge budgets and thread pool sizes.
+
+Usage (from backend/):
+    python benchmarks/bench_gnn_minibatch.py [--nodes 1000000] [--edges 5000000]
+        [--batch-edges 100000 1000000] [--workers 1 4]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import torch
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from core.gnn_cpu import SimpleRiskGNN, in_adjacency, run_gnn_inference, run_gnn_minibatch
+from core.gnn_preparer import GNN_FEATURES
+
+
+def traced(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--edges", type=int, default=5_000_000)
+    parser.add_argument("--batch-edges", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    X = rng.random((args.nodes, len(GNN_FEATURES)), dtype=np.float32)
+    edge_index = rng.integers(0, args.nodes, size=(2, args.edges))
+    gnn_data = {
+        "X": X,
+        "edge_index": edge_index,
+        "in_csr": in_adjacency(edge_index, args.nodes),
+    }
+
+    torch.manual_seed(0)
+    model = SimpleRiskGNN(len(GNN_FEATURES)).eval()
+
+    print(f"nodes: {args.nodes:,}  edges: {args.edges:,}  torch threads: {torch.get_num_threads()}")
+    print(f"{'mode':>10} {'batch':>9} {'workers':>7} {'seconds':>8} {'peak MB':>8} {'max diff':>9}")
+
+    full, seconds, peak = traced(lambda: run_gnn_inference(gnn_data, model=model))
+    print(f"{'full':>10} {'-':>9} {'-':>7} {seconds:>8.2f} {peak / 2**20:>8.0f} {'-':>9}")
+
+    for batch in args.batch_edges:
+        for workers in sorted(set(args.workers)):
+            out, seconds, peak = traced(
+                lambda: run_gnn_minibatch(
+                    gnn_data, model=model, max_edges=batch, num_workers=workers
+                )
+            )
+            diff = np.abs(out - full).max()
+            print(f"{'minibatch':>10} {batch:>9,} {workers:>7} {seconds:>8.2f}"
+                  f" {peak / 2**20:>8.0f} {diff:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+GNN inference runtimes on CPU: eager under torch.no_grad (the old path)
+vs eager / TorchScript / dynamic int8 / torch.compile under
+torch.inference_mode (see core.gnn_cpu.deploy_model).
+
+Reports per-call latency on a small graph, throughput (nodes per second)
+on a large one, and the max score difference to eager; exits non-zero if
+a runtime is outside its tolerance.
+
+Usage (from backend/):
+    python benchmarks/bench_gnn_runtime.py [--small-nodes 2000] [--nodes 1000000]
+        [--threads 1 4] [--repeat 20] [--no-compile]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import torch
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from core.gnn_cpu import (
+    SimpleRiskGNN,
+    csr_adjacency,
+    deploy_model,
+    in_adjacency,
+    run_gnn_inference,
+)
+from core.gnn_preparer import GNN_FEATURES
+
+# Max |score - eager score| accepted per runtime
+TOLERANCE = {"script": 1e-5, "quantized": 1e-2, "compile": 1e-5}
+
+
+def make_inputs(num_nodes, avg_degree, seed=0):
+    rng = np.random.default_rng(seed)
+    num_edges = num_nodes * avg_degree
+    edge_index = rng.integers(0, num_nodes, size=(2, num_edges))
+    return {
+        "X": rng.random((num_nodes, len(GNN_FEATURES)), dtype=np.float32),
+        "edge_index": edge_index,
+        "in_csr": in_adjacency(edge_index, num_nodes),
+    }
+
+
+def no_grad_inference(gnn_data, model):
+    """
+    The previous runtime, kept here as the baseline.
+    """
+    X = torch.tensor(gnn_data["X"])
+    adj = csr_adjacency(*gnn_data["in_csr"], X.size(0))
+    with torch.no_grad():
+        return model(X, adj=adj).numpy()
+
+
+def timings(fn, repeat):
+    fn()  # warm-up (compiles / specializes)
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--small-nodes", type=int, default=2_000)
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--degree", type=int, default=5)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, torch.get_num_threads()])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-compile", action="store_true",
+                        help="skip torch.compile (slow first call, needs a C++ compiler)")
+    args = parser.parse_args()
+
+    small = make_inputs(args.small_nodes, args.degree)
+    large = make_inputs(args.nodes, args.degree, seed=1)
+
+    torch.manual_seed(0)
+    eager = SimpleRiskGNN(len(GNN_FEATURES)).eval()
+
+    # Same weights everywhere; the eager module itself is not modified
+    runtimes = {"no_grad": eager, "eager": eager}
+    for name in ("script", "quantized", "compile"):
+        if name == "compile" and args.no_compile:
+            continue
+        runtimes[name] = deploy_model(eager, name)
+
+    reference = run_gnn_inference(large, model=eager)
+    print(f"small: {args.small_nodes:,} nodes  large: {args.nodes:,} nodes"
+          f"  edges/node: {args.degree}")
+    print(f"{'runtime':>10} {'threads':>7} {'latency ms':>11} {'nodes/s':>12}"
+          f" {'max diff':>9} {'check':>6}")
+
+    failed = False
+    for threads in sorted(set(args.threads)):
+        torch.set_num_threads(threads)
+        for name, model in runtimes.items():
+            if name == "no_grad":
+                def run(data, model=model):
+                    return no_grad_inference(data, model)
+            else:
+                def run(data, model=model):
+                    return run_gnn_inference(data, model=model)
+
+            try:
+                latency = statistics.median(timings(lambda: run(small), args.repeat))
+                throughput = args.nodes / min(timings(lambda: run(large), 3))
+            except Exception as exc:
+                print(f"{name:>10} {threads:>7}  unavailable: {type(exc).__name__}")
+                continue
+
+            diff = float(np.abs(run(large) - reference).max())
+            ok = diff <= TOLERANCE.get(name, 1e-6)
+            failed |= not ok
+            print(f"{name:>10} {threads:>7} {latency * 1000:>11.3f} {throughput:>12,.0f}"
+                  f" {diff:>9.1e} {'ok' if ok else 'FAIL':>6}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
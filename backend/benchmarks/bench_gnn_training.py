@@ -0,0 +1,72 @@
+"""
+End-to-end GNN training time on a synthetic graph: analysis, then
+core.train_gnn epochs over the cached adjacency against synthetic labels
+(benchmarks.synthetic.make_labels).
+The checkpoint goes to a temporary file, not the deployed one.
+
+Usage (from backend/):
+    python benchmarks/bench_gnn_training.py [--edges 1000000] [--wallets 200000]
+        [--epochs 300] [--threads 4]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from benchmarks.synthetic import make_labels, make_transactions
+from core.gnn_cpu import load_model
+from core.pipeline import run_full_analysis
+from core.train_gnn import train_from_analysis
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--wallets", type=int, default=200_000)
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "tx.csv")
+        make_transactions(args.edges, n_wallets=args.wallets).to_csv(csv_path, index=False)
+
+        started = time.perf_counter()
+        results = run_full_analysis(csv_path, cache_dir=tmp, memoize=False)
+        analysis = time.perf_counter() - started
+
+        graph = results["graph"]
+        print(f"transactions: {graph.num_edges:,}  wallets: {graph.num_nodes:,}"
+              f"  pairs: {graph.num_pairs:,}")
+
+        labels = make_labels(graph)
+        started = time.perf_counter()
+        trained = train_from_analysis(
+            results,
+            labels=labels,
+            path=os.path.join(tmp, "gnn.pt"),
+            epochs=args.epochs,
+            num_threads=args.threads,
+            log=lambda line: None,
+        )
+        training = time.perf_counter() - started
+        assert load_model(trained["path"]) is not None
+
+    history = trained["history"]
+    epoch_ms = statistics.median(h["seconds"] for h in history) * 1000
+    print(f"analysis              : {analysis:8.1f} s")
+    print(f"training ({len(history)} epochs): {training:8.1f} s")
+    print(f"median epoch          : {epoch_ms:8.1f} ms"
+          f"  ({graph.num_nodes / epoch_ms * 1000:,.0f} nodes/s)")
+    print(f"best epoch            : {trained['epoch']}  val loss {trained['val_loss']:.5f}"
+          f"  (first epoch {history[0]['val_loss']:.5f})")
+
+
+if __name__ == "__main__":
+    main()
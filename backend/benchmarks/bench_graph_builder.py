@@ -0,0 +1,75 @@
+"""
+Graph construction throughput: legacy iterrows builder vs columnar builder.
+
+Usage (from backend/):
+    python benchmarks/bench_graph_builder.py [--sizes 100000 1000000 10000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import networkx as nx
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from benchmarks.synthetic import make_transactions
+from core.graph_builder import build_columnar_graph, build_transaction_graph
+
+
+def legacy_build_transaction_graph(df):
+    """
+    The original row-by-row builder, kept here as the baseline.
+    """
+    G = nx.DiGraph()
+
+    for _, row in df.iterrows():
+        G.add_edge(
+            row["Source_Wallet_ID"],
+            row["Dest_Wallet_ID"],
+            amount=row["Amount"],
+            timestamp=row["Timestamp"],
+            token_type=row["Token_Type"],
+        )
+
+    return G
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--legacy-max", type=int, default=1_000_000,
+                        help="skip the iterrows baseline above this size")
+    parser.add_argument("--nx-max", type=int, default=1_000_000,
+                        help="skip the NetworkX adapter above this size")
+    args = parser.parse_args()
+
+    print(f"{'edges':>12} {'builder':>22} {'seconds':>10} {'rows/sec':>14}")
+
+    for n in args.sizes:
+        df = make_transactions(n)
+
+        runs = [("columnar", build_columnar_graph)]
+        if n <= args.nx_max:
+            runs.append(("columnar + nx view", build_transaction_graph))
+        if n <= args.legacy_max:
+            runs.append(("legacy iterrows", legacy_build_transaction_graph))
+
+        for name, fn in runs:
+            seconds = timed(fn, df)
+            print(f"{n:>12,} {name:>22} {seconds:>10.3f} {n / seconds:>14,.0f}")
+
+        del df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Response time and size of the large API payloads (/api/graph/ and
+/api/risk-scores/): DRF's JSONRenderer over row dicts (the old path) vs
+the fast renderer over rows or columns, and the cached-bytes path that
+repeated GETs take. Sizes are reported raw, gzip and brotli (if
+installed).
+
+Usage (from backend/):
+    python benchmarks/bench_json_payloads.py [--edges 200000] [--wallets 40000]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, "server"))
+
+import django
+from django.conf import settings
+
+settings.configure()
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+
+from api.payloads import BROTLI_AVAILABLE, ORJSON_AVAILABLE, compress, dumps
+from benchmarks.synthetic import make_transactions
+from core.graph_view import graph_page
+from core.pipeline import run_full_analysis
+from core.risk_table import RISK_SCORE_FIELDS, risk_columns, risk_records
+
+
+def timed(fn, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(name, build_rows, build_columns):
+    drf = JSONRenderer()
+
+    cases = [
+        ("DRF JSONRenderer, rows", lambda: drf.render(build_rows())),
+        ("fast renderer, rows", lambda: dumps(build_rows())),
+        ("fast renderer, columns", lambda: dumps(build_columns())),
+    ]
+
+    print(f"\n{name}")
+    for label, fn in cases:
+        seconds, body = timed(fn)
+        print(f"  {label:<26}: {seconds * 1000:9.1f} ms  {len(body):>12,} bytes")
+
+    # Repeated GET: the cached body is only copied into the response
+    seconds, _ = timed(lambda: bytes(bytearray(body)))
+    print(f"  {'cached bytes':<26}: {seconds * 1000:9.1f} ms")
+
+    encodings = ["gzip"] + (["br"] if BROTLI_AVAILABLE else [])
+    for encoding in encodings:
+        seconds, packed = timed(lambda: compress(body, encoding), repeat=1)
+        print(
+            f"  {encoding + ' (columns, once)':<26}: {seconds * 1000:9.1f} ms"
+            f"  {len(packed):>12,} bytes"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, default=200_000)
+    parser.add_argument("--wallets", type=int, default=40_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "tx.csv")
+        make_transactions(args.edges, n_wallets=args.wallets).to_csv(csv_path, index=False)
+        results = run_full_analysis(csv_path, cache_dir=tmp, memoize=False)
+
+    graph = results["graph"]
+    print(f"transactions: {graph.num_edges:,}  wallets: {graph.num_nodes:,}"
+          f"  pairs: {graph.num_pairs:,}")
+    print(f"orjson: {ORJSON_AVAILABLE}  brotli: {BROTLI_AVAILABLE}")
+
+    # Serving arrays are built once per analysis; time them separately
+    seconds, _ = timed(lambda: (graph_page(results, top_k=1), risk_columns(results)), repeat=1)
+    print(f"serving arrays (once)     : {seconds * 1000:9.1f} ms")
+
+    report(
+        "/api/graph/",
+        lambda: graph_page(results),
+        lambda: graph_page(results, columnar=True),
+    )
+    columns = risk_columns(results)
+    report(
+        "/api/risk-scores/",
+        lambda: {"wallets": risk_records(columns, RISK_SCORE_FIELDS)},
+        lambda: {"wallets": risk_records(columns, RISK_SCORE_FIELDS, columnar=True)},
+    )
+
+
+if __name__ == "__main__":
+    main()
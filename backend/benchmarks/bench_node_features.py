@@ -0,0 +1,89 @@
+"""
+Node feature extraction: legacy per-node NetworkX loop vs vectorized
+group reductions over the edge columns.
+
+Usage (from backend/):
+    python benchmarks/bench_node_features.py [--edges 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from benchmarks.synthetic import make_transactions
+from core.graph_builder import build_columnar_graph
+from core.feature_extractor import extract_node_features
+
+
+def legacy_extract_node_features(G):
+    """
+    The original implementation, kept here as the baseline.
+    """
+    node_features = {}
+
+    for node in G.nodes():
+        in_edges = list(G.in_edges(node, data=True))
+        out_edges = list(G.out_edges(node, data=True))
+
+        in_degree = len(in_edges)
+        out_degree = len(out_edges)
+
+        total_inflow = sum(e[2]["amount"] for e in in_edges)
+        total_outflow = sum(e[2]["amount"] for e in out_edges)
+
+        tx_count = in_degree + out_degree
+
+        timestamps = [e[2]["timestamp"] for e in in_edges + out_edges]
+        if timestamps:
+            active_time_span = (max(timestamps) - min(timestamps)).total_seconds()
+        else:
+            active_time_span = 0.0
+
+        flow_imbalance = abs(total_inflow - total_outflow) / (
+            total_inflow + total_outflow + 1e-9
+        )
+
+        node_features[node] = {
+            "in_degree": in_degree,
+            "out_degree": out_degree,
+            "total_inflow": total_inflow,
+            "total_outflow": total_outflow,
+            "flow_imbalance": flow_imbalance,
+            "tx_count": tx_count,
+            "active_time_span": active_time_span,
+        }
+
+    return node_features
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = make_transactions(args.edges)
+    graph = build_columnar_graph(df)
+    G = graph.to_networkx()
+
+    vectorized = timed(extract_node_features, graph)
+    legacy = timed(legacy_extract_node_features, G)
+
+    print(f"edges      : {args.edges:,}")
+    print(f"nodes      : {graph.num_nodes:,}")
+    print(f"legacy     : {legacy:8.3f} s")
+    print(f"vectorized : {vectorized:8.3f} s")
+    print(f"speedup    : {legacy / vectorized:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
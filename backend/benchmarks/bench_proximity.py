@@ -0,0 +1,60 @@
+"""
+Proximity risk: per-wallet shortest_path loop vs one multi-source BFS,
+as the suspicious set grows.
+
+Usage (from backend/):
+    python benchmarks/bench_proximity.py [--edges 20000] [--nodes 20000] [--wallets 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from benchmarks.synthetic import make_transactions
+from core.graph_builder import build_columnar_graph
+from core.risk_scorer import compute_proximity_risk, compute_proximity_scores
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, default=20_000)
+    parser.add_argument("--nodes", type=int, default=20_000,
+                        help="sparse graphs make most searches exhaustive")
+    parser.add_argument("--wallets", type=int, default=200,
+                        help="gated wallets scored by the legacy loop")
+    parser.add_argument("--suspicious", type=int, nargs="+",
+                        default=[10, 100, 500, 1000])
+    args = parser.parse_args()
+
+    graph = build_columnar_graph(make_transactions(args.edges, n_wallets=args.nodes))
+    G = graph.nx_graph
+    rng = np.random.default_rng(0)
+    gated = rng.choice(graph.wallets, args.wallets, replace=False).tolist()
+
+    print(f"graph: {graph.num_nodes:,} nodes, {graph.num_pairs:,} edges; "
+          f"legacy scores {args.wallets} gated wallets")
+    print(f"{'suspicious':>11} {'legacy s':>10} {'BFS s (all)':>12} {'speedup':>9}")
+
+    for k in args.suspicious:
+        suspicious = set(rng.choice(graph.wallets, k, replace=False).tolist())
+
+        start = time.perf_counter()
+        for wallet in gated:
+            compute_proximity_risk(G, suspicious, wallet)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compute_proximity_scores(graph, suspicious)
+        bfs = time.perf_counter() - start
+
+        print(f"{k:>11,} {legacy:>10.3f} {bfs:>12.4f} {legacy / bfs:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
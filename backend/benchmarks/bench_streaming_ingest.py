@@ -0,0 +1,86 @@
+"""
+Peak RSS of CSV ingestion: full DataFrame load vs chunked streaming.
+
+Each mode runs in its own subprocess so peak RSS is measured in isolation.
+
+Usage (from backend/):
+    python benchmarks/bench_streaming_ingest.py [--size-mb 1024] [--csv path]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+ROWS_PER_CHUNK = 500_000
+
+
+def write_csv(path: str, size_mb: int):
+    from benchmarks.synthetic import make_transactions, make_wallet_pool
+
+    pool = make_wallet_pool(1_000_000)
+    seed = 0
+    with open(path, "w") as f:
+        while f.tell() < size_mb * 1024 * 1024:
+            df = make_transactions(ROWS_PER_CHUNK, seed=seed, pool=pool)
+            df.to_csv(f, index=False, header=(seed == 0))
+            seed += 1
+
+
+def run_mode(mode: str, csv_path: str, chunksize: int):
+    from core.graph_builder import (
+        load_transactions,
+        build_columnar_graph,
+        stream_columnar_graph,
+    )
+
+    start = time.perf_counter()
+    if mode == "full":
+        graph = build_columnar_graph(load_transactions(csv_path))
+    else:
+        graph = stream_columnar_graph(csv_path, chunksize=chunksize)
+    seconds = time.perf_counter() - start
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode},{graph.num_edges},{seconds:.2f},{peak_mb:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default="/tmp/smurf_proof_bench.csv")
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--chunksize", type=int, default=250_000)
+    parser.add_argument("--mode", choices=["full", "stream"],
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.csv, args.chunksize)
+        return
+
+    if not os.path.exists(args.csv):
+        print(f"Writing ~{args.size_mb} MB synthetic CSV to {args.csv} ...")
+        write_csv(args.csv, args.size_mb)
+
+    file_mb = os.path.getsize(args.csv) / 1024 / 1024
+    print(f"CSV size: {file_mb:,.0f} MB")
+    print(f"{'mode':>8} {'rows':>12} {'seconds':>9} {'peak RSS MB':>12} {'RSS / file':>11}")
+
+    for mode in ("full", "stream"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--csv", args.csv,
+             "--chunksize", str(args.chunksize)],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+        _, rows, seconds, peak_mb = out.split(",")
+        print(f"{mode:>8} {int(rows):>12,} {float(seconds):>9.2f} "
+              f"{int(peak_mb):>12,} {int(peak_mb) / file_mb:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
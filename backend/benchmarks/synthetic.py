@@ -0,0 +1,67 @@
+"""
+Synthetic transaction generator shared by the benchmark scripts.
+"""
+
+import numpy as np
+import pandas as pd
+
+TOKEN_TYPES = np.array(["ETH", "USDT", "USDC", "DAI"], dtype=object)
+
+
+def make_wallet_pool(n_wallets: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    raw = rng.integers(0, 2**63 - 1, size=(n_wallets, 3), dtype=np.int64)
+    return np.array(
+        ["0x" + "".join(f"{int(x):016x}" for x in row)[:40] for row in raw],
+        dtype=object,
+    )
+
+
+def make_transactions(
+    n_edges: int,
+    n_wallets: int = None,
+    seed: int = 0,
+    start="2025-01-01",
+    span_seconds: int = 90 * 24 * 3600,
+    pool: np.ndarray = None,
+) -> pd.DataFrame:
+    """
+    Random transfers between a fixed wallet pool, in the CSV column layout.
+    """
+    if pool is None:
+        if n_wallets is None:
+            n_wallets = max(10, n_edges // 5)
+        pool = make_wallet_pool(n_wallets, seed)
+
+    n_wallets = len(pool)
+    rng = np.random.default_rng(seed)
+
+    src = rng.integers(0, n_wallets, size=n_edges)
+    dst = rng.integers(0, n_wallets, size=n_edges)
+    offsets = rng.integers(0, span_seconds, size=n_edges)
+
+    return pd.DataFrame({
+        "Source_Wallet_ID": pool[src],
+        "Dest_Wallet_ID": pool[dst],
+        "Timestamp": pd.Timestamp(start) + pd.to_timedelta(offsets, unit="s"),
+        "Amount": rng.exponential(1.0, size=n_edges),
+        "Token_Type": TOKEN_TYPES[rng.integers(0, len(TOKEN_TYPES), size=n_edges)],
+    })
+
+
+def make_labels(graph, fraction: float = 0.1) -> dict:
+    """
+    Synthetic 0/1 labels for a ColumnarGraph: 1 for the `fraction` of
+    wallets whose senders have the highest mean out-degree (a signal the
+    GNN's neighbor aggregation can pick up), 0 for the rest.
+    """
+    store = graph.pairs
+    n = graph.num_nodes
+    out_degree = np.bincount(store.pair_src, minlength=n)
+    in_degree = np.bincount(store.pair_dst, minlength=n)
+    sender_degree = np.bincount(
+        store.pair_dst, weights=out_degree[store.pair_src], minlength=n
+    ) / np.maximum(in_degree, 1)
+
+    labels = (sender_degree > np.quantile(sender_degree, 1 - fraction)).astype(float)
+    return dict(zip(graph.wallets.tolist(), labels.tolist()))
@@ -0,0 +1,83 @@
+"""
+Append notifications for live alert streams.
+
+An append stores its result under a new dataset id (see core.incremental).
+The feed records each parent -> child link as a small file in a directory
+shared by every worker process, so a stream connected to any worker can
+follow a dataset through its appends:
+
+    {parent_id}.next  ->  {"dataset_id": child_id, "start": first new row}
+
+A second append to the same parent replaces the link (last one wins).
+"""
+
+import os
+import time
+
+from core.jobs import read_record, write_record
+
+DEFAULT_POLL_SECONDS = 0.5
+
+# Links older than this are removed when a new one is published
+DEFAULT_MAX_AGE_SECONDS = 24 * 3600
+
+
+def _link_path(feed_dir: str, dataset_id: str) -> str:
+    return os.path.join(feed_dir, f"{dataset_id}.next")
+
+
+def publish_append(
+    feed_dir: str,
+    parent_id: str,
+    dataset_id: str,
+    start: int,
+    max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+):
+    """
+    Record that `dataset_id` is `parent_id` plus the rows from `start` on.
+    """
+    os.makedirs(feed_dir, exist_ok=True)
+    write_record(_link_path(feed_dir, parent_id), {"dataset_id": dataset_id, "start": int(start)})
+
+    now = time.time()
+    for name in os.listdir(feed_dir):
+        if not name.endswith(".next"):
+            continue
+        path = os.path.join(feed_dir, name)
+        try:
+            if now - os.path.getmtime(path) > max_age_seconds:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def next_append(feed_dir: str, dataset_id: str):
+    """
+    {"dataset_id", "start"} of the append made to `dataset_id`, or None.
+    """
+    return read_record(_link_path(feed_dir, dataset_id))
+
+
+def follow_appends(
+    feed_dir: str,
+    dataset_id: str,
+    idle_seconds: float,
+    poll_seconds: float = DEFAULT_POLL_SECONDS,
+):
+    """
+    Yield the appends made after `dataset_id`, in order, following each
+    one to its own appends. Stops once none arrives for `idle_seconds`.
+    """
+    deadline = time.monotonic() + idle_seconds
+
+    while True:
+        link = next_append(feed_dir, dataset_id)
+        if link is not None:
+            yield link
+            dataset_id = link["dataset_id"]
+            deadline = time.monotonic() + idle_seconds
+            continue
+
+        if time.monotonic() >= deadline:
+            return
+        time.sleep(poll_seconds)
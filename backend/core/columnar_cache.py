@@ -0,0 +1,240 @@
+"""
+Binary columnar cache for transaction files.
+
+A CSV is parsed once and its ColumnarGraph columns are written to a
+bundle keyed by the SHA-256 of the file content. Repeat analyses of the
+same content memory-map the bundle instead of parsing again.
+
+Bundle formats:
+    Arrow IPC (edges.arrow / nodes.arrow)  if pyarrow is installed
+    NumPy .npy files                       otherwise
+Both are memory-mapped on load.
+
+The cache is bounded: after each write, bundles older than the age
+budget and then the least recently used ones beyond the byte budget are
+removed (prune_bundles). Loading a bundle marks it as used.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from core.columnar_graph import ColumnarGraph
+
+# Optional (faster, language-neutral bundle format)
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SMURF_PROOF_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "smurf_proof_cache"),
+)
+
+# Cache budgets; SMURF_PROOF_CACHE_MAX_BYTES / _MAX_AGE_SECONDS override them
+DEFAULT_MAX_BYTES = int(os.environ.get("SMURF_PROOF_CACHE_MAX_BYTES", 8 * 1024 ** 3))
+DEFAULT_MAX_AGE_SECONDS = float(
+    os.environ.get("SMURF_PROOF_CACHE_MAX_AGE_SECONDS", 7 * 24 * 3600)
+)
+
+EDGE_COLUMNS = ("src", "dst", "amount", "timestamp", "token_codes")
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    """
+    SHA-256 of the file content, read in blocks.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def bundle_dir(digest: str, cache_dir: str = None) -> str:
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, digest)
+
+
+def has_bundle(digest: str, cache_dir: str = None) -> bool:
+    return os.path.isdir(bundle_dir(digest, cache_dir))
+
+
+def save_bundle(
+    graph: ColumnarGraph,
+    digest: str,
+    cache_dir: str = None,
+    max_bytes: int = None,
+    max_age_seconds: float = None,
+) -> str:
+    """
+    Write the graph columns to the bundle for `digest`, then prune the
+    other bundles to the cache budgets (see prune_bundles).
+
+    Written to a scratch directory first and renamed into place, so a
+    concurrent reader never sees a half-written bundle.
+    """
+    target = bundle_dir(digest, cache_dir)
+    parent = os.path.dirname(target)
+    os.makedirs(parent, exist_ok=True)
+
+    scratch = tempfile.mkdtemp(dir=parent, prefix=".tmp-")
+    try:
+        if ARROW_AVAILABLE:
+            _write_arrow(graph, scratch)
+        else:
+            _write_npy(graph, scratch)
+        os.replace(scratch, target)
+    except OSError:
+        # Another worker finished the same bundle first
+        shutil.rmtree(scratch, ignore_errors=True)
+        if not has_bundle(digest, cache_dir):
+            raise
+
+    prune_bundles(cache_dir, max_bytes, max_age_seconds, keep=(digest,))
+    return target
+
+
+def load_bundle(digest: str, cache_dir: str = None):
+    """
+    Memory-map a cached bundle. Returns None if there is none.
+    """
+    path = bundle_dir(digest, cache_dir)
+
+    if os.path.exists(os.path.join(path, "edges.arrow")):
+        read = _read_arrow
+    elif os.path.exists(os.path.join(path, "src.npy")):
+        read = _read_npy
+    else:
+        return None
+
+    try:
+        graph = read(path)
+    except FileNotFoundError:
+        # Pruned by another process in between
+        return None
+    _touch(path)
+    return graph
+
+
+def prune_bundles(
+    cache_dir: str = None,
+    max_bytes: int = None,
+    max_age_seconds: float = None,
+    keep=(),
+) -> list:
+    """
+    Remove bundles unused for longer than `max_age_seconds`, then the
+    least recently used ones until the rest fit in `max_bytes` (defaults
+    DEFAULT_MAX_AGE_SECONDS / DEFAULT_MAX_BYTES). Bundles in `keep` stay.
+    Returns the removed digests.
+
+    Readers that already memory-mapped a removed bundle keep their view.
+    """
+    root = cache_dir or DEFAULT_CACHE_DIR
+    max_bytes = DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+    max_age = DEFAULT_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+
+    bundles = []
+    try:
+        names = os.listdir(root)
+    except FileNotFoundError:
+        return []
+    for name in names:
+        path = os.path.join(root, name)
+        # Scratch directories of writes in progress start with "."
+        if name.startswith(".") or not os.path.isdir(path):
+            continue
+        try:
+            used = os.path.getmtime(path)
+            size = sum(entry.stat().st_size for entry in os.scandir(path))
+        except FileNotFoundError:
+            continue
+        bundles.append((used, size, name))
+
+    # Oldest first
+    bundles.sort()
+    total = sum(size for _, size, _ in bundles)
+    now = time.time()
+
+    removed = []
+    for used, size, name in bundles:
+        if name in keep:
+            continue
+        if now - used <= max_age and total <= max_bytes:
+            continue
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+        total -= size
+        removed.append(name)
+    return removed
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+# -------------------------------------------------
+# NumPy bundle
+# -------------------------------------------------
+def _write_npy(graph, path):
+    for name in EDGE_COLUMNS:
+        np.save(os.path.join(path, f"{name}.npy"), getattr(graph, name))
+
+    # Fixed-width unicode so the id arrays need no pickling
+    np.save(os.path.join(path, "wallets.npy"), graph.wallets.astype(str))
+    np.save(os.path.join(path, "token_types.npy"), graph.token_types.astype(str))
+
+
+def _read_npy(path):
+    columns = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in EDGE_COLUMNS
+    }
+    wallets = np.load(os.path.join(path, "wallets.npy")).astype(object)
+    token_types = np.load(os.path.join(path, "token_types.npy")).astype(object)
+
+    return ColumnarGraph(wallets=wallets, token_types=token_types, **columns)
+
+
+# -------------------------------------------------
+# Arrow IPC bundle
+# -------------------------------------------------
+def _write_arrow(graph, path):
+    edges = pa.table({name: getattr(graph, name) for name in EDGE_COLUMNS})
+    nodes = pa.table({"wallet": pa.array(graph.wallets.tolist(), pa.string())})
+    tokens = pa.table({"token_type": pa.array(graph.token_types.tolist(), pa.string())})
+
+    for name, table in (("edges", edges), ("nodes", nodes), ("tokens", tokens)):
+        with pa.OSFile(os.path.join(path, f"{name}.arrow"), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def _read_arrow_table(path, name):
+    source = pa.memory_map(os.path.join(path, f"{name}.arrow"), "r")
+    return pa.ipc.open_file(source).read_all()
+
+
+def _read_arrow(path):
+    edges = _read_arrow_table(path, "edges")
+    columns = {
+        # Single-chunk primitive columns without nulls map with zero copy
+        name: edges.column(name).combine_chunks().to_numpy(zero_copy_only=True)
+        for name in EDGE_COLUMNS
+    }
+    wallets = np.asarray(
+        _read_arrow_table(path, "nodes").column("wallet").to_pylist(), dtype=object
+    )
+    token_types = np.asarray(
+        _read_arrow_table(path, "tokens").column("token_type").to_pylist(), dtype=object
+    )
+
+    return ColumnarGraph(wallets=wallets, token_types=token_types, **columns)
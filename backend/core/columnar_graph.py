@@ -0,0 +1,368 @@
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+from core.edge_store import EdgeStore, build_edge_store
+
+
+class ColumnarGraph:
+    """
+    Columnar directed transaction graph.
+
+    Wallet ids are factorized into integer node ids (in first-appearance
+    order, which is the same order NetworkX would insert them) and every
+    transaction is one row of flat NumPy edge columns:
+
+        src, dst      -> int64 node ids
+        amount        -> float64
+        timestamp     -> int64 nanoseconds since epoch
+        token_codes   -> int64 codes into token_types
+
+    CSR / CSC adjacency and the per-pair EdgeStore are built lazily on
+    first use and cached.
+    """
+
+    def __init__(self, wallets, src, dst, amount, timestamp, token_codes, token_types):
+        self.wallets = wallets
+        self.src = src
+        self.dst = dst
+        self.amount = amount
+        self.timestamp = timestamp
+        self.token_codes = token_codes
+        self.token_types = token_types
+
+        self._wallet_index = None
+        self._csr = None
+        self._csc = None
+        self._pairs = None
+        self._nx_graph = None
+
+    @classmethod
+    def from_networkx(cls, G: nx.DiGraph) -> "ColumnarGraph":
+        """
+        Columnar copy of a NetworkX transaction graph (one transaction per
+        edge, as stored on the graph).
+        """
+        wallets = np.empty(G.number_of_nodes(), dtype=object)
+        wallets[:] = list(G.nodes())
+        index = {w: i for i, w in enumerate(wallets)}
+
+        edges = list(G.edges(data=True))
+        token_codes, token_types = pd.factorize(
+            np.array([d.get("token_type") for _, _, d in edges], dtype=object)
+        )
+
+        graph = cls(
+            wallets=wallets,
+            src=np.array([index[u] for u, _, _ in edges], dtype=np.int64),
+            dst=np.array([index[v] for _, v, _ in edges], dtype=np.int64),
+            amount=np.array([d["amount"] for _, _, d in edges], dtype=np.float64),
+            timestamp=timestamps_to_ns([d["timestamp"] for _, _, d in edges]),
+            token_codes=token_codes.astype(np.int64, copy=False),
+            token_types=np.asarray(token_types, dtype=object),
+        )
+        graph._wallet_index = index
+        graph._nx_graph = G
+        return graph
+
+    # ----------------------------------
+    # Sizes / lookups
+    # ----------------------------------
+    @property
+    def num_nodes(self) -> int:
+        return len(self.wallets)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.src)
+
+    @property
+    def num_pairs(self) -> int:
+        return self.pairs.num_pairs
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the edge columns and the wallet id array
+        (pointers only, not the string objects themselves).
+        """
+        return sum(
+            a.nbytes for a in (
+                self.wallets,
+                self.src,
+                self.dst,
+                self.amount,
+                self.timestamp,
+                self.token_codes,
+            )
+        )
+
+    @property
+    def wallet_index(self) -> dict:
+        """
+        wallet id -> integer node id.
+        """
+        if self._wallet_index is None:
+            self._wallet_index = {w: i for i, w in enumerate(self.wallets)}
+        return self._wallet_index
+
+    # ----------------------------------
+    # Adjacency
+    # ----------------------------------
+    def csr(self):
+        """
+        Out-adjacency: (indptr, edge_ids) with edge ids grouped by source
+        node and kept in row order inside each group.
+        """
+        if self._csr is None:
+            self._csr = _compressed(self.src, self.num_nodes)
+        return self._csr
+
+    def csc(self):
+        """
+        In-adjacency: (indptr, edge_ids) grouped by destination node.
+        """
+        if self._csc is None:
+            self._csc = _compressed(self.dst, self.num_nodes)
+        return self._csc
+
+    @property
+    def pairs(self) -> EdgeStore:
+        """
+        Per-(src, dst) pair store; parallel transfers are kept, not merged.
+        """
+        if self._pairs is None:
+            self._pairs = build_edge_store(
+                self.num_nodes,
+                self.src,
+                self.dst,
+                self.amount,
+                self.timestamp,
+            )
+        return self._pairs
+
+    def out_edges(self, node: int) -> np.ndarray:
+        indptr, edge_ids = self.csr()
+        return edge_ids[indptr[node]:indptr[node + 1]]
+
+    def in_edges(self, node: int) -> np.ndarray:
+        indptr, edge_ids = self.csc()
+        return edge_ids[indptr[node]:indptr[node + 1]]
+
+    # ----------------------------------
+    # NetworkX adapter
+    # ----------------------------------
+    @property
+    def nx_graph(self) -> nx.DiGraph:
+        """
+        Lazily built NetworkX view, for code paths that still need one.
+        """
+        if self._nx_graph is None:
+            self._nx_graph = self.to_networkx()
+        return self._nx_graph
+
+    def to_networkx(self) -> nx.DiGraph:
+        """
+        Materialize a ``nx.DiGraph`` with the same nodes, edges and edge
+        attributes the row-by-row builder used to produce. Repeated
+        transfers between the same pair keep the attributes of the last row.
+        """
+        G = nx.DiGraph()
+        G.add_nodes_from(self.wallets.tolist())
+
+        src = self.wallets[self.src]
+        dst = self.wallets[self.dst]
+        timestamps = pd.to_datetime(self.timestamp)
+        tokens = self.token_types[self.token_codes]
+
+        G.add_edges_from(
+            (u, v, {"amount": a, "timestamp": t, "token_type": k})
+            for u, v, a, t, k in zip(
+                src.tolist(),
+                dst.tolist(),
+                self.amount.tolist(),
+                timestamps,
+                tokens.tolist(),
+            )
+        )
+
+        return G
+
+
+class ColumnarGraphBuilder:
+    """
+    Appends transaction chunks into one ColumnarGraph.
+
+    Wallet and token ids are assigned globally in first-appearance order,
+    so building chunk by chunk gives the same graph as building at once.
+    """
+
+    def __init__(self):
+        self._wallet_index = {}
+        self._token_index = {}
+        self._parts = {
+            "src": [],
+            "dst": [],
+            "amount": [],
+            "timestamp": [],
+            "token_codes": [],
+        }
+
+    @classmethod
+    def extending(cls, graph: ColumnarGraph) -> "ColumnarGraphBuilder":
+        """
+        Builder seeded with an existing graph: chunks added to it are
+        appended after the graph's rows, and known wallets/tokens keep
+        their ids.
+        """
+        builder = cls()
+        builder._wallet_index = dict(graph.wallet_index)
+        builder._token_index = {t: i for i, t in enumerate(graph.token_types.tolist())}
+        for name in builder._parts:
+            builder._parts[name].append(np.asarray(getattr(graph, name)))
+        return builder
+
+    def add_chunk(self, df: pd.DataFrame):
+        # Validate the whole chunk before any id is assigned
+        src, dst, local_wallets = factorize_wallets(
+            df["Source_Wallet_ID"].to_numpy(dtype=object),
+            df["Dest_Wallet_ID"].to_numpy(dtype=object),
+            rows=df.index,
+        )
+        token_codes, local_tokens = factorize_tokens(df["Token_Type"], rows=df.index)
+        timestamp = timestamps_to_ns(df["Timestamp"], rows=df.index)
+
+        wallet_ids = _global_ids(self._wallet_index, local_wallets)
+        token_ids = _global_ids(self._token_index, local_tokens)
+
+        self._parts["src"].append(wallet_ids[src])
+        self._parts["dst"].append(wallet_ids[dst])
+        self._parts["amount"].append(df["Amount"].to_numpy(dtype=np.float64))
+        self._parts["timestamp"].append(timestamp)
+        self._parts["token_codes"].append(token_ids[token_codes])
+
+    def build(self) -> ColumnarGraph:
+        columns = {
+            name: np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+            for (name, parts), dtype in zip(
+                self._parts.items(),
+                (np.int64, np.int64, np.float64, np.int64, np.int64),
+            )
+        }
+        self._parts = None
+
+        wallets = np.empty(len(self._wallet_index), dtype=object)
+        wallets[:] = list(self._wallet_index)
+        tokens = np.empty(len(self._token_index), dtype=object)
+        tokens[:] = list(self._token_index)
+
+        graph = ColumnarGraph(wallets=wallets, token_types=tokens, **columns)
+        graph._wallet_index = self._wallet_index
+        return graph
+
+
+def _global_ids(index: dict, local_values) -> np.ndarray:
+    """
+    Global ids for one chunk's unique values; unseen values are appended
+    in the order given.
+    """
+    return np.fromiter(
+        (index.setdefault(v, len(index)) for v in local_values.tolist()),
+        dtype=np.int64,
+        count=len(local_values),
+    )
+
+
+def as_columnar(G) -> ColumnarGraph:
+    """
+    Accept either a ColumnarGraph or a NetworkX graph.
+    """
+    if isinstance(G, ColumnarGraph):
+        return G
+    return ColumnarGraph.from_networkx(G)
+
+
+def as_networkx(G) -> nx.DiGraph:
+    """
+    Accept either a ColumnarGraph or a NetworkX graph.
+    """
+    if isinstance(G, ColumnarGraph):
+        return G.nx_graph
+    return G
+
+
+def _compressed(keys: np.ndarray, n: int):
+    """
+    Group row ids by integer key: returns (indptr, row_ids) in CSR layout.
+    """
+    counts = np.bincount(keys, minlength=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    row_ids = np.argsort(keys, kind="stable").astype(np.int64, copy=False)
+    return indptr, row_ids
+
+
+# Rows listed in the missing wallet id error
+MAX_REPORTED_ROWS = 10
+
+
+def factorize_wallets(src_values, dst_values, rows=None):
+    """
+    Map source/destination wallet ids onto one shared integer id space.
+
+    Ids are assigned in first-appearance order over the interleaved
+    (src, dst, src, dst, ...) sequence. Raises ValueError naming the rows
+    (labels from `rows`, else positions) with a missing wallet id.
+    """
+    n = len(src_values)
+    interleaved = np.empty(2 * n, dtype=object)
+    interleaved[0::2] = src_values
+    interleaved[1::2] = dst_values
+
+    codes, wallets = pd.factorize(interleaved)
+    codes = codes.astype(np.int64, copy=False)
+
+    # factorize() codes missing values as -1, which would index wallets[-1]
+    reject_missing((codes < 0).reshape(-1, 2).any(axis=1), rows, "source or destination wallet id")
+
+    return (
+        np.ascontiguousarray(codes[0::2]),
+        np.ascontiguousarray(codes[1::2]),
+        np.asarray(wallets, dtype=object),
+    )
+
+
+def factorize_tokens(values, rows=None):
+    """
+    (codes, unique tokens) of a Token_Type column. Raises ValueError
+    naming the rows with a missing token.
+    """
+    codes, tokens = pd.factorize(np.asarray(values, dtype=object))
+    # Same -1 code as missing wallet ids: it would index tokens[-1]
+    reject_missing(codes < 0, rows, "Token_Type")
+    return codes.astype(np.int64, copy=False), np.asarray(tokens, dtype=object)
+
+
+def timestamps_to_ns(values, rows=None) -> np.ndarray:
+    """
+    Convert a timestamp column to int64 nanoseconds since epoch. Raises
+    ValueError naming the rows with a missing timestamp (NaT would
+    become INT64_MIN).
+    """
+    ts = np.asarray(pd.to_datetime(values), dtype="datetime64[ns]")
+    reject_missing(np.isnat(ts), rows, "Timestamp")
+    return ts.view(np.int64)
+
+
+def reject_missing(missing, rows=None, what: str = "value"):
+    """
+    Raise ValueError naming the rows where the boolean mask `missing` is
+    set (labels from `rows`, else positions; at most MAX_REPORTED_ROWS).
+    """
+    missing = np.flatnonzero(missing)
+    if not len(missing):
+        return
+    labels = np.arange(missing[-1] + 1) if rows is None else np.asarray(rows)
+    shown = labels[missing[:MAX_REPORTED_ROWS]].tolist()
+    more = f" and {len(missing) - len(shown)} more" if len(missing) > len(shown) else ""
+    raise ValueError(f"Missing {what} in {len(missing)} row(s): {shown}{more}")
@@ -0,0 +1,175 @@
+import numpy as np
+
+
+class EdgeStore:
+    """
+    Multigraph-aware edge store.
+
+    Parallel transfers between the same (src, dst) pair are grouped into one
+    pair record instead of overwriting each other. Per pair it keeps:
+
+        pair_src, pair_dst      -> int64 node ids
+        pair_count              -> number of transactions
+        pair_amount             -> total amount transferred
+        pair_first_ts           -> earliest timestamp (ns)
+        pair_last_ts            -> latest timestamp (ns)
+
+    Raw per-transaction values stay in the owning ColumnarGraph and are
+    reachable through ``pair_indptr`` / ``pair_edge_ids`` (transactions
+    grouped by pair, row order inside each pair).
+
+    Pairs are ordered by source node, then by first appearance — the same
+    order ``nx.DiGraph.edges()`` yields them.
+    """
+
+    def __init__(
+        self,
+        num_nodes,
+        pair_src,
+        pair_dst,
+        pair_count,
+        pair_amount,
+        pair_first_ts,
+        pair_last_ts,
+        pair_indptr,
+        pair_edge_ids,
+        edge_pair,
+    ):
+        self.num_nodes = num_nodes
+        self.pair_src = pair_src
+        self.pair_dst = pair_dst
+        self.pair_count = pair_count
+        self.pair_amount = pair_amount
+        self.pair_first_ts = pair_first_ts
+        self.pair_last_ts = pair_last_ts
+        self.pair_indptr = pair_indptr
+        self.pair_edge_ids = pair_edge_ids
+        self.edge_pair = edge_pair
+
+        self._out = None
+        self._in = None
+        self._in_adjacency = None
+
+    @property
+    def num_pairs(self) -> int:
+        return len(self.pair_src)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            a.nbytes for a in (
+                self.pair_src,
+                self.pair_dst,
+                self.pair_count,
+                self.pair_amount,
+                self.pair_first_ts,
+                self.pair_last_ts,
+                self.pair_indptr,
+                self.pair_edge_ids,
+                self.edge_pair,
+            )
+        )
+
+    def edge_ids(self, pair: int) -> np.ndarray:
+        """
+        Transaction row ids of one pair.
+        """
+        return self.pair_edge_ids[self.pair_indptr[pair]:self.pair_indptr[pair + 1]]
+
+    def amounts(self, pair: int, amount: np.ndarray) -> np.ndarray:
+        """
+        Raw amounts of every transaction in one pair, on demand.
+        """
+        return amount[self.edge_ids(pair)]
+
+    # ----------------------------------
+    # Pair-level adjacency (unique neighbors)
+    # ----------------------------------
+    def out_pairs(self):
+        """
+        (indptr, pair_ids) grouped by source node.
+        """
+        if self._out is None:
+            # Pairs are already sorted by source node
+            counts = np.bincount(self.pair_src, minlength=self.num_nodes)
+            indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+            np.cumsum(counts, out=indptr[1:])
+            self._out = (indptr, np.arange(self.num_pairs, dtype=np.int64))
+        return self._out
+
+    def in_pairs(self):
+        """
+        (indptr, pair_ids) grouped by destination node.
+        """
+        if self._in is None:
+            counts = np.bincount(self.pair_dst, minlength=self.num_nodes)
+            indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+            np.cumsum(counts, out=indptr[1:])
+            order = np.argsort(self.pair_dst, kind="stable").astype(np.int64, copy=False)
+            self._in = (indptr, order)
+        return self._in
+
+    def out_adjacency(self):
+        """
+        (indptr, successor node ids) in CSR layout, one entry per pair.
+        """
+        indptr, _ = self.out_pairs()
+        return indptr, self.pair_dst
+
+    def in_adjacency(self):
+        """
+        (indptr, predecessor node ids) in CSR layout, one entry per pair.
+        """
+        if self._in_adjacency is None:
+            indptr, pair_ids = self.in_pairs()
+            self._in_adjacency = (indptr, self.pair_src[pair_ids])
+        return self._in_adjacency
+
+
+def build_edge_store(num_nodes, src, dst, amount, timestamp) -> EdgeStore:
+    """
+    Group transaction columns into per-pair arrays.
+    """
+    key = src * np.int64(num_nodes) + dst
+
+    uniq, first_row, inverse = np.unique(key, return_index=True, return_inverse=True)
+    uniq_src = uniq // num_nodes
+
+    # Re-rank pairs into (source, first appearance) order
+    rank_order = np.lexsort((first_row, uniq_src))
+    rank = np.empty_like(rank_order)
+    rank[rank_order] = np.arange(len(rank_order))
+
+    edge_pair = rank[inverse.ravel()].astype(np.int64, copy=False)
+    num_pairs = len(uniq)
+
+    pair_key = uniq[rank_order]
+    pair_src = pair_key // num_nodes
+    pair_dst = pair_key % num_nodes
+
+    pair_count = np.bincount(edge_pair, minlength=num_pairs).astype(np.int64)
+    pair_indptr = np.zeros(num_pairs + 1, dtype=np.int64)
+    np.cumsum(pair_count, out=pair_indptr[1:])
+    pair_edge_ids = np.argsort(edge_pair, kind="stable").astype(np.int64, copy=False)
+
+    starts = pair_indptr[:-1]
+    if num_pairs:
+        grouped_ts = timestamp[pair_edge_ids]
+        pair_first_ts = np.minimum.reduceat(grouped_ts, starts)
+        pair_last_ts = np.maximum.reduceat(grouped_ts, starts)
+    else:
+        pair_first_ts = np.zeros(0, dtype=np.int64)
+        pair_last_ts = np.zeros(0, dtype=np.int64)
+
+    return EdgeStore(
+        num_nodes=num_nodes,
+        pair_src=pair_src,
+        pair_dst=pair_dst,
+        pair_count=pair_count,
+        pair_amount=np.bincount(edge_pair, weights=amount, minlength=num_pairs),
+        pair_first_ts=pair_first_ts,
+        pair_last_ts=pair_last_ts,
+        pair_indptr=pair_indptr,
+        pair_edge_ids=pair_edge_ids,
+        edge_pair=edge_pair,
+    )
@@ -1,10 +1,92 @@
-import networkx as nx
+from collections.abc import Mapping
+
 import numpy as np
 
+from core.columnar_graph import as_columnar
+from core.graph_search import gather_neighbors
+
+NS_PER_SECOND = 1e9
+
+
+NODE_FEATURES = (
+    "in_degree",
+    "out_degree",
+    "total_inflow",
+    "total_outflow",
+    "flow_imbalance",
+    "tx_count",
+    "active_time_span",
+)
+
+INT_NODE_FEATURES = {"in_degree", "out_degree", "tx_count"}
+
+
+class FeatureTable(Mapping):
+    """
+    Dense (n, F) float64 feature matrix plus a key index.
+
+    Reads like the old dict-of-dicts (``table[key]["in_degree"]``,
+    ``table.items()``) so dict consumers keep working, while vectorized
+    consumers use ``matrix`` / ``column(name)`` directly.
+    """
+
+    def __init__(self, keys, columns, matrix, int_columns=()):
+        self.keys_array = keys
+        self.columns = tuple(columns)
+        self.matrix = matrix
+        self.int_columns = frozenset(int_columns)
+        self._index = None
+
+    @property
+    def index(self) -> dict:
+        """
+        key -> row number.
+        """
+        if self._index is None:
+            self._index = {k: i for i, k in enumerate(self.keys_array)}
+        return self._index
+
+    def column(self, name) -> np.ndarray:
+        return self.matrix[:, self.columns.index(name)]
+
+    def row(self, i) -> dict:
+        return self._as_dict(self.matrix[i].tolist())
+
+    def _as_dict(self, values) -> dict:
+        return {
+            name: int(value) if name in self.int_columns else value
+            for name, value in zip(self.columns, values)
+        }
+
+    def __getitem__(self, key):
+        return self.row(self.index[key])
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __iter__(self):
+        return iter(self.keys_array)
+
+    def __len__(self):
+        return len(self.keys_array)
+
+    def items(self):
+        return zip(self.keys_array, self.values())
+
+    def values(self):
+        return (self._as_dict(values) for values in self.matrix.tolist())
+
 
-def extract_node_features(G: nx.DiGraph) -> dict:
+def extract_node_features(G) -> FeatureTable:
     """
+    Accepts a ColumnarGraph or an nx.DiGraph.
+
+    Every transaction counts, including repeated transfers between the
+    same two wallets. All nodes are computed at once with group
+    reductions over the edge columns.
+
     Returns:
+        FeatureTable keyed by wallet, columns = NODE_FEATURES:
         node_features[node] = {
             in_degree,
             out_degree,
@@ -15,83 +97,267 @@ def extract_node_features(G: nx.DiGraph) -> dict:
             active_time_span
         }
     """
-    node_features = {}
+    graph = as_columnar(G)
+    n = graph.num_nodes
+    src, dst, ts = graph.src, graph.dst, graph.timestamp
 
-    for node in G.nodes():
-        in_edges = list(G.in_edges(node, data=True))
-        out_edges = list(G.out_edges(node, data=True))
+    matrix = np.empty((n, len(NODE_FEATURES)), dtype=np.float64)
 
-        in_degree = len(in_edges)
-        out_degree = len(out_edges)
+    in_degree = np.bincount(dst, minlength=n)
+    out_degree = np.bincount(src, minlength=n)
+    total_inflow = np.bincount(dst, weights=graph.amount, minlength=n)
+    total_outflow = np.bincount(src, weights=graph.amount, minlength=n)
 
-        total_inflow = sum(e[2]["amount"] for e in in_edges)
-        total_outflow = sum(e[2]["amount"] for e in out_edges)
+    first_ts, last_ts = node_time_bounds(graph)
+    tx_count = in_degree + out_degree
 
-        tx_count = in_degree + out_degree
+    matrix[:, 0] = in_degree
+    matrix[:, 1] = out_degree
+    matrix[:, 2] = total_inflow
+    matrix[:, 3] = total_outflow
+    matrix[:, 4] = np.abs(total_inflow - total_outflow) / (
+        total_inflow + total_outflow + 1e-9
+    )
+    matrix[:, 5] = tx_count
+    matrix[:, 6] = (last_ts - first_ts) / NS_PER_SECOND
 
-        timestamps = [e[2]["timestamp"] for e in in_edges + out_edges]
-        if timestamps:
-            active_time_span = (max(timestamps) - min(timestamps)).total_seconds()
-        else:
-            active_time_span = 0.0
+    return FeatureTable(graph.wallets, NODE_FEATURES, matrix, INT_NODE_FEATURES)
 
-        flow_imbalance = abs(total_inflow - total_outflow) / (
-            total_inflow + total_outflow + 1e-9
-        )
 
-        node_features[node] = {
-            "in_degree": in_degree,
-            "out_degree": out_degree,
-            "total_inflow": total_inflow,
-            "total_outflow": total_outflow,
-            "flow_imbalance": flow_imbalance,
-            "tx_count": tx_count,
-            "active_time_span": active_time_span,
-        }
+def node_time_bounds(G, start: int = 0, bounds=None):
+    """
+    Earliest and latest transaction timestamp (ns) per node, 0 for nodes
+    without transactions.
+
+    With `bounds` (the result for the graph's first `start` rows), only
+    rows from `start` on are folded in.
+    """
+    graph = as_columnar(G)
+    n = graph.num_nodes
+    src, dst, ts = graph.src[start:], graph.dst[start:], graph.timestamp[start:]
+
+    first_ts = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+    last_ts = np.full(n, np.iinfo(np.int64).min, dtype=np.int64)
+    if bounds is not None:
+        # Every node of a ColumnarGraph is an endpoint of some row
+        first_ts[:len(bounds[0])] = bounds[0]
+        last_ts[:len(bounds[1])] = bounds[1]
+
+    np.minimum.at(first_ts, src, ts)
+    np.minimum.at(first_ts, dst, ts)
+    np.maximum.at(last_ts, src, ts)
+    np.maximum.at(last_ts, dst, ts)
+
+    # Nodes without transactions have no activity window
+    idle = first_ts > last_ts
+    first_ts[idle] = 0
+    last_ts[idle] = 0
+
+    return first_ts, last_ts
+
+
+EDGE_FEATURES = (
+    "amount",
+    "time_delta",
+    "peeling_ratio",
+    "tx_count",
+)
+
+
+def extract_edge_feature_arrays(G) -> dict:
+    """
+    Accepts a ColumnarGraph or an nx.DiGraph.
+
+    Per-transaction edge features as columnar arrays aligned with the
+    edge (row) index of the graph:
+
+        time_delta     -> seconds since the previous (strictly earlier)
+                          outgoing tx of src, 0.0 if there is none
+        has_prev       -> whether such a previous tx exists
+        peeling_ratio  -> amount / max incoming amount of src, 1.0 if src
+                          has no incoming tx
+
+    One sort by (src, timestamp) plus a shifted diff; no per-node rescans.
+    """
+    graph = as_columnar(G)
+    src, dst, amount = graph.src, graph.dst, graph.amount
+
+    time_delta, has_prev = _time_deltas(src, graph.timestamp)
+
+    # ----------------------------------
+    # peeling_ratio: precomputed per-node max inflow
+    # ----------------------------------
+    max_inflow = np.full(graph.num_nodes, -np.inf)
+    np.maximum.at(max_inflow, dst, amount)
 
-    return node_features
+    return {
+        "amount": amount,
+        "time_delta": time_delta,
+        "has_prev": has_prev,
+        "peeling_ratio": _peeling_ratios(src, amount, max_inflow),
+    }
 
 
-def extract_edge_features(G: nx.DiGraph) -> dict:
+def _time_deltas(src, ts):
     """
+    time_delta / has_prev per row. Rows of one source must all be
+    present; their relative order must be row order.
+    """
+    m = len(src)
+
+    # Shifted diff over (src, timestamp) order
+    order = np.lexsort((ts, src))
+    s_src = src[order]
+    s_ts = ts[order]
+
+    # Rows with equal (src, timestamp) share the previous distinct timestamp
+    run_start = np.ones(m, dtype=bool)
+    run_start[1:] = (s_src[1:] != s_src[:-1]) | (s_ts[1:] != s_ts[:-1])
+    first_of_run = np.maximum.accumulate(np.where(run_start, np.arange(m), 0))
+
+    prev = first_of_run - 1
+    sorted_has_prev = prev >= 0
+    sorted_has_prev[sorted_has_prev] = s_src[prev[sorted_has_prev]] == s_src[sorted_has_prev]
+
+    sorted_delta = np.zeros(m, dtype=np.float64)
+    sorted_delta[sorted_has_prev] = (
+        s_ts[sorted_has_prev] - s_ts[prev[sorted_has_prev]]
+    ) / NS_PER_SECOND
+
+    time_delta = np.empty(m, dtype=np.float64)
+    time_delta[order] = sorted_delta
+    has_prev = np.empty(m, dtype=bool)
+    has_prev[order] = sorted_has_prev
+
+    return time_delta, has_prev
+
+
+def _peeling_ratios(src, amount, max_inflow):
+    """
+    amount / max incoming amount of src per row, 1.0 without inflow.
+    """
+    src_max = max_inflow[src]
+    has_inflow = np.isfinite(src_max)
+
+    peeling_ratio = np.ones(len(src), dtype=np.float64)
+    peeling_ratio[has_inflow] = amount[has_inflow] / (src_max[has_inflow] + 1e-9)
+    return peeling_ratio
+
+
+def extract_edge_features(G) -> FeatureTable:
+    """
+    Accepts a ColumnarGraph or an nx.DiGraph.
+
+    One record per (src, dst) pair. Parallel transfers are folded in:
+    amount is the pair total, time_delta the tightest gap between one of
+    its transfers and the previous outgoing tx of src, and peeling_ratio
+    the largest ratio of any of its transfers.
+
     Returns:
+        FeatureTable keyed by (src, dst), columns = EDGE_FEATURES:
         edge_features[(src, dst)] = {
             amount,
             time_delta,
-            peeling_ratio
+            peeling_ratio,
+            tx_count
         }
     """
-    edge_features = {}
-
-    for u, v, data in G.edges(data=True):
-        amount = data["amount"]
-        timestamp = data["timestamp"]
-
-        # Compute time delta from previous outgoing tx of u
-        prev_times = [
-            d["timestamp"]
-            for _, _, d in G.out_edges(u, data=True)
-            if d["timestamp"] < timestamp
-        ]
-
-        if prev_times:
-            time_delta = (timestamp - max(prev_times)).total_seconds()
-        else:
-            time_delta = 0.0
-
-        # Peeling ratio: how much is passed forward
-        incoming_amounts = [
-            d["amount"] for _, _, d in G.in_edges(u, data=True)
-        ]
-        if incoming_amounts:
-            peeling_ratio = amount / (max(incoming_amounts) + 1e-9)
-        else:
-            peeling_ratio = 1.0
-
-        edge_features[(u, v)] = {
-            "amount": amount,
-            "time_delta": time_delta,
-            "peeling_ratio": peeling_ratio,
-        }
+    graph = as_columnar(G)
+    store = graph.pairs
+    arrays = extract_edge_feature_arrays(graph)
+
+    matrix = _pair_matrix(
+        store,
+        np.arange(store.num_pairs, dtype=np.int64),
+        store.pair_edge_ids,
+        store.pair_count,
+        arrays["time_delta"],
+        arrays["has_prev"],
+        arrays["peeling_ratio"],
+    )
+
+    return FeatureTable(edge_feature_keys(graph), EDGE_FEATURES, matrix, {"tx_count"})
+
+
+def edge_feature_keys(graph) -> list:
+    """
+    (src wallet, dst wallet) per pair, in pair order.
+    """
+    store = graph.pairs
+    return list(zip(
+        graph.wallets[store.pair_src].tolist(),
+        graph.wallets[store.pair_dst].tolist(),
+    ))
+
+
+def edge_feature_rows(G, sources):
+    """
+    EDGE_FEATURES rows for only the pairs whose source is in `sources`,
+    computed from just those wallets' transactions (their outgoing ones,
+    plus incoming ones for the max inflow). Same values as the matching
+    rows of extract_edge_features().
+
+    Returns:
+        pair ids (ascending), (len(pair ids), F) matrix
+    """
+    graph = as_columnar(G)
+    store = graph.pairs
+    sources = np.unique(np.asarray(sources, dtype=np.int64))
+
+    out_indptr, _ = store.out_pairs()
+    pair_ids, _ = gather_neighbors(
+        out_indptr, np.arange(store.num_pairs, dtype=np.int64), sources
+    )
+
+    # Every outgoing row of the sources, grouped by pair
+    grouped, counts = gather_neighbors(store.pair_indptr, store.pair_edge_ids, pair_ids)
+
+    # Ascending rows keep row order within each source
+    rows = np.sort(grouped)
+    time_delta, has_prev = _time_deltas(graph.src[rows], graph.timestamp[rows])
+
+    # Max inflow of the sources only
+    in_indptr, in_pair_ids = store.in_pairs()
+    in_pairs, _ = gather_neighbors(in_indptr, in_pair_ids, sources)
+    in_rows, _ = gather_neighbors(store.pair_indptr, store.pair_edge_ids, in_pairs)
+    max_inflow = np.full(graph.num_nodes, -np.inf)
+    np.maximum.at(max_inflow, graph.dst[in_rows], graph.amount[in_rows])
+
+    peeling_ratio = _peeling_ratios(graph.src[rows], graph.amount[rows], max_inflow)
+
+    matrix = _pair_matrix(
+        store,
+        pair_ids,
+        np.searchsorted(rows, grouped),
+        counts,
+        time_delta,
+        has_prev,
+        peeling_ratio,
+    )
+
+    return pair_ids, matrix
+
+
+def _pair_matrix(store, pair_ids, rows, counts, time_delta, has_prev, peeling_ratio):
+    """
+    Fold per-row values into EDGE_FEATURES rows for `pair_ids`.
+
+    rows indexes the per-row arrays, grouped by pair in pair_ids order
+    with counts[i] rows for pair_ids[i].
+    """
+    matrix = np.zeros((len(pair_ids), len(EDGE_FEATURES)), dtype=np.float64)
+    if not len(pair_ids):
+        return matrix
+
+    starts = np.cumsum(counts) - counts
+
+    # Transfers without a previous tx don't count toward the minimum
+    deltas = np.where(has_prev, time_delta, np.inf)[rows]
+    min_delta = np.minimum.reduceat(deltas, starts)
+
+    matrix[:, 0] = store.pair_amount[pair_ids]
+    matrix[:, 1] = np.where(np.isfinite(min_delta), min_delta, 0.0)
+    matrix[:, 2] = np.maximum.reduceat(peeling_ratio[rows], starts)
+    matrix[:, 3] = store.pair_count[pair_ids]
 
-    return edge_features
+    return matrix
@@ -1,5 +1,93 @@
+"""
+CPU-only GNN risk refinement.
+
+Trained weights (GNN_WEIGHTS_PATH; none by default, so the GNN phase is
+skipped) are loaded once per process and the model stays resident (see
+load_model); run_gnn_refinement() chains prepare_gnn_data() into
+inference and maps the scores back to wallet ids.
+
+Columnar inputs reach torch without copies: X and the pair CSR arrays are
+wrapped with torch.from_numpy(). Graphs with more edges than one batch
+are scored in node mini-batches (run_gnn_minibatch). Models can be
+deployed as TorchScript, int8-quantized or torch.compile'd (deploy_model,
+GNN_RUNTIME).
+"""
+
+import hashlib
+import os
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
 import torch
 
+from core.gnn_preparer import prepare_gnn_data
+
+# Only checkpoints trained against this target are served (see load_model)
+TRAINED_TARGET = "labels"
+
+# In-edges aggregated per mini-batch; GNN_BATCH_EDGES overrides it. Graphs
+# with fewer edges run full-batch
+DEFAULT_BATCH_EDGES = 1_000_000
+
+
+def build_normalized_adjacency(edge_index, num_nodes):
+    """
+    Mean-aggregation operator as a sparse CSR matrix:
+
+        A[dst, src] = (number of src -> dst edges) / in_degree(dst)
+
+    so that A @ X equals the mean of incoming messages. Build it once per
+    graph and pass it to SimpleRiskGNN.forward(adj=...) to reuse it.
+    """
+    src, dst = edge_index
+    deg = torch.bincount(dst, minlength=num_nodes).clamp(min=1).to(torch.float32)
+
+    adj = torch.sparse_coo_tensor(
+        torch.stack([dst, src]),
+        1.0 / deg[dst],
+        (num_nodes, num_nodes),
+    )
+    # Coalescing sums parallel edges, exactly like per-edge accumulation
+    return adj.coalesce().to_sparse_csr()
+
+
+def csr_adjacency(indptr, neighbors, num_nodes, num_rows=None):
+    """
+    Same operator from the pair in-adjacency CSR (indptr over dst,
+    src neighbors; see EdgeStore.in_adjacency). The index arrays are
+    shared with NumPy, only the 1 / in_degree values are allocated.
+
+    Pairs are unique, so every entry is 1 / in_degree(dst). With
+    num_rows, indptr covers only that many rows (a mini-batch).
+    """
+    indptr = np.asarray(indptr, dtype=np.int64)
+    counts = np.diff(indptr)
+    values = np.repeat(1.0 / np.maximum(counts, 1), counts).astype(np.float32)
+
+    return torch.sparse_csr_tensor(
+        from_numpy(indptr),
+        from_numpy(np.asarray(neighbors, dtype=np.int64)),
+        torch.from_numpy(values),
+        (num_rows or num_nodes, num_nodes),
+        check_invariants=False,
+    )
+
+
+def from_numpy(array):
+    """
+    torch.from_numpy() that also accepts read-only (memory-mapped) arrays.
+    The tensor shares memory with `array`; inference never writes to it.
+    """
+    array = np.ascontiguousarray(array)
+    if array.flags.writeable:
+        return torch.from_numpy(array)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return torch.from_numpy(array)
+
 
 class SimpleRiskGNN(torch.nn.Module):
     """
@@ -10,43 +98,389 @@ class SimpleRiskGNN(torch.nn.Module):
         super().__init__()
         self.linear = torch.nn.Linear(in_features, 1)
 
-    def forward(self, X, edge_index):
+    def forward(
+        self,
+        X: torch.Tensor,
+        edge_index: Optional[torch.Tensor] = None,
+        adj: Optional[torch.Tensor] = None,
+    ):
         """
         X: (N, F) node features
         edge_index: (2, E)
+        adj: optional precomputed build_normalized_adjacency(edge_index, N)
         """
-        N = X.size(0)
-        agg = torch.zeros_like(X)
+        if adj is not None:
+            # Message passing: mean aggregation as one sparse matmul
+            agg = torch.sparse.mm(adj, X)
+        else:
+            assert edge_index is not None, "edge_index or adj is required"
+            N = X.size(0)
+            src, dst = edge_index[0], edge_index[1]
 
-        src, dst = edge_index
+            # Message passing: mean aggregation via scatter-add
+            agg = torch.zeros_like(X).index_add_(0, dst, X[src])
 
-        # Message passing: mean aggregation
-        for i in range(src.size(0)):
-            agg[dst[i]] += X[src[i]]
+            # Normalize by degree
+            deg = torch.bincount(dst, minlength=N).clamp(min=1)
+            agg = agg / deg.unsqueeze(1).to(X.dtype)
 
-        # Normalize by degree
-        deg = torch.zeros(N, device=X.device)
-        for d in dst:
-            deg[d] += 1
+        return self.readout(agg)
 
-        deg = deg.unsqueeze(1).clamp(min=1)
-        agg = agg / deg
-
-        # Linear projection → risk score
+    @torch.jit.export
+    def readout(self, agg: torch.Tensor):
+        """
+        Linear projection of aggregated features → risk score.
+        """
         out = self.linear(agg)
         return torch.sigmoid(out).squeeze()
 
-def run_gnn_inference(gnn_data):
+
+def run_gnn_inference(gnn_data, num_threads=None, model=None):
     """
     Runs CPU-only GNN inference.
+
+    num_threads: intra-op threads for torch (see set_inference_threads).
+    model: trained SimpleRiskGNN, or a deploy_model() of one; a randomly
+    initialized one if None.
+
+    Float32 X is shared with torch, not copied. Columnar inputs carry
+    "in_csr" and are aggregated over it directly.
     """
-    X = torch.tensor(gnn_data["X"], dtype=torch.float32)
-    edge_index = torch.tensor(gnn_data["edge_index"], dtype=torch.long)
+    set_inference_threads(num_threads)
 
-    model = SimpleRiskGNN(X.shape[1])
-    model.eval()
+    X = from_numpy(np.asarray(gnn_data["X"], dtype=np.float32))
 
-    with torch.no_grad():
-        gnn_risk = model(X, edge_index)
+    if model is None:
+        model = SimpleRiskGNN(X.shape[1])
+        model.eval()
+
+    with torch.inference_mode():
+        if gnn_data.get("in_csr") is not None:
+            indptr, neighbors = gnn_data["in_csr"]
+            gnn_risk = model(X, adj=csr_adjacency(indptr, neighbors, X.size(0)))
+        else:
+            edge_index = from_numpy(np.asarray(gnn_data["edge_index"], dtype=np.int64))
+            gnn_risk = model(X, edge_index)
 
     return gnn_risk.numpy()
+
+
+# ----------------------------------
+# Mini-batch inference
+# ----------------------------------
+def batch_edges(value: int = None) -> int:
+    return int(value or os.environ.get("GNN_BATCH_EDGES") or DEFAULT_BATCH_EDGES)
+
+
+def in_adjacency(edge_index, num_nodes):
+    """
+    (indptr, src neighbors) CSR over dst for a (2, E) edge index; edges
+    keep their order within a row.
+    """
+    src, dst = (np.asarray(a, dtype=np.int64) for a in edge_index)
+    order = np.argsort(dst, kind="stable")
+
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(dst, minlength=num_nodes), out=indptr[1:])
+    return indptr, src[order]
+
+
+def node_batches(indptr, max_edges: int, max_nodes: int = None) -> list:
+    """
+    Consecutive [start, stop) node ranges with at most `max_edges`
+    in-edges and `max_nodes` nodes each. A node with more in-edges than
+    `max_edges` gets a range of its own.
+    """
+    n = len(indptr) - 1
+    max_nodes = max_nodes or max_edges
+
+    batches = []
+    start = 0
+    while start < n:
+        stop = int(np.searchsorted(indptr, indptr[start] + max_edges, side="right")) - 1
+        stop = min(max(stop, start + 1), start + max_nodes, n)
+        batches.append((start, stop))
+        start = stop
+    return batches
+
+
+def run_gnn_minibatch(
+    gnn_data,
+    model=None,
+    max_edges: int = None,
+    num_workers: int = None,
+    out=None,
+    num_threads: int = None,
+):
+    """
+    Same scores as run_gnn_inference(), computed over node batches.
+
+    Each batch takes its nodes' rows of the in-adjacency CSR (all 1-hop
+    in-neighbors, so results match full-batch inference), aggregates the
+    neighbor features with a sparse matmul against X and writes its scores
+    into `out` (a preallocated float32 array of N, allocated if None).
+    Working memory is bounded by `max_edges` (default batch_edges()) edge
+    values plus the batch's aggregated rows; X is shared, not copied, and
+    may be a memory-mapped array.
+
+    Batches run on a pool of `num_workers` threads (torch releases the
+    GIL inside its kernels), each with `num_threads` intra-op threads.
+    """
+    set_inference_threads(num_threads)
+
+    X = gnn_data["X"]
+    n, num_features = X.shape
+
+    csr = gnn_data.get("in_csr")
+    indptr, neighbors = csr if csr is not None else in_adjacency(gnn_data["edge_index"], n)
+    indptr = np.asarray(indptr, dtype=np.int64)
+
+    if out is None:
+        out = np.empty(n, dtype=np.float32)
+    if model is None:
+        model = SimpleRiskGNN(num_features)
+        model.eval()
+
+    features = from_numpy(np.asarray(X, dtype=np.float32))
+
+    def infer(bounds):
+        start, stop = bounds
+        lo, hi = indptr[start], indptr[stop]
+
+        # Rows start..stop of the aggregation matrix
+        adj = csr_adjacency(
+            indptr[start:stop + 1] - lo, neighbors[lo:hi], n, num_rows=stop - start
+        )
+
+        # Inference mode is per thread
+        with torch.inference_mode():
+            agg = torch.sparse.mm(adj, features)
+            out[start:stop] = model.readout(agg).reshape(-1).numpy()
+
+    batches = node_batches(indptr, batch_edges(max_edges))
+    with ThreadPoolExecutor(max_workers=num_workers) as pool:
+        # list() re-raises the first batch error
+        list(pool.map(infer, batches))
+
+    return out
+
+
+# ----------------------------------
+# CPU deployment
+# ----------------------------------
+# eager     -> the module as is
+# script    -> TorchScript
+# quantized -> Linear layers dynamically quantized to int8, then TorchScript
+# compile   -> torch.compile (compiles on first call; needs a C++ compiler)
+RUNTIMES = ("eager", "script", "quantized", "compile")
+
+
+def gnn_runtime(runtime: str = None) -> str:
+    """
+    `runtime`, else GNN_RUNTIME, else "eager". Raises ValueError if unknown.
+    """
+    runtime = runtime or os.environ.get("GNN_RUNTIME") or "eager"
+    if runtime not in RUNTIMES:
+        raise ValueError(f"GNN runtime must be one of {list(RUNTIMES)}")
+    return runtime
+
+
+def set_inference_threads(num_threads: int = None):
+    """
+    Intra-op threads for torch: `num_threads`, else GNN_NUM_THREADS, else
+    torch's default. The setting is process-wide.
+    """
+    num_threads = int(num_threads or os.environ.get("GNN_NUM_THREADS") or 0)
+    if num_threads and num_threads != torch.get_num_threads():
+        torch.set_num_threads(num_threads)
+
+
+def quantize_model(model):
+    """
+    Copy of `model` with its Linear layers dynamically quantized to int8:
+    int8 weights, activations quantized per call.
+    """
+    with warnings.catch_warnings():
+        # The eager quantization API is deprecated in favor of torchao
+        warnings.simplefilter("ignore")
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+
+def deploy_model(model, runtime: str = None):
+    """
+    `model` prepared for CPU inference in `runtime` (see RUNTIMES).
+
+    Works for SimpleRiskGNN and any successor with the same
+    forward(X, edge_index, adj) / readout(agg) interface. The result is
+    used exactly like the eager module.
+    """
+    runtime = gnn_runtime(runtime)
+    model.eval()
+
+    if runtime == "quantized":
+        model = quantize_model(model)
+    if runtime in ("script", "quantized"):
+        return torch.jit.script(model)
+    if runtime == "compile":
+        return torch.compile(model, dynamic=True)
+    return model
+
+
+def export_model(model, path: str, quantize: bool = False) -> str:
+    """
+    Atomically write `model` as a TorchScript file (optionally int8
+    quantized) that load_exported() / torch.jit.load() read without this
+    module.
+    """
+    scripted = deploy_model(model, "quantized" if quantize else "script")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    scratch = f"{path}.tmp"
+    torch.jit.save(scripted, scratch)
+    os.replace(scratch, path)
+    return path
+
+
+def load_exported(path: str):
+    return torch.jit.load(path, map_location="cpu").eval()
+
+
+# ----------------------------------
+# Resident model
+# ----------------------------------
+_MODELS = {}
+_LOCK = threading.Lock()
+
+
+def weights_path(path: str = None) -> Optional[str]:
+    """
+    `path`, else GNN_WEIGHTS_PATH; None when neither is set.
+    """
+    path = path or os.environ.get("GNN_WEIGHTS_PATH")
+    return str(path) if path else None
+
+
+def load_model(path: str = None, runtime: str = None):
+    """
+    (model, digest) for the checkpoint at `path`, deployed in `runtime`
+    (default gnn_runtime()), loaded once per process and reloaded only if
+    the file changes. None if no checkpoint is configured or found, or if
+    it was not trained on labels (target != TRAINED_TARGET): a model fit
+    to base_risk only echoes its own input.
+
+    The digest is the weights' sha256, suffixed with the runtime unless
+    eager, so cached scores are kept apart per runtime.
+
+    Checkpoints are {"state_dict": ..., "in_features": int} as written by
+    save_model().
+    """
+    path = weights_path(path)
+    if path is None:
+        return None
+    runtime = gnn_runtime(runtime)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    with _LOCK:
+        cached = _MODELS.get((path, runtime))
+        if cached is None or cached["mtime"] != mtime:
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            if runtime != "eager":
+                digest = f"{digest}:{runtime}"
+
+            checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+            model = None
+            if checkpoint.get("target") == TRAINED_TARGET:
+                model = SimpleRiskGNN(checkpoint["in_features"])
+                model.load_state_dict(checkpoint["state_dict"])
+                model = deploy_model(model, runtime)
+            else:
+                warnings.warn(
+                    f"{path}: trained on target={checkpoint.get('target')!r}, "
+                    f"not {TRAINED_TARGET!r}; GNN refinement disabled"
+                )
+
+            cached = {"mtime": mtime, "model": model, "digest": digest}
+            _MODELS[(path, runtime)] = cached
+
+    if cached["model"] is None:
+        return None
+    return cached["model"], cached["digest"]
+
+
+def save_model(model, path: str = None, **metadata) -> str:
+    """
+    Atomically write a checkpoint that load_model() reads. Raises
+    ValueError without a path (argument or GNN_WEIGHTS_PATH).
+    """
+    path = weights_path(path)
+    if path is None:
+        raise ValueError("No checkpoint path: pass one or set GNN_WEIGHTS_PATH")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    checkpoint = {
+        "state_dict": model.state_dict(),
+        "in_features": model.linear.in_features,
+        **metadata,
+    }
+    scratch = f"{path}.tmp"
+    torch.save(checkpoint, scratch)
+    os.replace(scratch, path)
+    return path
+
+
+def run_gnn_refinement(
+    graph,
+    node_features,
+    base_risks,
+    model=None,
+    num_threads=None,
+    max_edges: int = None,
+    num_workers: int = None,
+    scores=None,
+) -> dict:
+    """
+    GNN risk per wallet id for every node of the graph.
+
+    Node features are min-max normalized (the scale the model is trained
+    on) while being written into the input buffer. Uses the resident
+    model unless one is given; raises FileNotFoundError if there is no
+    usable checkpoint.
+
+    Graphs with more pair edges than `max_edges` (default batch_edges())
+    are scored with run_gnn_minibatch() on `num_workers` threads.
+    `scores` is passed on to prepare_gnn_data().
+    """
+    if model is None:
+        loaded = load_model()
+        if loaded is None:
+            raise FileNotFoundError(
+                f"No label-trained GNN checkpoint at {weights_path() or '(GNN_WEIGHTS_PATH unset)'}"
+            )
+        model = loaded[0]
+
+    gnn_data = prepare_gnn_data(
+        graph, node_features, base_risks, normalize=True, scores=scores
+    )
+    if len(gnn_data["edge_index"][0]) > batch_edges(max_edges):
+        scores = run_gnn_minibatch(
+            gnn_data,
+            model=model,
+            max_edges=max_edges,
+            num_workers=num_workers,
+            num_threads=num_threads,
+        )
+    else:
+        scores = run_gnn_inference(gnn_data, num_threads=num_threads, model=model)
+
+    idx_to_wallet = gnn_data["idx_to_wallet"]
+    wallets = (
+        idx_to_wallet.tolist() if hasattr(idx_to_wallet, "tolist")
+        else [idx_to_wallet[i] for i in range(len(idx_to_wallet))]
+    )
+    return dict(zip(wallets, scores.reshape(-1).tolist()))
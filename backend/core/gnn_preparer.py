@@ -1,16 +1,52 @@
 import numpy as np
 
+from core.feature_extractor import NODE_FEATURES, FeatureTable
+from core.normalizer import min_max_normalize
+from core.risk_table import score_arrays
+
+RISK_FEATURES = (
+    "structural_risk",
+    "flow_risk",
+    "temporal_risk",
+    "proximity_risk",
+    "base_risk",
+)
+
+# Column order of X
+GNN_FEATURES = NODE_FEATURES + RISK_FEATURES
+EDGE_ATTRS = ("amount", "time_delta", "peeling_ratio")
+
 
 def prepare_gnn_data(
     G,
     node_features,
     base_risks,
-    edge_features,
+    edge_features=None,
+    normalize: bool = False,
+    out=None,
+    scores=None,
 ):
     """
     Prepares NumPy-based GNN inputs.
     NO torch, NO torch-geometric.
+
+    Accepts a ColumnarGraph or an nx.DiGraph. Entities without a base
+    risk entry (non-wallet services) get zero risk features. Without
+    edge_features, edge_attr is None.
+
+    For a ColumnarGraph, normalize=True min-max normalizes the node
+    features while writing them, `out` is an optional preallocated
+    (N, 12) float32 buffer, `scores` the score_columns() (or
+    risk_columns()) of base_risks when already built, and the adjacency is
+    handed over as views of the graph's pair arrays (see _prepare_columnar).
     """
+    if hasattr(G, "pairs"):
+        return _prepare_columnar(
+            G, node_features, base_risks, edge_features, normalize, out, scores
+        )
+
+    if normalize:
+        node_features = min_max_normalize(node_features)
 
     # ----------------------------------
     # 1. Node index mapping
@@ -22,45 +58,32 @@ def prepare_gnn_data(
     # ----------------------------------
     # 2. Node feature matrix X
     # ----------------------------------
-    X = np.zeros((len(wallets), 12), dtype=np.float32)
+    X = np.zeros((len(wallets), len(GNN_FEATURES)), dtype=np.float32)
 
     for wallet, idx in wallet_to_idx.items():
         nf = node_features[wallet]
-        br = base_risks[wallet]
-
-        X[idx] = [
-            nf["in_degree"],
-            nf["out_degree"],
-            nf["total_inflow"],
-            nf["total_outflow"],
-            nf["flow_imbalance"],
-            nf["tx_count"],
-            nf["active_time_span"],
-            br["structural_risk"],
-            br["flow_risk"],
-            br["temporal_risk"],
-            br["proximity_risk"],
-            br["base_risk"],
+        br = base_risks.get(wallet, {})
+
+        X[idx] = [nf[name] for name in NODE_FEATURES] + [
+            br.get(name, 0.0) for name in RISK_FEATURES
         ]
 
     # ----------------------------------
     # 3. Edge index & edge attributes
     # ----------------------------------
     src, dst = [], []
-    edge_attr = []
-
-    for (u, v), ef in edge_features.items():
+    for u, v in G.edges():
         src.append(wallet_to_idx[u])
         dst.append(wallet_to_idx[v])
 
-        edge_attr.append([
-            ef["amount"],
-            ef["time_delta"],
-            ef["peeling_ratio"],
-        ])
+    edge_index = np.array([src, dst], dtype=np.int64).reshape(2, -1)
 
-    edge_index = np.array([src, dst], dtype=np.int64)
-    edge_attr = np.array(edge_attr, dtype=np.float32)
+    edge_attr = None
+    if edge_features is not None:
+        edge_attr = np.array(
+            [[edge_features[e][name] for name in EDGE_ATTRS] for e in G.edges()],
+            dtype=np.float32,
+        ).reshape(-1, len(EDGE_ATTRS))
 
     return {
         "X": X,
@@ -69,3 +92,92 @@ def prepare_gnn_data(
         "wallet_to_idx": wallet_to_idx,
         "idx_to_wallet": idx_to_wallet,
     }
+
+
+def _prepare_columnar(graph, node_features, base_risks, edge_features, normalize, out, scores):
+    """
+    Same layout from a ColumnarGraph, without intermediate copies:
+
+        X           -> one float32 buffer in node order; features (and
+                       their normalization) and risk columns are written
+                       into it column by column (risk columns from
+                       the score_columns() arrays)
+        edge_index  -> (pair_src, pair_dst): the pair arrays themselves
+        in_csr      -> (indptr, predecessors) of the pair in-adjacency,
+                       i.e. the CSR layout of the aggregation matrix
+
+    Rows are node ids, edges are the wallet pairs (the order
+    nx.DiGraph.edges() yields them).
+    """
+    n = graph.num_nodes
+    shape = (n, len(GNN_FEATURES))
+
+    if out is None:
+        X = np.empty(shape, dtype=np.float32)
+    elif out.shape != shape or out.dtype != np.float32:
+        raise ValueError(f"out must be a float32 array of shape {shape}")
+    else:
+        X = out
+
+    if isinstance(node_features, FeatureTable) and len(node_features) == n:
+        for j, name in enumerate(NODE_FEATURES):
+            column = node_features.column(name)
+            if normalize:
+                _normalize_into(column, X[:, j])
+            else:
+                X[:, j] = column
+    else:
+        table = min_max_normalize(node_features) if normalize else node_features
+        for i, wallet in enumerate(graph.wallets.tolist()):
+            nf = table[wallet]
+            X[i, :len(NODE_FEATURES)] = [nf[name] for name in NODE_FEATURES]
+
+    # Only wallets have risk entries; everything else stays zero
+    if scores is None or scores["base_risks"] is not base_risks:
+        scores = score_arrays(base_risks, RISK_FEATURES)
+    index = graph.wallet_index
+    ids = scores["id"]
+    rows = np.fromiter(map(index.__getitem__, ids.tolist()), dtype=np.int64, count=len(ids))
+
+    risk = X[:, len(NODE_FEATURES):]
+    risk[:] = 0.0
+    for j, name in enumerate(RISK_FEATURES):
+        risk[rows, j] = scores[name]
+
+    store = graph.pairs
+
+    edge_attr = None
+    if isinstance(edge_features, FeatureTable) and len(edge_features) == store.num_pairs:
+        cols = [edge_features.columns.index(name) for name in EDGE_ATTRS]
+        edge_attr = edge_features.matrix[:, cols].astype(np.float32)
+    elif edge_features is not None:
+        # Any {(src, dst): {name: value}} mapping, read in pair order
+        wallets = graph.wallets
+        keys = zip(wallets[store.pair_src].tolist(), wallets[store.pair_dst].tolist())
+        edge_attr = np.array(
+            [[edge_features[e][name] for name in EDGE_ATTRS] for e in keys],
+            dtype=np.float32,
+        ).reshape(-1, len(EDGE_ATTRS))
+
+    return {
+        "X": X,
+        "edge_index": (store.pair_src, store.pair_dst),
+        "in_csr": store.in_adjacency(),
+        "edge_attr": edge_attr,
+        "wallet_to_idx": index,
+        "idx_to_wallet": graph.wallets,
+    }
+
+
+def _normalize_into(column, target):
+    """
+    Min-max normalize a float64 column straight into a float32 view.
+    """
+    if not len(column):
+        return
+    low, high = column.min(), column.max()
+    if high == low:
+        target[:] = 0.0
+        return
+    np.subtract(column, low, out=target, casting="same_kind")
+    target /= np.float32(high - low)
@@ -0,0 +1,204 @@
+"""
+Frontier-based traversals over integer CSR adjacency arrays.
+
+Adjacency is given as (indptr, neighbors): the neighbors of node i are
+neighbors[indptr[i]:indptr[i + 1]]. See EdgeStore.out_adjacency() /
+EdgeStore.in_adjacency().
+"""
+
+import numpy as np
+
+# Optional (sparse matrix-power batch mode)
+try:
+    import scipy.sparse as sp
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+def gather_neighbors(indptr, neighbors, nodes):
+    """
+    Concatenated neighbor lists of `nodes`, without a Python loop. With
+    neighbors=None the positions into the neighbor array are returned
+    instead (e.g. pair ids of an out_pairs() range).
+
+    Returns:
+        flat neighbor ids, per-node neighbor counts
+    """
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64), counts
+
+    # Position k of the output reads neighbors[starts[i] + (k - excl[i])]
+    excl = np.cumsum(counts) - counts
+    positions = np.repeat(starts - excl, counts) + np.arange(total)
+
+    if neighbors is None:
+        return positions, counts
+    return neighbors[positions], counts
+
+
+def multi_source_bfs(indptr, neighbors, sources, max_hops: int) -> np.ndarray:
+    """
+    Hop distance from the nearest source for every node, following the
+    given adjacency for at most `max_hops` hops.
+
+    Returns:
+        int64 array, -1 where no source is within `max_hops`.
+    """
+    n = len(indptr) - 1
+    dist = np.full(n, -1, dtype=np.int64)
+
+    frontier = np.unique(np.asarray(sources, dtype=np.int64))
+    dist[frontier] = 0
+
+    for hop in range(1, max_hops + 1):
+        if len(frontier) == 0:
+            break
+
+        reached, _ = gather_neighbors(indptr, neighbors, frontier)
+        reached = np.unique(reached[dist[reached] < 0])
+
+        dist[reached] = hop
+        frontier = reached
+
+    return dist
+
+
+# (source, node) keys held per batch of downstream_reach: about 8 bytes
+# each in every working array
+DEFAULT_MAX_KEYS = 1 << 18
+
+
+def downstream_reach(
+    indptr,
+    neighbors,
+    max_hops: int,
+    min_hops: int = 2,
+    batch_size: int = 4096,
+    nodes=None,
+    max_keys: int = DEFAULT_MAX_KEYS,
+) -> np.ndarray:
+    """
+    For every node, the number of distinct downstream nodes whose
+    shortest distance from it is min_hops..max_hops hops (the node itself
+    excluded): the targets nx.single_source_shortest_path(G, node,
+    cutoff=max_hops) returns with paths of at least min_hops hops.
+
+    Sources are expanded up to `batch_size` at a time by breadth-first
+    frontiers with a visited set of (source, node) keys. A batch whose
+    frontier or visited set would exceed `max_keys` is split in half and
+    redone, so working memory stays within that budget however dense the
+    graph (a single source can still reach every node). With `nodes`,
+    only those sources are expanded and the output aligns with `nodes`.
+
+    Returns:
+        int64 reach count per source
+    """
+    n = len(indptr) - 1
+    sources = (
+        np.arange(n, dtype=np.int64) if nodes is None
+        else np.asarray(nodes, dtype=np.int64)
+    )
+    reach = np.zeros(len(sources), dtype=np.int64)
+
+    # Source ranges still to count, last popped first
+    pending = [
+        (start, min(start + batch_size, len(sources)))
+        for start in range(0, len(sources), batch_size)
+    ][::-1]
+    while pending:
+        start, stop = pending.pop()
+        counts = _batch_reach(
+            indptr, neighbors, sources[start:stop], max_hops, min_hops, max_keys
+        )
+        if counts is None:
+            middle = (start + stop) // 2
+            pending += [(middle, stop), (start, middle)]
+            continue
+        reach[start:stop] = counts
+
+    return reach
+
+
+def _batch_reach(indptr, neighbors, batch, max_hops, min_hops, max_keys):
+    """
+    downstream_reach counts for one batch of sources, or None if a
+    batch of several sources goes over `max_keys`.
+    """
+    n = len(indptr) - 1
+    split = len(batch) > 1
+
+    # Frontier as (owner, node) pairs; owner indexes `batch`
+    owner = np.arange(len(batch), dtype=np.int64)
+    node = batch
+    visited = owner * n + node
+    counts = np.zeros(len(batch), dtype=np.int64)
+
+    for hop in range(1, max_hops + 1):
+        if split and int((indptr[node + 1] - indptr[node]).sum()) > max_keys:
+            return None
+
+        node, degree = gather_neighbors(indptr, neighbors, node)
+        if len(node) == 0:
+            break
+
+        key = np.unique(np.repeat(owner, degree) * n + node)
+        key = key[~np.isin(key, visited, assume_unique=True)]
+        if len(key) == 0:
+            break
+        if split and len(visited) + len(key) > max_keys:
+            return None
+
+        visited = np.union1d(visited, key)
+        owner, node = key // n, key % n
+
+        if hop >= min_hops:
+            counts += np.bincount(owner, minlength=len(batch))
+
+    return counts
+
+
+def downstream_reach_sparse(
+    num_nodes: int,
+    src,
+    dst,
+    max_hops: int,
+    min_hops: int = 2,
+) -> np.ndarray:
+    """
+    Same result as downstream_reach, computed as boolean sparse matrix
+    powers of (I + A) over the whole graph at once: nodes within max_hops
+    minus nodes within min_hops - 1.
+
+    Faster for moderate graphs, but the reachability matrix holds every
+    (source, downstream node) pair, so memory grows with density.
+    Requires scipy.
+    """
+    if not SCIPY_AVAILABLE:
+        raise ImportError("scipy is required for sparse matrix-power mode")
+
+    n = num_nodes
+    step = (
+        sp.csr_matrix(
+            (np.ones(len(src), dtype=np.int64), (src, dst)),
+            shape=(n, n),
+        )
+        + sp.identity(n, dtype=np.int64, format="csr")
+    ).astype(bool).astype(np.int64)
+
+    # Row i of `within` marks the nodes at most `hop` hops from i (itself
+    # included)
+    within = sp.identity(n, dtype=np.int64, format="csr")
+    near = None
+    for hop in range(1, max_hops + 1):
+        within = (within @ step).astype(bool).astype(np.int64)
+        if hop == min_hops - 1:
+            near = within
+    if near is None:
+        near = sp.identity(n, dtype=np.int64, format="csr")
+
+    return (np.diff(within.indptr) - np.diff(near.indptr)).astype(np.int64)
@@ -0,0 +1,344 @@
+"""
+Filtered, paginated views of an analyzed graph for /api/graph/.
+
+Per-node and per-pair arrays (risk, entity type, pattern bits, tokens)
+are built once per analysis and kept next to the results, so a request
+only masks, sorts and slices arrays and serializes the rows it returns.
+
+    nodes -> filtered by min risk / pattern / entity type / token type,
+             optionally cut to the top-K by risk, then paginated
+    edges -> pairs between two returned nodes (matching the token
+             filter, if any)
+
+ego_subgraph() serves the k-hop neighborhood of one wallet straight from
+the pair adjacency index, touching only that neighborhood.
+"""
+
+import numpy as np
+
+from core.graph_search import gather_neighbors
+from core.pattern_matrix import PATTERN_BITS, PATTERNS
+from core.risk_table import RISKY_THRESHOLD, risk_columns, to_records
+
+# risk is the base (rule-based) risk; final_risk blends in the GNN score
+# as /api/final-risk/ does, so a graph page needs no separate score list
+NODE_FIELDS = (
+    "id", "risk", "final_risk", "is_risky", "is_involved", "entity_type", "reasons",
+)
+EDGE_FIELDS = ("source", "target", "amount", "tx_count", "is_suspicious", "pattern")
+
+ENTITY_TYPES = ("wallet", "service")
+
+# Ego-subgraph defaults: hubs (exchanges) contribute only their
+# highest-risk neighbors
+DEFAULT_HOPS = 2
+DEFAULT_MAX_NODES = 500
+DEFAULT_MAX_DEGREE = 50
+
+# Upper bounds accepted from clients
+MAX_HOPS = 5
+MAX_NODES = 5000
+
+
+def graph_arrays(results: dict) -> dict:
+    """
+    Precomputed serving arrays of one analysis, memoized in `results`.
+
+    Rebuilt only when the graph or a risk scores object changes (e.g.
+    after an incremental append).
+    """
+    graph = results["graph"]
+    base_risks = results.get("base_risks") or {}
+    gnn_risks = results.get("gnn_risks")
+
+    cached = results.get("graph_view")
+    if (
+        cached and cached["graph"] is graph
+        and cached["base_risks"] is base_risks and cached["gnn_risks"] is gnn_risks
+    ):
+        return cached
+
+    wallets = graph.wallets.tolist()
+    risk = np.fromiter(
+        (base_risks.get(w, {}).get("base_risk", 0.0) for w in wallets),
+        dtype=np.float64,
+        count=len(wallets),
+    )
+    is_wallet = np.fromiter(
+        (w.startswith("0x") for w in wallets), dtype=bool, count=len(wallets)
+    )
+
+    # risk_columns() rows follow base_risks order; align them to node ids
+    scores = risk_columns(results)
+    final_risk = scores["final_risk"]
+    if not np.array_equal(scores["id"], graph.wallets):
+        by_wallet = dict(zip(scores["id"].tolist(), final_risk.tolist()))
+        final_risk = np.fromiter(
+            (by_wallet.get(w, 0.0) for w in wallets), dtype=np.float64, count=len(wallets)
+        )
+
+    # Distinct (pair, token) combinations, encoded pair * num_tokens + token
+    store = graph.pairs
+    num_tokens = max(len(graph.token_types), 1)
+    pair_tokens = np.unique(store.edge_pair * num_tokens + graph.token_codes)
+
+    patterns = results["patterns"]
+    arrays = {
+        "graph": graph,
+        "base_risks": base_risks,
+        "gnn_risks": gnn_risks,
+        "risk": risk,
+        "final_risk": final_risk,
+        "is_wallet": is_wallet,
+        "bits": patterns.bits,
+        "fan_out": patterns.has("fan_out"),
+        "peeling": patterns.has("peeling_chain"),
+        "token_index": {t: i for i, t in enumerate(graph.token_types.tolist())},
+        "pair_tokens": pair_tokens,
+        "num_tokens": num_tokens,
+    }
+    results["graph_view"] = arrays
+    return arrays
+
+
+def graph_page(
+    results: dict,
+    min_risk: float = None,
+    patterns=None,
+    entity_type: str = None,
+    token_type: str = None,
+    top_k: int = None,
+    page: int = 1,
+    page_size: int = None,
+    fields=None,
+    edge_fields=None,
+    columnar: bool = False,
+) -> dict:
+    """
+    One page of the graph as {"nodes", "edges", "page"}.
+
+    Without any argument this is the whole graph in node id order. With
+    top_k, nodes are ordered by risk (highest first). With columnar=True
+    nodes and edges are {field: values} instead of lists of rows. Raises
+    ValueError on unknown pattern / entity type / field names.
+    """
+    arrays = graph_arrays(results)
+    graph = arrays["graph"]
+    store = graph.pairs
+
+    fields = _fields(fields, NODE_FIELDS)
+    edge_fields = _fields(edge_fields, EDGE_FIELDS)
+
+    # -------- Node filters --------
+    keep = np.ones(graph.num_nodes, dtype=bool)
+
+    if min_risk is not None:
+        keep &= arrays["risk"] >= min_risk
+
+    if patterns:
+        unknown = set(patterns) - set(PATTERN_BITS)
+        if unknown:
+            raise ValueError(f"Unknown pattern(s): {sorted(unknown)}")
+        mask = np.uint8(0)
+        for name in patterns:
+            mask |= PATTERN_BITS[name]
+        keep &= (arrays["bits"] & mask) != 0
+
+    if entity_type is not None:
+        if entity_type not in ENTITY_TYPES:
+            raise ValueError(f"entity_type must be one of {list(ENTITY_TYPES)}")
+        keep &= arrays["is_wallet"] == (entity_type == "wallet")
+
+    pair_mask = None
+    if token_type is not None:
+        pair_mask = np.zeros(store.num_pairs, dtype=bool)
+        token = arrays["token_index"].get(token_type)
+        if token is not None:
+            combos = arrays["pair_tokens"]
+            pair_mask[combos[combos % arrays["num_tokens"] == token] // arrays["num_tokens"]] = True
+
+        # Only wallets that sent or received that token
+        touches = np.zeros(graph.num_nodes, dtype=bool)
+        touches[store.pair_src[pair_mask]] = True
+        touches[store.pair_dst[pair_mask]] = True
+        keep &= touches
+
+    nodes = np.flatnonzero(keep)
+
+    # -------- Top-K / pagination --------
+    if top_k is not None:
+        risk = arrays["risk"][nodes]
+        # Highest risk first, node id breaks ties
+        nodes = nodes[np.lexsort((nodes, -risk))][:top_k]
+
+    total = len(nodes)
+    if page_size is not None:
+        start = (page - 1) * page_size
+        nodes = nodes[start:start + page_size]
+
+    # -------- Edges between returned nodes --------
+    selected = np.zeros(graph.num_nodes, dtype=bool)
+    selected[nodes] = True
+    pair_keep = selected[store.pair_src] & selected[store.pair_dst]
+    if pair_mask is not None:
+        pair_keep &= pair_mask
+    pair_ids = np.flatnonzero(pair_keep)
+
+    shape = (lambda values: values) if columnar else to_records
+    return {
+        "nodes": shape(_node_columns(arrays, nodes, fields)),
+        "edges": shape(_edge_columns(arrays, pair_ids, edge_fields)),
+        "page": {
+            "page": page,
+            "page_size": page_size,
+            "total_nodes": total,
+            "num_nodes": len(nodes),
+            "num_edges": len(pair_ids),
+        },
+    }
+
+
+def ego_subgraph(
+    results: dict,
+    wallet: str,
+    hops: int = DEFAULT_HOPS,
+    max_nodes: int = DEFAULT_MAX_NODES,
+    max_degree: int = DEFAULT_MAX_DEGREE,
+) -> dict:
+    """
+    Wallets within `hops` hops of `wallet` (following transfers in either
+    direction) and the pairs between them.
+
+    Each expanded node contributes at most `max_degree` neighbors (its
+    highest-risk ones); a hop whose new nodes would exceed `max_nodes`
+    keeps the highest-risk ones. Hubs whose neighbors were cut are marked
+    "truncated". Raises KeyError for an unknown wallet.
+    """
+    arrays = graph_arrays(results)
+    graph = arrays["graph"]
+    store = graph.pairs
+    risk = arrays["risk"]
+
+    center = graph.wallet_index[wallet]
+    out_indptr, successors = store.out_adjacency()
+    in_indptr, predecessors = store.in_adjacency()
+
+    hop_of = {center: 0}
+    truncated = set()
+    capped = False
+    frontier = [center]
+
+    for hop in range(1, hops + 1):
+        if not frontier or len(hop_of) >= max_nodes:
+            break
+
+        found = []
+        for node in frontier:
+            neighbors = np.unique(np.concatenate([
+                successors[out_indptr[node]:out_indptr[node + 1]],
+                predecessors[in_indptr[node]:in_indptr[node + 1]],
+            ]))
+            if len(neighbors) > max_degree:
+                neighbors = _highest_risk(neighbors, risk, max_degree)
+                truncated.add(node)
+            found.append(neighbors)
+
+        new = np.unique(np.concatenate(found))
+        new = new[[n not in hop_of for n in new.tolist()]]
+
+        room = max_nodes - len(hop_of)
+        if len(new) > room:
+            new = _highest_risk(new, risk, room)
+            capped = True
+
+        frontier = new.tolist()
+        hop_of.update((n, hop) for n in frontier)
+
+    nodes = np.fromiter(hop_of, dtype=np.int64, count=len(hop_of))
+
+    # Pairs between returned nodes, from their outgoing pair ranges
+    pair_ids, _ = gather_neighbors(out_indptr, None, nodes)
+    pair_ids = np.sort(pair_ids[np.isin(store.pair_dst[pair_ids], nodes)])
+
+    rows = to_records(_node_columns(arrays, nodes, NODE_FIELDS))
+    bits = arrays["bits"][nodes].tolist()
+    degree = (
+        out_indptr[nodes + 1] - out_indptr[nodes]
+        + in_indptr[nodes + 1] - in_indptr[nodes]
+    ).tolist()
+
+    for row, node, node_bits, node_degree in zip(rows, nodes.tolist(), bits, degree):
+        row["hop"] = hop_of[node]
+        row["patterns"] = [
+            name for name in PATTERNS if node_bits & int(PATTERN_BITS[name])
+        ]
+        row["degree"] = node_degree
+        row["truncated"] = node in truncated
+
+    return {
+        "center": wallet,
+        "hops": hops,
+        "nodes": rows,
+        "edges": to_records(_edge_columns(arrays, pair_ids, EDGE_FIELDS)),
+        "truncated": capped or bool(truncated),
+    }
+
+
+def _highest_risk(nodes, risk, k) -> np.ndarray:
+    """
+    The `k` highest-risk of `nodes` (node id breaks ties), in id order.
+    """
+    order = np.lexsort((nodes, -risk[nodes]))
+    return np.sort(nodes[order[:k]])
+
+
+def _fields(requested, allowed) -> tuple:
+    if not requested:
+        return allowed
+    unknown = set(requested) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {sorted(unknown)}")
+    # Keep the canonical order
+    return tuple(f for f in allowed if f in requested)
+
+
+def _node_columns(arrays, nodes, fields) -> dict:
+    graph = arrays["graph"]
+    ids = graph.wallets[nodes].tolist()
+    risk = arrays["risk"][nodes]
+
+    columns = {
+        "id": lambda: ids,
+        "risk": lambda: risk,
+        "final_risk": lambda: arrays["final_risk"][nodes],
+        "is_risky": lambda: risk >= RISKY_THRESHOLD,
+        "is_involved": lambda: arrays["bits"][nodes] != 0,
+        "entity_type": lambda: np.where(
+            arrays["is_wallet"][nodes], "wallet", "service"
+        ).tolist(),
+        "reasons": lambda: [
+            arrays["base_risks"].get(w, {}).get("reasons", []) for w in ids
+        ],
+    }
+    return {f: columns[f]() for f in fields}
+
+
+def _edge_columns(arrays, pair_ids, fields) -> dict:
+    graph = arrays["graph"]
+    store = graph.pairs
+    src = store.pair_src[pair_ids]
+
+    smurfing = arrays["fan_out"][src]
+    peel = arrays["peeling"][src]
+
+    columns = {
+        "source": lambda: graph.wallets[src].tolist(),
+        "target": lambda: graph.wallets[store.pair_dst[pair_ids]].tolist(),
+        "amount": lambda: store.pair_amount[pair_ids],
+        "tx_count": lambda: store.pair_count[pair_ids],
+        "is_suspicious": lambda: smurfing | peel,
+        "pattern": lambda: np.where(
+            smurfing, "smurfing", np.where(peel, "peeling", None)
+        ).tolist(),
+    }
+    return {f: columns[f]() for f in fields}
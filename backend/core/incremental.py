@@ -0,0 +1,273 @@
+"""
+Incremental append: fold new transactions into an existing analysis
+without recomputing it from scratch.
+
+    graph          -> rows appended; known wallets keep their node ids
+    node features  -> degrees / flows / time bounds updated from the new
+                      rows only; derived columns redone for touched nodes
+    edge features  -> recomputed only for pairs whose source wallet sent
+                      or received a new transaction; other rows copied
+    patterns       -> per-wallet rules redone for touched wallets
+                      (convergence never flags, see
+                      multi_hop_convergence_mask)
+    base risk      -> redone for touched wallets and for wallets whose
+                      proximity can change (upstream of a new transfer or
+                      of a wallet whose flags changed, within max_hops)
+
+The result matches run_full_analysis over old + new rows.
+"""
+
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.columnar_graph import ColumnarGraphBuilder
+from core.feature_extractor import (
+    EDGE_FEATURES,
+    NS_PER_SECOND,
+    FeatureTable,
+    edge_feature_keys,
+    edge_feature_rows,
+    node_time_bounds,
+)
+from core.graph_builder import REQUIRED_COLUMNS, graph_summary
+from core.graph_search import gather_neighbors, multi_source_bfs
+from core.pattern_detector import (
+    fan_in_mask,
+    fan_out_mask,
+    mule_wallet_mask,
+    resolve_thresholds,
+)
+from core.pattern_matrix import PATTERN_BITS, PatternMatrix
+from core.pipeline import analysis_keys
+from core.risk_index import risk_index
+from core.risk_scorer import DEFAULT_WEIGHTS, compute_base_risk
+
+
+def appended_dataset_id(dataset_id: str, df: pd.DataFrame) -> str:
+    """
+    Content id of a dataset after appending `df`: chained from the old id
+    and a hash of the new rows.
+    """
+    rows = pd.util.hash_pandas_object(
+        df[sorted(REQUIRED_COLUMNS)].astype(str), index=False
+    )
+    h = hashlib.sha256(dataset_id.encode())
+    h.update(rows.to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def append_transactions(results: dict, df: pd.DataFrame, max_hops: int = 3) -> dict:
+    """
+    Results of run_full_analysis (or of an earlier append) with the rows
+    of `df` appended. `results` itself is not modified.
+
+    Returns a results dict of the same shape, plus "append" stats.
+    """
+    start_time = time.perf_counter()
+
+    missing = REQUIRED_COLUMNS - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    params = results.get("params") or {}
+    thresholds = resolve_thresholds(params.get("thresholds"))
+    weights = tuple(params.get("weights") or DEFAULT_WEIGHTS)
+
+    old_graph = results["graph"]
+    start = old_graph.num_edges
+
+    # -------- Graph --------
+    builder = ColumnarGraphBuilder.extending(old_graph)
+    builder.add_chunk(df)
+    graph = builder.build()
+
+    new_src = graph.src[start:]
+    touched = np.unique(np.concatenate([new_src, graph.dst[start:]]))
+
+    # -------- Node features --------
+    bounds = results.get("node_time_bounds") or node_time_bounds(old_graph)
+    bounds = node_time_bounds(graph, start, bounds)
+    node_features = _append_node_features(
+        results["node_features"], graph, start, touched, bounds
+    )
+
+    # -------- Edge features --------
+    # A wallet's outgoing pairs change with its own transfers and, through
+    # its max inflow (peeling ratio), with transfers it receives
+    edge_features, pair_ids, pair_rows = _append_edge_features(
+        results["edge_features"], old_graph, graph, touched
+    )
+
+    # -------- Patterns --------
+    patterns = _append_patterns(
+        results["patterns"], graph, node_features, touched,
+        pair_ids, pair_rows, thresholds,
+    )
+
+    # -------- Base risk --------
+    old_flagged = results["patterns"].flagged_mask()
+    new_flagged = patterns.flagged_mask()
+    changed = np.flatnonzero(
+        new_flagged[:len(old_flagged)] != old_flagged
+    )
+    changed = np.concatenate([
+        changed, len(old_flagged) + np.flatnonzero(new_flagged[len(old_flagged):])
+    ])
+
+    rescored = np.zeros(graph.num_nodes, dtype=bool)
+    rescored[touched] = True
+    rescored[_upstream(graph, new_src, max_hops - 1)] = True
+    rescored[_upstream(graph, changed, max_hops)] = True
+
+    base_risks = dict(results["base_risks"])
+    base_risks.update(compute_base_risk(
+        graph,
+        node_features,
+        patterns,
+        weights=weights,
+        max_hops=max_hops,
+        wallets=graph.wallets[rescored].tolist(),
+    ))
+
+    # -------- GNN refinement (whole graph) --------
+    gnn_risks = None
+    if results.get("gnn_risks") is not None:
+        from core.pipeline import run_gnn_refinement
+        gnn_risks = run_gnn_refinement(
+            graph=graph,
+            node_features=node_features,
+            base_risks=base_risks,
+        )
+
+    seconds = round(time.perf_counter() - start_time, 4)
+    dataset_id = appended_dataset_id(results["ingest"]["dataset_id"], df)
+
+    appended = {
+        **results,
+        "graph": graph,
+        "graph_summary": graph_summary(graph),
+        "ingest": {"dataset_id": dataset_id, "source": "append", "seconds": seconds},
+        "analysis_id": analysis_keys(dataset_id, thresholds, weights)["risk"],
+        "node_features": node_features,
+        "edge_features": edge_features,
+        "patterns": patterns,
+        "base_risks": base_risks,
+        "gnn_risks": gnn_risks,
+        "node_time_bounds": bounds,
+        "append": {
+            "parent_dataset_id": results["ingest"]["dataset_id"],
+            "new_transactions": graph.num_edges - start,
+            "new_wallets": graph.num_nodes - old_graph.num_nodes,
+            "touched_wallets": len(touched),
+            "recomputed_edge_pairs": len(pair_ids),
+            "rescored_wallets": int(rescored.sum()),
+            "seconds": seconds,
+        },
+    }
+
+    # New scores: rebuild the sorted index (the copied one is stale)
+    risk_index(appended)
+    return appended
+
+
+def _upstream(graph, nodes, hops: int) -> np.ndarray:
+    """
+    Nodes that reach any of `nodes` within `hops` hops (including them).
+    """
+    if hops < 0 or not len(nodes):
+        return np.zeros(0, dtype=np.int64)
+    indptr, predecessors = graph.pairs.in_adjacency()
+    return np.flatnonzero(multi_source_bfs(indptr, predecessors, nodes, hops) >= 0)
+
+
+def _append_node_features(table, graph, start, touched, bounds) -> FeatureTable:
+    n = graph.num_nodes
+    src, dst, amount = graph.src[start:], graph.dst[start:], graph.amount[start:]
+
+    matrix = np.zeros((n, len(table.columns)), dtype=np.float64)
+    matrix[:len(table)] = table.matrix
+
+    # Row-order accumulation, exactly like bincount over all rows
+    np.add.at(matrix[:, 0], dst, 1)
+    np.add.at(matrix[:, 1], src, 1)
+    np.add.at(matrix[:, 2], dst, amount)
+    np.add.at(matrix[:, 3], src, amount)
+
+    inflow, outflow = matrix[touched, 2], matrix[touched, 3]
+    first_ts, last_ts = bounds
+
+    matrix[touched, 4] = np.abs(inflow - outflow) / (inflow + outflow + 1e-9)
+    matrix[touched, 5] = matrix[touched, 0] + matrix[touched, 1]
+    matrix[touched, 6] = (last_ts[touched] - first_ts[touched]) / NS_PER_SECOND
+
+    return FeatureTable(graph.wallets, table.columns, matrix, table.int_columns)
+
+
+def _append_edge_features(table, old_graph, graph, touched):
+    old_store, store = old_graph.pairs, graph.pairs
+
+    matrix = np.zeros((store.num_pairs, len(EDGE_FEATURES)), dtype=np.float64)
+
+    # Untouched sources have the same pairs in the same order: copy rows
+    kept = np.ones(old_graph.num_nodes, dtype=bool)
+    kept[touched[touched < old_graph.num_nodes]] = False
+    kept = np.flatnonzero(kept)
+
+    old_indptr, _ = old_store.out_pairs()
+    new_indptr, _ = store.out_pairs()
+    old_ids, _ = gather_neighbors(
+        old_indptr, np.arange(old_store.num_pairs, dtype=np.int64), kept
+    )
+    new_ids, _ = gather_neighbors(
+        new_indptr, np.arange(store.num_pairs, dtype=np.int64), kept
+    )
+    matrix[new_ids] = table.matrix[old_ids]
+
+    pair_ids, rows = edge_feature_rows(graph, touched)
+    matrix[pair_ids] = rows
+
+    edge_features = FeatureTable(
+        edge_feature_keys(graph), table.columns, matrix, table.int_columns
+    )
+    return edge_features, pair_ids, rows
+
+
+def _append_patterns(
+    patterns,
+    graph,
+    node_features,
+    touched,
+    pair_ids,
+    pair_rows,
+    thresholds,
+) -> PatternMatrix:
+    n = graph.num_nodes
+
+    bits = np.zeros(n, dtype=np.uint8)
+    bits[:len(patterns)] = patterns.bits
+    peeling = np.zeros(n, dtype=np.int64)
+    peeling[:len(patterns)] = patterns.peeling_counts
+
+    def assign(name, nodes, mask):
+        bits[nodes] &= ~PATTERN_BITS[name]
+        bits[nodes[mask]] |= PATTERN_BITS[name]
+
+    # Per-wallet rules over the touched rows only
+    rows = FeatureTable(
+        graph.wallets[touched], node_features.columns, node_features.matrix[touched]
+    )
+    assign("fan_out", touched, fan_out_mask(rows, **thresholds["fan_out"]))
+    assign("fan_in", touched, fan_in_mask(rows, **thresholds["fan_in"]))
+    assign("mule_wallet", touched, mule_wallet_mask(rows, **thresholds["mule_wallet"]))
+
+    # Peeling counts from the recomputed pairs of touched sources
+    peel_thresh = thresholds["peeling_chain"]["peel_thresh"]
+    flagged = pair_rows[:, EDGE_FEATURES.index("peeling_ratio")] >= peel_thresh
+    counts = np.bincount(graph.pairs.pair_src[pair_ids[flagged]], minlength=n)
+    peeling[touched] = counts[touched]
+    assign("peeling_chain", touched, peeling[touched] > 0)
+
+    return PatternMatrix(graph.wallets, bits, peeling)
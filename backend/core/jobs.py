@@ -0,0 +1,349 @@
+"""
+Background analysis jobs.
+
+run_full_analysis runs in a bounded process pool so the caller returns
+immediately with a job id. Job records (state, per-phase progress,
+outcome) are JSON files in a state directory, so every process pointing
+at the same directory (e.g. gunicorn workers) can report on any job.
+Pool workers write their progress straight into the record.
+
+At most `max_workers` analyses run at once across all those processes:
+a worker holds one of `max_workers` slot file locks while it runs.
+
+Finished results are handed to the job's on_done hook (e.g. the result
+store) in the submitting process and released; without a hook that
+process keeps them until the job is evicted.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from core.pipeline import PHASES, run_full_analysis
+
+# Optional (server-wide worker slots; without it the limit is per process)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_JOBS = 32
+
+# How often a queued worker retries the slot locks
+SLOT_POLL_SECONDS = 0.2
+
+# Results fields kept on the job record after the results are handed off
+SUMMARY_KEYS = ("graph_summary", "ingest", "phase_seconds", "phase_cache")
+
+
+# ----------------------------------
+# Job records
+# ----------------------------------
+def read_record(path: str):
+    """
+    Job record at `path`, or None if there is none.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_record(path: str, record: dict):
+    """
+    Atomic write: readers see the old record or the new one.
+    """
+    fd, scratch = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(record, f, default=_plain)
+        os.replace(scratch, path)
+    except OSError:
+        if os.path.exists(scratch):
+            os.remove(scratch)
+        raise
+
+
+def _plain(value):
+    # NumPy scalars in summaries
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+@contextmanager
+def worker_slot(state_dir: str, slots: int):
+    """
+    Hold one of `slots` lock files under `state_dir`, waiting for a free
+    one. The lock is released when the process exits, even on a crash.
+    """
+    if not FCNTL_AVAILABLE:
+        yield
+        return
+
+    while True:
+        for i in range(slots):
+            f = open(os.path.join(state_dir, f"slot-{i}.lock"), "a")
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                f.close()
+                continue
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+                f.close()
+            return
+        time.sleep(SLOT_POLL_SECONDS)
+
+
+def _run_job(record_path, state_dir, slots, csv_path, kwargs):
+    """
+    Worker entry point (runs in the pool process).
+    """
+    with worker_slot(state_dir, slots):
+        record = read_record(record_path)
+        record["state"] = "running"
+        record["started_at"] = time.time()
+        write_record(record_path, record)
+
+        def report(phase, state, seconds=None):
+            record["phases"][phase] = {"state": state, "seconds": seconds}
+            write_record(record_path, record)
+
+        return run_full_analysis(csv_path, progress=report, **kwargs)
+
+
+class AnalysisJobs:
+    """
+    Bounded pool of analysis workers plus the records of recent jobs.
+
+    At most `max_workers` analyses run at once per `state_dir`; further
+    jobs queue. Only the `max_jobs` most recent finished job records are
+    kept. Without a `state_dir` records live in a private temporary
+    directory, i.e. this process only.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        state_dir: str = None,
+    ):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.state_dir = str(state_dir) if state_dir else tempfile.mkdtemp(prefix="smurf_proof_jobs-")
+        os.makedirs(self.state_dir, exist_ok=True)
+
+        # Jobs submitted by this process: {"future", "exception", "results"}
+        self.jobs = {}
+
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _pool(self):
+        # Started lazily: spawning workers at import time would also spawn
+        # them in every management command
+        if self._executor is None:
+            # Fresh interpreters instead of forks of a threaded web server
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+            )
+        return self._executor
+
+    def _record_path(self, job_id: str) -> str:
+        return os.path.join(self.state_dir, f"{job_id}.json")
+
+    def _key_path(self, key: str) -> str:
+        digest = hashlib.sha256(str(key).encode()).hexdigest()[:32]
+        return os.path.join(self.state_dir, f"{digest}.key")
+
+    def submit(self, csv_path: str, on_done=None, key: str = None, **kwargs) -> str:
+        """
+        Queue run_full_analysis(csv_path, **kwargs). Returns the job id.
+
+        on_done: optional callable(results), called in this process when
+        the job succeeds. The job only counts as done once it returns; the
+        results are then released here. If it raises, the job is failed
+        with that error.
+
+        key: optional name (e.g. a dataset id) under which latest() finds
+        this job from any process.
+        """
+        job_id = uuid.uuid4().hex
+        path = self._record_path(job_id)
+
+        write_record(path, {
+            "job_id": job_id,
+            "key": key,
+            "state": "queued",
+            "phases": {phase: {"state": "pending", "seconds": None} for phase in PHASES},
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "summary": None,
+            # Owner of the job: the process that records its outcome
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+        })
+        if key is not None:
+            write_record(self._key_path(key), {"job_id": job_id})
+
+        with self._lock:
+            future = self._pool().submit(
+                _run_job, path, self.state_dir, self.max_workers, csv_path, kwargs
+            )
+            self.jobs[job_id] = {"future": future, "exception": None, "results": None}
+            self._evict()
+
+        future.add_done_callback(
+            lambda future: self._finish(job_id, future, on_done)
+        )
+        return job_id
+
+    def _finish(self, job_id, future, on_done):
+        """
+        Done callback: record the outcome and drop the future, which holds
+        the full results.
+        """
+        record = read_record(self._record_path(job_id))
+        error = summary = kept = None
+
+        exception = future.exception()
+        if exception is None:
+            results = future.result()
+            summary = {key: results.get(key) for key in SUMMARY_KEYS}
+            if on_done is None:
+                kept = results
+            else:
+                try:
+                    on_done(results)
+                except Exception as e:
+                    exception = e
+                    error = f"Storing the results failed: {e}"
+
+        if record is not None:
+            record.update(
+                state="failed" if exception is not None else "done",
+                finished_at=time.time(),
+                error=error or (str(exception) if exception is not None else None),
+                summary=summary if exception is None else None,
+            )
+            write_record(self._record_path(job_id), record)
+
+        with self._lock:
+            local = self.jobs.get(job_id)
+            if local is not None:
+                local.update(future=None, exception=exception, results=kept)
+
+    def _evict(self):
+        """
+        Keep the max_jobs most recent finished jobs (lock held).
+        """
+        finished = []
+        for name in os.listdir(self.state_dir):
+            if name.endswith(".json"):
+                record = read_record(os.path.join(self.state_dir, name))
+                if record and record["finished_at"] is not None:
+                    finished.append((record["finished_at"], record["job_id"], record["key"]))
+
+        finished.sort()
+        for _, job_id, key in finished[:max(len(finished) - self.max_jobs, 0)]:
+            _remove(self._record_path(job_id))
+            if key is not None and self.latest(key) == job_id:
+                _remove(self._key_path(key))
+            self.jobs.pop(job_id, None)
+
+    def latest(self, key: str):
+        """
+        Id of the last job submitted under `key`, or None.
+        """
+        pointer = read_record(self._key_path(key))
+        return pointer["job_id"] if pointer else None
+
+    def status(self, job_id: str):
+        """
+        Job state and per-phase progress. None for unknown job ids.
+
+        state: queued | running | done | failed
+        """
+        record = read_record(self._record_path(job_id))
+        if record is None:
+            return None
+
+        state, error = record["state"], record["error"]
+        if state in ("queued", "running") and _owner_gone(record):
+            state, error = "failed", "The process running this analysis exited"
+
+        finished_at = record["finished_at"] or time.time()
+
+        return {
+            "job_id": job_id,
+            "state": state,
+            "phases": record["phases"],
+            "elapsed_seconds": round(finished_at - record["submitted_at"], 4),
+            "error": error,
+        }
+
+    def summary(self, job_id: str):
+        """
+        graph_summary / ingest / phase_seconds / phase_cache of a job that
+        succeeded; None otherwise.
+        """
+        record = read_record(self._record_path(job_id))
+        return record["summary"] if record and record["state"] == "done" else None
+
+    def result(self, job_id: str):
+        """
+        Results of a finished job submitted by this process without
+        on_done; None if unknown, unfinished or handed off to on_done.
+        Re-raises the error of failed jobs.
+        """
+        local = self.jobs.get(job_id)
+        if not local or local["future"] is not None:
+            return None
+        if local["exception"] is not None:
+            raise local["exception"]
+        return local["results"]
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _owner_gone(record) -> bool:
+    """
+    True if the process that owns an unfinished job is known to be dead
+    (only checked on the same host).
+    """
+    if record.get("host") != socket.gethostname():
+        return False
+    try:
+        os.kill(record["pid"], 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return False
@@ -1,7 +1,15 @@
+import numpy as np
+
+from core.feature_extractor import FeatureTable
+
+
 def min_max_normalize(feature_dict: dict) -> dict:
     """
     Normalizes each feature across all nodes or edges to [0,1].
     """
+    if isinstance(feature_dict, FeatureTable):
+        return _min_max_normalize_table(feature_dict)
+
     keys = list(feature_dict.keys())
     feature_names = feature_dict[keys[0]].keys()
 
@@ -21,3 +29,18 @@ def min_max_normalize(feature_dict: dict) -> dict:
                 ) / (max_val - min_val)
 
     return normalized
+
+
+def _min_max_normalize_table(table: FeatureTable) -> FeatureTable:
+    """
+    Column-wise version of the above on the dense feature matrix.
+    """
+    matrix = table.matrix
+    min_val = matrix.min(axis=0)
+    span = matrix.max(axis=0) - min_val
+
+    flat = span == 0
+    normalized = (matrix - min_val) / np.where(flat, 1.0, span)
+    normalized[:, flat] = 0.0
+
+    return FeatureTable(table.keys_array, table.columns, normalized)
@@ -1,100 +1,176 @@
-import networkx as nx
+import numpy as np
+
+from core.columnar_graph import as_columnar
+from core.feature_extractor import NODE_FEATURES, FeatureTable
+from core.pattern_matrix import PATTERN_REASONS, PatternMatrix, pack_patterns
+
+# Every detector threshold, by pattern; detect_patterns() accepts overrides
+DEFAULT_THRESHOLDS = {
+    "fan_out": {"out_thresh": 0.6, "in_thresh": 0.2},
+    "fan_in": {"in_thresh": 0.6, "out_thresh": 0.2},
+    "multi_hop_convergence": {"max_hops": 3},
+    "peeling_chain": {"peel_thresh": 0.8},
+    "mule_wallet": {
+        "imbalance_thresh": 0.2,
+        "time_thresh": 0.3,
+        "degree_thresh": 0.2,
+    },
+}
 
 
 # -------------------------------------------------
-# 1. Fan-Out Detection (Smurfing / Splitting)
+# Utility
 # -------------------------------------------------
-def detect_fan_out(node_features, out_thresh=0.6, in_thresh=0.2):
-    results = {}
+def resolve_thresholds(thresholds=None) -> dict:
+    """
+    DEFAULT_THRESHOLDS with per-pattern overrides applied.
 
-    for node, feats in node_features.items():
-        is_fan_out = (
-            feats["out_degree"] >= out_thresh and
-            feats["in_degree"] <= in_thresh
-        )
+    Raises ValueError for an unknown pattern or threshold name, or a
+    non-numeric value.
+    """
+    for name, overrides in (thresholds or {}).items():
+        if name not in DEFAULT_THRESHOLDS:
+            raise ValueError(f"Unknown pattern in thresholds: {name!r}")
+        if not isinstance(overrides, dict):
+            raise ValueError(f"Thresholds for {name!r} must be an object")
+        for key, value in overrides.items():
+            if key not in DEFAULT_THRESHOLDS[name]:
+                raise ValueError(f"Unknown threshold for {name!r}: {key!r}")
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Threshold {name}.{key} must be a number")
+
+    return {
+        name: {**defaults, **(thresholds or {}).get(name, {})}
+        for name, defaults in DEFAULT_THRESHOLDS.items()
+    }
+
+
+def as_feature_table(node_features) -> FeatureTable:
+    """
+    Accepts a FeatureTable or a plain node_features dict. An empty dict
+    gives an empty table with the NODE_FEATURES columns.
+    """
+    if isinstance(node_features, FeatureTable):
+        return node_features
 
-        results[node] = {
-            "fan_out": is_fan_out,
-            "fan_out_reason": (
-                "High out-degree with minimal incoming transactions"
-                if is_fan_out else None
-            )
+    keys = list(node_features)
+    columns = list(node_features[keys[0]]) if keys else list(NODE_FEATURES)
+    matrix = np.array(
+        [[node_features[k][c] for c in columns] for k in keys],
+        dtype=np.float64,
+    ).reshape(len(keys), len(columns))
+
+    return FeatureTable(keys, columns, matrix)
+
+
+def _flag_dict(keys, mask, name) -> dict:
+    """
+    Old per-detector output: {node: {name: bool, name_reason: str|None}}.
+    """
+    reason = PATTERN_REASONS[name]
+    return {
+        node: {
+            name: flag,
+            f"{name}_reason": reason if flag else None,
         }
+        for node, flag in zip(list(keys), mask.tolist())
+    }
 
-    return results
+
+# -------------------------------------------------
+# 1. Fan-Out Detection (Smurfing / Splitting)
+# -------------------------------------------------
+def fan_out_mask(node_features, out_thresh=0.6, in_thresh=0.2):
+    table = as_feature_table(node_features)
+    return (
+        (table.column("out_degree") >= out_thresh) &
+        (table.column("in_degree") <= in_thresh)
+    )
+
+
+def detect_fan_out(node_features, out_thresh=0.6, in_thresh=0.2):
+    table = as_feature_table(node_features)
+    mask = fan_out_mask(table, out_thresh, in_thresh)
+    return _flag_dict(table.keys_array, mask, "fan_out")
 
 
 # -------------------------------------------------
 # 2. Fan-In Detection (Aggregation)
 # -------------------------------------------------
-def detect_fan_in(node_features, in_thresh=0.6, out_thresh=0.2):
-    results = {}
-
-    for node, feats in node_features.items():
-        is_fan_in = (
-            feats["in_degree"] >= in_thresh and
-            feats["out_degree"] <= out_thresh
-        )
+def fan_in_mask(node_features, in_thresh=0.6, out_thresh=0.2):
+    table = as_feature_table(node_features)
+    return (
+        (table.column("in_degree") >= in_thresh) &
+        (table.column("out_degree") <= out_thresh)
+    )
 
-        results[node] = {
-            "fan_in": is_fan_in,
-            "fan_in_reason": (
-                "High in-degree with minimal outgoing transactions"
-                if is_fan_in else None
-            )
-        }
 
-    return results
+def detect_fan_in(node_features, in_thresh=0.6, out_thresh=0.2):
+    table = as_feature_table(node_features)
+    mask = fan_in_mask(table, in_thresh, out_thresh)
+    return _flag_dict(table.keys_array, mask, "fan_in")
 
 
 # -------------------------------------------------
 # 3. Multi-Hop Convergence Detection
 # -------------------------------------------------
-def detect_multi_hop_convergence(G: nx.DiGraph, max_hops=3):
-    results = {}
-
-    for node in G.nodes():
-        paths = nx.single_source_shortest_path(G, node, cutoff=max_hops)
+def multi_hop_convergence_mask(G, max_hops=3, nodes=None):
+    """
+    Convergence flags under the original detector's rule: a wallet is
+    flagged when it has at least 3 endpoints (the wallets whose shortest
+    distance is 2..max_hops) and some endpoint repeats.
 
-        endpoints = [
-            path[-1] for path in paths.values()
-            if len(path) > 2
-        ]
+    The endpoints come from one shortest path per reachable wallet
+    (nx.single_source_shortest_path), so they never repeat and the rule
+    can never fire. The mask is therefore all False and no walk is run;
+    the reach counts themselves are core.graph_search.downstream_reach.
 
-        is_converging = (
-            len(endpoints) >= 3 and
-            len(set(endpoints)) < len(endpoints)
-        )
+    With `nodes`, the mask aligns with `nodes`.
+    """
+    n = as_columnar(G).num_nodes if nodes is None else len(nodes)
+    return np.zeros(n, dtype=bool)
 
-        results[node] = {
-            "multi_hop_convergence": is_converging,
-            "multi_hop_convergence_reason": (
-                "Funds converge to a common downstream wallet within few hops"
-                if is_converging else None
-            )
-        }
 
-    return results
+def detect_multi_hop_convergence(G, max_hops=3):
+    graph = as_columnar(G)
+    mask = multi_hop_convergence_mask(graph, max_hops)
+    return _flag_dict(graph.wallets, mask, "multi_hop_convergence")
 
 
 # -------------------------------------------------
 # 4. Peeling-Chain Detection
 # -------------------------------------------------
-def detect_peeling_chains(edge_features, peel_thresh=0.8):
+def peeling_counts(edge_features, peel_thresh=0.8) -> dict:
+    """
+    Number of peeling edges per source wallet; only flagged edges are
+    visited.
+    """
+    if isinstance(edge_features, FeatureTable):
+        flagged = np.flatnonzero(edge_features.column("peeling_ratio") >= peel_thresh)
+        sources = [edge_features.keys_array[i][0] for i in flagged.tolist()]
+    else:
+        sources = [
+            u for (u, v), feats in edge_features.items()
+            if feats["peeling_ratio"] >= peel_thresh
+        ]
+
     node_flags = {}
+    for u in sources:
+        node_flags.setdefault(u, 0)
+        node_flags[u] += 1
+
+    return node_flags
 
-    for (u, v), feats in edge_features.items():
-        if feats["peeling_ratio"] >= peel_thresh:
-            node_flags.setdefault(u, 0)
-            node_flags[u] += 1
+
+def detect_peeling_chains(edge_features, peel_thresh=0.8):
+    node_flags = peeling_counts(edge_features, peel_thresh)
 
     results = {}
     for node, count in node_flags.items():
         results[node] = {
             "peeling_chain": True,
             "peeling_chain_reason": (
-                f"Repeated fund forwarding with minimal value reduction "
-                f"({count} peeling transactions)"
+                PATTERN_REASONS["peeling_chain"].format(count=count)
             )
         }
 
@@ -104,31 +180,29 @@ def detect_peeling_chains(edge_features, peel_thresh=0.8):
 # -------------------------------------------------
 # 5. Mule Wallet Detection (Pass-Through)
 # -------------------------------------------------
-def detect_mule_wallets(
+def mule_wallet_mask(
     node_features,
     imbalance_thresh=0.2,
     time_thresh=0.3,
     degree_thresh=0.2,
 ):
-    results = {}
-
-    for node, feats in node_features.items():
-        is_mule = (
-            feats["flow_imbalance"] <= imbalance_thresh and
-            feats["active_time_span"] <= time_thresh and
-            feats["tx_count"] >= degree_thresh
-        )
+    table = as_feature_table(node_features)
+    return (
+        (table.column("flow_imbalance") <= imbalance_thresh) &
+        (table.column("active_time_span") <= time_thresh) &
+        (table.column("tx_count") >= degree_thresh)
+    )
 
-        results[node] = {
-            "mule_wallet": is_mule,
-            "mule_wallet_reason": (
-                "Pass-through wallet with balanced inflow/outflow "
-                "and short activity window"
-                if is_mule else None
-            )
-        }
 
-    return results
+def detect_mule_wallets(
+    node_features,
+    imbalance_thresh=0.2,
+    time_thresh=0.3,
+    degree_thresh=0.2,
+):
+    table = as_feature_table(node_features)
+    mask = mule_wallet_mask(table, imbalance_thresh, time_thresh, degree_thresh)
+    return _flag_dict(table.keys_array, mask, "mule_wallet")
 
 
 # -------------------------------------------------
@@ -153,24 +227,39 @@ def aggregate_patterns(*pattern_dicts):
 
     return combined
 
-def detect_patterns(G, node_features, edge_features):
+def detect_patterns(G, node_features, edge_features, thresholds=None):
     """
     Run all rule-based pattern detectors and aggregate results.
     This is the ONLY function the pipeline should call.
-    """
 
-    fan_out = detect_fan_out(node_features)
-    fan_in = detect_fan_in(node_features)
-    convergence = detect_multi_hop_convergence(G)
-    peeling = detect_peeling_chains(edge_features)
-    mule = detect_mule_wallets(node_features)
-
-    combined = aggregate_patterns(
-        fan_out,
-        fan_in,
-        convergence,
-        peeling,
-        mule,
-    )
-
-    return combined
+    Every rule is evaluated as a boolean mask over the node feature matrix
+    and the masks are packed into a PatternMatrix; no per-node dicts are
+    built unless a caller reads rows. `thresholds` overrides entries of
+    DEFAULT_THRESHOLDS per pattern.
+    """
+    params = resolve_thresholds(thresholds)
+
+    graph = as_columnar(G)
+    table = as_feature_table(node_features)
+
+    counts = peeling_counts(edge_features, **params["peeling_chain"])
+    index = table.index
+    peeling = np.zeros(len(table), dtype=np.int64)
+    for wallet, count in counts.items():
+        peeling[index[wallet]] = count
+
+    convergence = multi_hop_convergence_mask(graph, **params["multi_hop_convergence"])
+    if table.keys_array is not graph.wallets:
+        # Align graph node order with the feature table's row order
+        node_ids = graph.wallet_index
+        convergence = convergence[[node_ids[k] for k in table.keys_array]]
+
+    bits = pack_patterns({
+        "fan_out": fan_out_mask(table, **params["fan_out"]),
+        "fan_in": fan_in_mask(table, **params["fan_in"]),
+        "multi_hop_convergence": convergence,
+        "peeling_chain": peeling > 0,
+        "mule_wallet": mule_wallet_mask(table, **params["mule_wallet"]),
+    })
+
+    return PatternMatrix(table.keys_array, bits, peeling)
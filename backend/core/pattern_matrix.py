@@ -0,0 +1,122 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+# Bit order is also the key order of each row dict
+PATTERNS = (
+    "fan_out",
+    "fan_in",
+    "multi_hop_convergence",
+    "peeling_chain",
+    "mule_wallet",
+)
+
+PATTERN_BITS = {name: np.uint8(1 << i) for i, name in enumerate(PATTERNS)}
+
+PATTERN_REASONS = {
+    "fan_out": "High out-degree with minimal incoming transactions",
+    "fan_in": "High in-degree with minimal outgoing transactions",
+    "multi_hop_convergence": (
+        "Funds converge to a common downstream wallet within few hops"
+    ),
+    "peeling_chain": (
+        "Repeated fund forwarding with minimal value reduction "
+        "({count} peeling transactions)"
+    ),
+    "mule_wallet": (
+        "Pass-through wallet with balanced inflow/outflow "
+        "and short activity window"
+    ),
+}
+
+
+class PatternMatrix(Mapping):
+    """
+    Bit-packed pattern flags: one uint8 per wallet, one bit per pattern.
+
+    Reads like the old aggregate_patterns() output:
+
+        patterns[wallet] = {
+            fan_out, fan_out_reason,
+            fan_in, fan_in_reason,
+            ...
+        }
+
+    Reason strings are only built when a row is read, and only for the
+    patterns that row is flagged for. As before, peeling_chain keys only
+    appear for wallets with at least one peeling transaction.
+    """
+
+    def __init__(self, keys, bits, peeling_counts):
+        self.keys_array = keys
+        self.bits = bits
+        self.peeling_counts = peeling_counts
+        self._index = None
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            self._index = {k: i for i, k in enumerate(self.keys_array)}
+        return self._index
+
+    def has(self, name) -> np.ndarray:
+        """
+        Boolean mask of wallets flagged for one pattern.
+        """
+        return (self.bits & PATTERN_BITS[name]) != 0
+
+    def flagged_mask(self) -> np.ndarray:
+        """
+        Boolean mask of wallets flagged for any pattern.
+        """
+        return self.bits != 0
+
+    def flagged_wallets(self) -> list:
+        return np.asarray(self.keys_array, dtype=object)[self.flagged_mask()].tolist()
+
+    def reason(self, name, i):
+        if name == "peeling_chain":
+            return PATTERN_REASONS[name].format(count=int(self.peeling_counts[i]))
+        return PATTERN_REASONS[name]
+
+    def row(self, i) -> dict:
+        bits = int(self.bits[i])
+        row = {}
+
+        for name in PATTERNS:
+            flag = bool(bits & int(PATTERN_BITS[name]))
+            if name == "peeling_chain" and not flag:
+                continue
+            row[name] = flag
+            row[f"{name}_reason"] = self.reason(name, i) if flag else None
+
+        return row
+
+    def __getitem__(self, key):
+        return self.row(self.index[key])
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __iter__(self):
+        return iter(self.keys_array)
+
+    def __len__(self):
+        return len(self.keys_array)
+
+    def items(self):
+        return ((k, self.row(i)) for i, k in enumerate(self.keys_array))
+
+    def values(self):
+        return (self.row(i) for i in range(len(self.keys_array)))
+
+
+def pack_patterns(masks: dict) -> np.ndarray:
+    """
+    {pattern name: bool mask} -> uint8 bit matrix.
+    """
+    n = len(next(iter(masks.values())))
+    bits = np.zeros(n, dtype=np.uint8)
+    for name, mask in masks.items():
+        bits[mask] |= PATTERN_BITS[name]
+    return bits
@@ -0,0 +1,104 @@
+"""
+Content-addressed memoization of pipeline phases.
+
+Each phase result is keyed by the key of its input plus a hash of its
+parameters, so keys chain from the dataset's content hash:
+
+    features  <- dataset id
+    patterns  <- features key + thresholds (including max_hops)
+    risk      <- patterns key + weights
+    gnn       <- risk key + checkpoint digest
+
+Changing a risk weight therefore re-runs only risk and GNN; re-analyzing
+the same file re-runs nothing. Results are kept in memory and, when a
+cache directory is given, on disk (see core.result_store). Entries expire
+after DEFAULT_TTL_SECONDS, and the directory is kept under
+DEFAULT_DISK_MAX_BYTES by removing the oldest files on write.
+"""
+
+import hashlib
+import json
+import os
+
+from core.result_store import DiskBackend, ResultStore
+
+# Bump when a phase's output changes for the same inputs
+CACHE_VERSION = 1
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_BYTES = 1024 ** 3
+
+# Disk budgets; SMURF_PROOF_PHASE_CACHE_MAX_BYTES / _TTL_SECONDS override them
+DEFAULT_DISK_MAX_BYTES = int(
+    os.environ.get("SMURF_PROOF_PHASE_CACHE_MAX_BYTES", 4 * 1024 ** 3)
+)
+DEFAULT_TTL_SECONDS = float(
+    os.environ.get("SMURF_PROOF_PHASE_CACHE_TTL_SECONDS", 24 * 3600)
+)
+
+
+def phase_key(phase: str, input_key: str, params=None) -> str:
+    """
+    SHA-256 over (version, phase, input key, canonical JSON of params).
+    """
+    blob = json.dumps(
+        [CACHE_VERSION, phase, input_key, params],
+        sort_keys=True,
+        default=list,
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class PhaseCache:
+    """
+    Memory (+ optional disk) cache of phase results with hit/miss counts.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        disk_max_bytes: int = DEFAULT_DISK_MAX_BYTES,
+    ):
+        self.cache_dir = cache_dir
+        self.store = ResultStore(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            max_bytes=max_bytes,
+            backend=(
+                DiskBackend(cache_dir, ttl_seconds, max_bytes=disk_max_bytes)
+                if cache_dir else None
+            ),
+        )
+
+    def run(self, phase: str, key: str, compute, stats: dict = None):
+        """
+        Cached value for `key`, else compute() stored under it. Records
+        "hit" or "miss" for `phase` in `stats`.
+        """
+        value = self.store.get(key)
+        hit = value is not None
+
+        if not hit:
+            value = compute()
+            self.store.put(key, value)
+
+        if stats is not None:
+            stats[phase] = "hit" if hit else "miss"
+        return value
+
+
+_CACHES = {}
+
+
+def get_phase_cache(cache_dir: str = None) -> PhaseCache:
+    """
+    One PhaseCache per directory per process, so repeated analyses in the
+    same worker also share the in-memory layer.
+    """
+    cache_dir = str(cache_dir) if cache_dir else None
+    if cache_dir not in _CACHES:
+        _CACHES[cache_dir] = PhaseCache(cache_dir)
+    return _CACHES[cache_dir]
@@ -4,9 +4,10 @@ This file glues together all core phases.
 NO business logic lives here.
 """
 
+import time
+
 from core.graph_builder import (
-    load_transactions,
-    build_transaction_graph,
+    load_columnar_graph,
     graph_summary,
 )
 
@@ -15,59 +16,191 @@ from core.feature_extractor import (
     extract_edge_features,
 )
 
-from core.pattern_detector import detect_patterns
+from core.pattern_detector import detect_patterns, resolve_thresholds
+
+from core.risk_scorer import DEFAULT_WEIGHTS, compute_base_risk
+
+from core.risk_index import risk_index
+
+from core.risk_table import score_columns
 
-from core.risk_scorer import compute_base_risk
+from core.phase_cache import get_phase_cache, phase_key
 
 # Optional (already CPU-safe)
 try:
-    from core.gnn_cpu import run_gnn_refinement
+    from core.gnn_cpu import load_model, run_gnn_refinement
     GNN_AVAILABLE = True
 except ImportError:
     GNN_AVAILABLE = False
 
+# Phase names reported to the progress callback, in run order
+PHASES = ("graph", "features", "patterns", "risk", "gnn")
 
-def run_full_analysis(csv_path: str) -> dict:
+
+def analysis_keys(dataset_id: str, thresholds: dict = None, weights=None) -> dict:
+    """
+    Phase cache keys of an analysis of `dataset_id` with these overrides:
+    {features, patterns, risk}. The risk key identifies the analysis.
+
+    Raises ValueError for invalid thresholds (see resolve_thresholds).
+    """
+    params = resolve_thresholds(thresholds)
+    weights = tuple(weights or DEFAULT_WEIGHTS)
+
+    features_key = phase_key("features", dataset_id)
+    patterns_key = phase_key("patterns", features_key, params)
+    return {
+        "features": features_key,
+        "patterns": patterns_key,
+        "risk": phase_key("risk", patterns_key, {"weights": weights}),
+    }
+
+
+def run_full_analysis(
+    csv_path: str,
+    cache_dir: str = None,
+    dataset_id: str = None,
+    progress=None,
+    thresholds: dict = None,
+    weights=None,
+    phase_cache_dir: str = None,
+    memoize: bool = True,
+) -> dict:
     """
     Runs the complete laundering detection pipeline.
     Returns a dictionary consumed by the API layer.
+
+    progress: optional callable(phase, state, seconds) invoked with
+    state "running" when a phase in PHASES starts and "done", "cached" or
+    "skipped" when it ends.
+
+    thresholds / weights override the pattern detector thresholds and
+    the base risk weights.
+
+    With memoize, phase results are cached by content + parameter hash
+    (core.phase_cache), in memory and under phase_cache_dir if given.
     """
+    report = progress or (lambda phase, state, seconds=None: None)
+    timings = {}
+    cache_stats = {}
+    phase_cache = get_phase_cache(phase_cache_dir) if memoize else None
+
+    def start(phase):
+        report(phase, "running", None)
+        return time.perf_counter()
+
+    def finish(phase, started, state="done"):
+        timings[phase] = round(time.perf_counter() - started, 4)
+        if cache_stats.get(phase) == "hit":
+            state = "cached"
+        report(phase, state, timings[phase])
+
+    def run(phase, key, compute):
+        if phase_cache is None:
+            return compute()
+        return phase_cache.run(phase, key, compute, cache_stats)
 
     # -------- Phase 1: Graph construction --------
-    df = load_transactions(csv_path)
-    graph = build_transaction_graph(df)
+    started = start("graph")
+    graph, ingest = load_columnar_graph(csv_path, cache_dir, dataset_id)
+    # The columnar bundle is the graph's cache
+    cache_stats["graph"] = "hit" if ingest["source"] == "cache" else "miss"
+    keys = analysis_keys(ingest["dataset_id"], thresholds, weights)
+    finish("graph", started)
 
     # -------- Phase 2: Feature extraction --------
-    node_features = extract_node_features(graph)
-    edge_features = extract_edge_features(graph)
+    started = start("features")
+    node_features, edge_features = run(
+        "features",
+        keys["features"],
+        lambda: (extract_node_features(graph), extract_edge_features(graph)),
+    )
+    finish("features", started)
 
     # -------- Phase 3: Pattern detection --------
-    patterns = detect_patterns(graph, node_features, edge_features)
+    started = start("patterns")
+    params = resolve_thresholds(thresholds)
+    patterns = run(
+        "patterns",
+        keys["patterns"],
+        lambda: detect_patterns(graph, node_features, edge_features, params),
+    )
+    finish("patterns", started)
 
     # -------- Phase 4: Base risk scoring --------
-    base_risks = compute_base_risk(
-    graph,
-    node_features,
-    patterns,
+    started = start("risk")
+    weights = tuple(weights or DEFAULT_WEIGHTS)
+    base_risks = run(
+        "risk",
+        keys["risk"],
+        lambda: compute_base_risk(
+            graph,
+            node_features,
+            patterns,
+            weights=weights,
+        ),
     )
+    finish("risk", started)
+
+    # Values loaded from disk carry their own copy of the wallet ids
+    _share_keys(graph, node_features, patterns)
+
+    # Score arrays: GNN input columns, then reused by risk_columns()
+    scores = score_columns(base_risks)
 
 
     # -------- Phase 7: GNN refinement (optional) --------
+    started = start("gnn")
     gnn_risks = None
-    if GNN_AVAILABLE:
-        gnn_risks = run_gnn_refinement(
-            graph=graph,
-            node_features=node_features,
-            base_risks=base_risks,
+    # Resident model, loaded once per process; None without trained weights
+    loaded = load_model() if GNN_AVAILABLE else None
+    if loaded is not None:
+        model, weights_digest = loaded
+        gnn_risks = run(
+            "gnn",
+            phase_key("gnn", keys["risk"], {"weights": weights_digest}),
+            lambda: run_gnn_refinement(
+                graph=graph,
+                node_features=node_features,
+                base_risks=base_risks,
+                model=model,
+                scores=scores,
+            ),
         )
+    finish("gnn", started, "done" if loaded is not None else "skipped")
 
     # -------- Final output --------
-    return {
+    results = {
         "graph": graph,
         "graph_summary": graph_summary(graph),
+        "ingest": ingest,
+        # Key of this parameterization; the API stores results under it
+        "analysis_id": keys["risk"],
         "node_features": node_features,
         "edge_features": edge_features,
         "patterns": patterns,
         "base_risks": base_risks,
         "gnn_risks": gnn_risks,
+        "risk_columns": scores,
+        "params": {"thresholds": params, "weights": weights},
+        "phase_seconds": timings,
+        "phase_cache": {
+            "phases": cache_stats,
+            "hits": sum(v == "hit" for v in cache_stats.values()),
+            "misses": sum(v == "miss" for v in cache_stats.values()),
+        },
     }
+
+    # Sorted score index for top-K / rank queries (also builds risk_columns)
+    risk_index(results)
+    return results
+
+
+def _share_keys(graph, *tables):
+    """
+    Point cached tables at the graph's wallet array again, so identity
+    checks (and memory) see one array.
+    """
+    for table in tables:
+        if table.keys_array is not graph.wallets and len(table) == graph.num_nodes:
+            table.keys_array = graph.wallets
@@ -0,0 +1,335 @@
+"""
+Keyed, size-bounded store for analysis results.
+
+Entries are kept in memory with LRU + TTL eviction under an entry count
+and a byte budget. An optional DiskBackend shares entries between
+processes (e.g. gunicorn workers): a worker that misses in memory loads
+the entry from disk instead of recomputing it.
+
+Disk entries are pickle protocol 5 files whose array buffers are stored
+out-of-band and memory-mapped on load, so large NumPy columns are not
+copied into each worker's heap.
+"""
+
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 8
+DEFAULT_TTL_SECONDS = 60 * 60
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+DEFAULT_DISK_MAX_BYTES = 8 * 1024 ** 3
+
+# Large mappings are sized from a sample of their items
+SAMPLE_ITEMS = 256
+BUFFER_ALIGNMENT = 64
+
+
+def estimate_nbytes(value, _seen=None) -> int:
+    """
+    Rough in-memory size of a results object: exact for NumPy arrays,
+    approximate for Python containers. Shared objects count once.
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return value.nbytes + _sampled(value.tolist(), seen)
+        return value.nbytes
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return len(value) if isinstance(value, (str, bytes)) else 8
+    if isinstance(value, dict):
+        return 64 * len(value) + _sampled(list(value.items())[:SAMPLE_ITEMS], seen, len(value))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return 8 * len(value) + _sampled(list(value), seen)
+    if hasattr(value, "__dict__"):
+        return estimate_nbytes(vars(value), seen)
+    return 64
+
+
+def _sampled(items, seen, total=None) -> int:
+    total = len(items) if total is None else total
+    sample = items[:SAMPLE_ITEMS]
+    if not sample:
+        return 0
+    size = sum(estimate_nbytes(item, seen) for item in sample)
+    return size * total // len(sample)
+
+
+class ResultStore:
+    """
+    In-memory LRU + TTL store with a byte budget.
+
+    The most recently used entry is always kept, even if it alone exceeds
+    `max_bytes`. Expired entries are dropped on access.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backend=None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.backend = backend
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Value for `key`, or None. Falls back to the disk backend.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["value"]
+            if entry is not None:
+                self._drop(key)
+
+        value = self.backend.load(key) if self.backend else None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._insert(key, value)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._insert(key, value)
+        if self.backend:
+            self.backend.save(key, value)
+
+    def pop(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+        if self.backend:
+            self.backend.delete(key)
+
+    def add_nbytes(self, key, delta: int):
+        """
+        Count `delta` more (or fewer) bytes against the entry of `key`,
+        e.g. for caches that grow next to a stored value after put().
+        Evicts as put() does. No-op if the entry is not in memory.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry["nbytes"] += delta
+            self._nbytes += delta
+            self._evict()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "nbytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    # ----------------------------------
+    # Internals (lock held)
+    # ----------------------------------
+    def _expired(self, entry) -> bool:
+        return self.ttl_seconds is not None and (
+            time.time() - entry["stored_at"] > self.ttl_seconds
+        )
+
+    def _insert(self, key, value):
+        if key in self._entries:
+            self._drop(key)
+
+        nbytes = estimate_nbytes(value)
+        self._entries[key] = {
+            "value": value,
+            "nbytes": nbytes,
+            "stored_at": time.time(),
+        }
+        self._nbytes += nbytes
+        self._evict()
+
+    def _evict(self):
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._nbytes > self.max_bytes
+        ):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self._nbytes -= entry["nbytes"]
+
+
+class DiskBackend:
+    """
+    One file per key under `path`, shared by every process that points at
+    the same directory. Files older than `ttl_seconds` count as missing
+    and are removed on access.
+
+    Every save also sweeps the directory: expired files are removed, then
+    the oldest ones until the rest fit in `max_bytes` (None: no budget).
+    The file just written is kept.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_DISK_MAX_BYTES,
+    ):
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+    def _file(self, key) -> str:
+        return os.path.join(self.path, f"{key}.result")
+
+    def save(self, key, value):
+        """
+        Atomic write: readers see the old file or the new one, never a mix.
+        """
+        os.makedirs(self.path, exist_ok=True)
+
+        buffers = []
+        payload = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+        raws = [b.raw() for b in buffers]
+
+        # Layout: header length, JSON header, pickle payload, aligned buffers
+        offsets, offset = [], 0
+        for raw in raws:
+            offsets.append(offset)
+            offset += _aligned(raw.nbytes)
+
+        header = json.dumps({
+            "payload": len(payload),
+            "buffers": [[o, raw.nbytes] for o, raw in zip(offsets, raws)],
+        }).encode()
+        data_start = _aligned(8 + len(header) + len(payload))
+
+        fd, scratch = tempfile.mkstemp(dir=self.path, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(struct.pack("<Q", len(header)))
+                f.write(header)
+                f.write(payload)
+                for o, raw in zip(offsets, raws):
+                    f.seek(data_start + o)
+                    f.write(raw)
+                f.truncate(data_start + offset)
+            os.replace(scratch, self._file(key))
+        except OSError:
+            if os.path.exists(scratch):
+                os.remove(scratch)
+            raise
+
+        self.sweep(keep=key)
+
+    def load(self, key):
+        path = self._file(key)
+        try:
+            if self._expired(path):
+                self.delete(key)
+                return None
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        (header_len,) = struct.unpack_from("<Q", mapped, 0)
+        header = json.loads(mapped[8:8 + header_len])
+        payload_start = 8 + header_len
+        data_start = _aligned(payload_start + header["payload"])
+
+        view = memoryview(mapped)
+        buffers = [
+            view[data_start + o:data_start + o + n] for o, n in header["buffers"]
+        ]
+        return pickle.loads(
+            view[payload_start:payload_start + header["payload"]],
+            buffers=buffers,
+        )
+
+    def delete(self, key):
+        try:
+            os.remove(self._file(key))
+        except FileNotFoundError:
+            pass
+
+    def sweep(self, keep=None) -> int:
+        """
+        Remove expired entries, then the oldest ones beyond max_bytes.
+        Returns the number of files removed.
+        """
+        entries = []
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            # Scratch files of writes in progress start with "."
+            if name.startswith(".") or not name.endswith(".result"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.path, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        kept = None if keep is None else os.path.basename(self._file(keep))
+
+        removed = 0
+        for mtime, size, name in entries:
+            expired = self.ttl_seconds is not None and now - mtime > self.ttl_seconds
+            over = self.max_bytes is not None and total > self.max_bytes
+            if name == kept or not (expired or over):
+                continue
+            try:
+                os.remove(os.path.join(self.path, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def _expired(self, path) -> bool:
+        return self.ttl_seconds is not None and (
+            time.time() - os.path.getmtime(path) > self.ttl_seconds
+        )
+
+
+def _aligned(n: int) -> int:
+    return -(-n // BUFFER_ALIGNMENT) * BUFFER_ALIGNMENT
@@ -0,0 +1,112 @@
+"""
+Sorted risk index: top-K, threshold ranges and rank lookups without
+rescanning every wallet.
+
+For each indexed score (base_risk, final_risk and the four components)
+the index keeps the row order sorted by score, highest first (ties keep
+base_risks order), the sorted scores and each row's position in that
+order. Rows are positions in core.risk_table.risk_columns().
+
+    top_k       -> O(k)
+    range       -> O(log n + matches)
+    rank        -> O(1) position, O(log n) competition rank
+"""
+
+import numpy as np
+
+from core.risk_table import RISK_COMPONENTS, risk_columns
+
+INDEX_FIELDS = ("base_risk", "final_risk", *RISK_COMPONENTS)
+
+
+class RiskIndex:
+    def __init__(self, columns: dict):
+        self.columns = columns
+        self.ids = columns["id"]
+        self.order = {}
+        self.scores = {}
+        self.position = {}
+        self._wallet_index = None
+
+        n = len(self.ids)
+        for field in INDEX_FIELDS:
+            values = columns[field]
+            order = np.argsort(-values, kind="stable")
+
+            position = np.empty(n, dtype=np.int64)
+            position[order] = np.arange(n, dtype=np.int64)
+
+            self.order[field] = order
+            # Negated, so the sorted array is ascending for searchsorted
+            self.scores[field] = -values[order]
+            self.position[field] = position
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def wallet_index(self) -> dict:
+        if self._wallet_index is None:
+            self._wallet_index = {w: i for i, w in enumerate(self.ids.tolist())}
+        return self._wallet_index
+
+    def top_k(self, field: str, k: int) -> np.ndarray:
+        """
+        Rows of the `k` highest scores, highest first.
+        """
+        return self.order[_field(field)][:max(k, 0)]
+
+    def range(self, field: str, low: float = None, high: float = None) -> np.ndarray:
+        """
+        Rows with low <= score <= high (either bound optional), highest
+        score first.
+        """
+        scores = self.scores[_field(field)]
+        start = 0 if high is None else np.searchsorted(scores, -high, side="left")
+        stop = len(scores) if low is None else np.searchsorted(scores, -low, side="right")
+        return self.order[field][start:max(start, stop)]
+
+    def count(self, field: str, low: float = None, high: float = None) -> int:
+        scores = self.scores[_field(field)]
+        start = 0 if high is None else np.searchsorted(scores, -high, side="left")
+        stop = len(scores) if low is None else np.searchsorted(scores, -low, side="right")
+        return int(max(stop - start, 0))
+
+    def rank(self, field: str, wallet) -> dict:
+        """
+        Score, 1-based rank (wallets with the same score share the best
+        rank) and position of one wallet. Raises KeyError if unknown.
+        """
+        row = self.wallet_index[wallet]
+        field = _field(field)
+        score = -self.scores[field][self.position[field][row]]
+
+        rank = int(np.searchsorted(self.scores[field], -score, side="left")) + 1
+        return {
+            "id": wallet,
+            "field": field,
+            "score": float(score),
+            "rank": rank,
+            "position": int(self.position[field][row]) + 1,
+            "total": len(self),
+        }
+
+
+def _field(field: str) -> str:
+    if field not in INDEX_FIELDS:
+        raise ValueError(f"field must be one of {list(INDEX_FIELDS)}")
+    return field
+
+
+def risk_index(results: dict) -> RiskIndex:
+    """
+    RiskIndex of one analysis, memoized in `results` and rebuilt only
+    when its risk columns change.
+    """
+    columns = risk_columns(results)
+
+    index = results.get("risk_index")
+    if index is None or index.columns is not columns:
+        index = RiskIndex(columns)
+        results["risk_index"] = index
+    return index
@@ -1,5 +1,10 @@
 import math
 import networkx as nx
+import numpy as np
+
+from core.columnar_graph import as_columnar
+from core.graph_search import multi_source_bfs
+from core.pattern_matrix import PatternMatrix
 
 # -------------------------------------------------
 # AML Risk Component Thresholds
@@ -64,6 +69,13 @@ def compute_temporal_risk(node_feats):
 
 
 def compute_proximity_risk(G, suspicious_wallets, wallet, max_hops=3):
+    """
+    Single-wallet proximity on a NetworkX graph.
+
+    Kept for callers scoring one wallet; compute_base_risk uses
+    compute_proximity_scores instead. Note this returns on the first
+    suspicious wallet it reaches in set order, not the nearest one.
+    """
     for s in suspicious_wallets:
         if wallet == s:
             return 1.0
@@ -77,14 +89,47 @@ def compute_proximity_risk(G, suspicious_wallets, wallet, max_hops=3):
     return 0.0
 
 
+def compute_proximity_scores(G, suspicious_wallets, max_hops=3) -> np.ndarray:
+    """
+    Proximity risk for every node at once: 1 / (d + 1), where d is the hop
+    distance to the NEAREST suspicious wallet (d <= max_hops), else 0.
+
+    One multi-source, depth-limited BFS from the suspicious set over
+    reversed edges, instead of one shortest-path search per wallet and
+    suspicious wallet.
+
+    Unlike compute_proximity_risk, which returns for whichever reachable
+    suspicious wallet comes first in set order, this is always the true
+    minimum distance, so a wallet can only score the same or higher.
+    In particular a suspicious wallet always scores 1.0 itself.
+    """
+    graph = as_columnar(G)
+    index = graph.wallet_index
+
+    sources = [index[w] for w in suspicious_wallets if w in index]
+    indptr, predecessors = graph.pairs.in_adjacency()
+    dist = multi_source_bfs(indptr, predecessors, sources, max_hops)
+
+    scores = np.zeros(graph.num_nodes, dtype=np.float64)
+    reached = dist >= 0
+    scores[reached] = 1.0 / (dist[reached] + 1)
+    return scores
+
+
 # -------------------------------------------------
 # Base Risk Aggregation (NaN-Safe, Gated)
 # -------------------------------------------------
+# structural, flow, temporal, proximity
+DEFAULT_WEIGHTS = (0.4, 0.3, 0.2, 0.1)
+
+
 def compute_base_risk(
     G,
     node_features,
     pattern_results,
-    weights=(0.4, 0.3, 0.2, 0.1),
+    weights=DEFAULT_WEIGHTS,
+    max_hops=3,
+    wallets=None,
 ):
     """
     AML-grade base risk computation.
@@ -93,16 +138,30 @@ def compute_base_risk(
     - Skip non-wallet entities
     - No structural OR flow anomaly → base_risk = 0
     - Never output NaN
+
+    `wallets` limits scoring to those wallets (in the given order).
     """
 
+    graph = as_columnar(G)
     base_risks = {}
 
-    suspicious_wallets = {
-        w for w, p in pattern_results.items()
-        if any(v is True for k, v in p.items() if not k.endswith("_reason"))
-    }
+    if isinstance(pattern_results, PatternMatrix):
+        suspicious_wallets = set(pattern_results.flagged_wallets())
+    else:
+        suspicious_wallets = {
+            w for w, p in pattern_results.items()
+            if any(v is True for k, v in p.items() if not k.endswith("_reason"))
+        }
+
+    # Computed on first use: only wallets past the gate need it
+    proximity_scores = None
+
+    if wallets is None:
+        rows = node_features.items()
+    else:
+        rows = ((w, node_features[w]) for w in wallets)
 
-    for wallet, feats in node_features.items():
+    for wallet, feats in rows:
 
         # Skip non-wallet entities
         if not wallet.startswith("0x"):
@@ -118,7 +177,11 @@ def compute_base_risk(
             proximity = 0.0
         else:
             temporal = compute_temporal_risk(feats)
-            proximity = compute_proximity_risk(G, suspicious_wallets, wallet)
+            if proximity_scores is None:
+                proximity_scores = compute_proximity_scores(
+                    graph, suspicious_wallets, max_hops
+                )
+            proximity = float(proximity_scores[graph.wallet_index[wallet]])
 
             raw = (
                 weights[0] * structural +
@@ -0,0 +1,197 @@
+"""
+Columnar view of an analysis' risk scores.
+
+base_risks / gnn_risks are dicts keyed by wallet; serving them row by row
+means a dict walk per request. risk_columns() turns them into aligned
+arrays once per analysis:
+
+    id                        -> wallet ids (base_risks order)
+    base_risk, *_risk         -> rule-based score and its components
+    gnn_risk, final_risk      -> GNN score (base risk if missing) and
+                                 the fused score
+    delta                     -> final_risk - base_risk
+    is_wallet                 -> "0x" wallets vs services
+    reasons                   -> list of reason lists
+
+score_columns() builds the base_risks part alone, so the GNN input can
+be filled from it before the GNN scores exist. export_rows() walks those
+arrays in fixed-size batches for streaming exports.
+"""
+
+import numpy as np
+
+RISK_COMPONENTS = (
+    "structural_risk",
+    "flow_risk",
+    "temporal_risk",
+    "proximity_risk",
+)
+
+# final = ALPHA * base + (1 - ALPHA) * gnn
+FINAL_RISK_ALPHA = 0.6
+RISKY_THRESHOLD = 0.5
+
+
+def score_arrays(base_risks: dict, names) -> dict:
+    """
+    {"id": wallet ids, name: float64 column for each of `names`} in
+    base_risks order; missing values are 0.
+    """
+    infos = base_risks.values()
+    n = len(base_risks)
+
+    ids = np.empty(n, dtype=object)
+    ids[:] = list(base_risks)
+
+    arrays = {"base_risks": base_risks, "id": ids}
+    for name in names:
+        arrays[name] = np.fromiter(
+            (info.get(name, 0.0) for info in infos), dtype=np.float64, count=n
+        )
+    return arrays
+
+
+def score_columns(base_risks: dict) -> dict:
+    """
+    The base_risks part of risk_columns(): id, base_risk, the risk
+    components, is_wallet and reasons, in base_risks order.
+    """
+    columns = score_arrays(base_risks, ("base_risk", *RISK_COMPONENTS))
+    columns["is_wallet"] = np.fromiter(
+        (w.startswith("0x") for w in base_risks), dtype=bool, count=len(base_risks)
+    )
+    columns["reasons"] = [info.get("reasons", []) for info in base_risks.values()]
+    return columns
+
+
+def risk_columns(results: dict) -> dict:
+    """
+    Aligned risk arrays of one analysis, memoized in `results`.
+
+    Rebuilt only when the base or GNN scores object changes; a cached
+    score_columns() of the same base_risks is reused.
+    """
+    base_risks = results.get("base_risks")
+    gnn_risks = results.get("gnn_risks")
+
+    cached = results.get("risk_columns")
+    if cached and cached["base_risks"] is base_risks:
+        if "gnn_risks" in cached and cached["gnn_risks"] is gnn_risks:
+            return cached
+        scores = cached
+    else:
+        scores = score_columns(base_risks or {})
+
+    ids = scores["id"].tolist()
+    base = scores["base_risk"].tolist()
+    gnn_by_wallet = gnn_risks or {}
+    gnn = np.fromiter(
+        (gnn_by_wallet.get(w, b) for w, b in zip(ids, base)),
+        dtype=np.float64,
+        count=len(ids),
+    )
+
+    # Python round() per value, as the endpoints always rounded
+    alpha = FINAL_RISK_ALPHA
+    final = [
+        round(alpha * b + (1 - alpha) * g, 3)
+        for b, g in zip(base, gnn.tolist())
+    ]
+    delta = [round(f - b, 3) for f, b in zip(final, base)]
+
+    columns = {
+        **scores,
+        "gnn_risks": gnn_risks,
+        "gnn_enabled": bool(gnn_risks),
+        "alpha": alpha,
+        "gnn_risk": np.array([round(g, 3) for g in gnn.tolist()], dtype=np.float64),
+        "final_risk": np.array(final, dtype=np.float64),
+        "delta": np.array(delta, dtype=np.float64),
+    }
+    results["risk_columns"] = columns
+    return columns
+
+
+# Response layouts of /api/risk-scores/ and /api/final-risk/
+RISK_SCORE_FIELDS = (
+    "id", "base_risk", *RISK_COMPONENTS, "is_risky", "entity_type", "reasons",
+)
+FINAL_RISK_FIELDS = ("id", "base_risk", "gnn_risk", "final_risk", "delta", "reasons")
+
+EXPORT_SORT_FIELDS = ("base_risk", "final_risk")
+EXPORT_BATCH_SIZE = 10_000
+
+
+def risk_field(columns: dict, name: str, rows=None):
+    """
+    One response field for `rows` (all rows if None): a NumPy array for
+    numeric / boolean fields, a list otherwise.
+    """
+    rows = slice(None) if rows is None else rows
+
+    if name == "is_risky":
+        return columns["base_risk"][rows] >= RISKY_THRESHOLD
+    if name == "entity_type":
+        return np.where(columns["is_wallet"][rows], "wallet", "service").tolist()
+    if name == "id":
+        return columns["id"][rows].tolist()
+    if name == "reasons":
+        reasons = columns["reasons"]
+        if isinstance(rows, slice):
+            return reasons[rows]
+        return [reasons[i] for i in np.asarray(rows).tolist()]
+    return columns[name][rows]
+
+
+def risk_records(columns: dict, fields, rows=None, columnar: bool = False):
+    """
+    Rows as a list of dicts, or with columnar=True as {field: values}.
+    """
+    values = {name: risk_field(columns, name, rows) for name in fields}
+    return values if columnar else to_records(values)
+
+
+def to_records(values: dict) -> list:
+    """
+    {field: column} -> list of {field: value} rows.
+    """
+    fields = list(values)
+    lists = [
+        v.tolist() if isinstance(v, np.ndarray) else v for v in values.values()
+    ]
+    return [dict(zip(fields, row)) for row in zip(*lists)]
+
+
+def export_rows(
+    columns: dict,
+    fields,
+    sort: str = None,
+    descending: bool = True,
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """
+    Generator of row batches (lists of dicts, `batch_size` rows each) in
+    base_risks order, or sorted by `sort` (ties keep that order).
+
+    Only one batch is materialized at a time; sorting adds one int64
+    index array. Raises ValueError for an unknown sort field.
+    """
+    if sort is not None and sort not in EXPORT_SORT_FIELDS:
+        raise ValueError(f"sort must be one of {list(EXPORT_SORT_FIELDS)}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+    order = None
+    if sort is not None:
+        values = columns[sort]
+        order = np.argsort(-values if descending else values, kind="stable")
+
+    return _batches(columns, fields, order, batch_size)
+
+
+def _batches(columns, fields, order, batch_size):
+    n = len(columns["id"])
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        rows = slice(start, stop) if order is None else order[start:stop]
+        yield risk_records(columns, fields, rows=rows)
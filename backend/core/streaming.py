@@ -0,0 +1,229 @@
+"""
+Sliding time-window streaming detector.
+
+Transactions are consumed in timestamp order. Per-wallet aggregates
+(in/out counts, inflow/outflow) cover only the last `window_seconds`:
+every transaction enters the window once and leaves it once, so updates
+are O(1) amortized no matter how long the stream runs.
+
+Alerts fire when a wallet crosses a threshold inside the window:
+
+    fan_out      -> many outgoing transfers, (almost) no incoming
+    fan_in       -> many incoming transfers, (almost) no outgoing
+    mule_wallet  -> received and forwarded about the same value
+
+A wallet re-alerts for a pattern only after it has dropped below the
+threshold again.
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from core.feature_extractor import NS_PER_SECOND
+from core.pattern_matrix import PATTERN_REASONS
+from core.risk_scorer import (
+    FAN_IN_THRESHOLD,
+    FAN_OUT_THRESHOLD,
+    LOW_IMBALANCE_THRESHOLD,
+)
+
+DEFAULT_WINDOW_SECONDS = 60 * 60
+
+# Counts are transactions inside the window
+STREAM_THRESHOLDS = {
+    "fan_out": {"min_out": FAN_OUT_THRESHOLD, "max_in": 1},
+    "fan_in": {"min_in": FAN_IN_THRESHOLD, "max_out": 1},
+    "mule_wallet": {
+        "min_in": 2,
+        "min_out": 1,
+        "imbalance_thresh": LOW_IMBALANCE_THRESHOLD,
+    },
+}
+
+STREAM_PATTERNS = tuple(STREAM_THRESHOLDS)
+
+
+class _WalletWindow:
+    __slots__ = ("in_count", "out_count", "inflow", "outflow", "active")
+
+    def __init__(self):
+        self.in_count = 0
+        self.out_count = 0
+        self.inflow = 0.0
+        self.outflow = 0.0
+        # Patterns currently over threshold (already alerted)
+        self.active = set()
+
+
+class StreamingDetector:
+    """
+    Rolling per-wallet aggregates over a sliding time window.
+
+    Feed transactions with process(); it returns the alerts they trigger.
+    Timestamps are int64 nanoseconds and must not decrease.
+    """
+
+    def __init__(self, window_seconds: float = DEFAULT_WINDOW_SECONDS, thresholds=None):
+        self.window_seconds = window_seconds
+        self.window_ns = int(window_seconds * NS_PER_SECOND)
+        self.thresholds = {
+            name: {**defaults, **(thresholds or {}).get(name, {})}
+            for name, defaults in STREAM_THRESHOLDS.items()
+        }
+
+        self.events = deque()
+        self.wallets = {}
+        self.now = None
+        self.processed = 0
+
+    def process(self, src, dst, amount: float, timestamp: int) -> list:
+        """
+        Add one transaction; returns the alerts it triggers (possibly none).
+        """
+        if self.now is not None and timestamp < self.now:
+            raise ValueError("Transactions must arrive in timestamp order")
+        self.now = timestamp
+        self.processed += 1
+
+        changed = self._expire(timestamp - self.window_ns)
+
+        sender = self._wallet(src)
+        sender.out_count += 1
+        sender.outflow += amount
+        receiver = self._wallet(dst)
+        receiver.in_count += 1
+        receiver.inflow += amount
+
+        self.events.append((timestamp, src, dst, amount))
+        changed.update((src, dst))
+
+        alerts = []
+        for wallet in changed:
+            alerts.extend(self._check(wallet))
+        return alerts
+
+    def snapshot(self, wallet) -> dict:
+        """
+        Current window aggregates of one wallet.
+        """
+        state = self.wallets.get(wallet) or _WalletWindow()
+        return {
+            "in_count": state.in_count,
+            "out_count": state.out_count,
+            "inflow": state.inflow,
+            "outflow": state.outflow,
+        }
+
+    # ----------------------------------
+    # Internals
+    # ----------------------------------
+    def _wallet(self, wallet) -> _WalletWindow:
+        state = self.wallets.get(wallet)
+        if state is None:
+            state = self.wallets[wallet] = _WalletWindow()
+        return state
+
+    def _expire(self, cutoff: int) -> set:
+        """
+        Drop transactions at or before `cutoff`; returns affected wallets.
+        """
+        changed = set()
+        events = self.events
+
+        while events and events[0][0] <= cutoff:
+            _, src, dst, amount = events.popleft()
+
+            sender = self.wallets[src]
+            sender.out_count -= 1
+            sender.outflow -= amount
+            receiver = self.wallets[dst]
+            receiver.in_count -= 1
+            receiver.inflow -= amount
+
+            changed.update((src, dst))
+
+        for wallet in changed:
+            state = self.wallets[wallet]
+            if state.in_count == 0 and state.out_count == 0:
+                # Idle wallets leave the window (and running sums reset)
+                del self.wallets[wallet]
+
+        return changed
+
+    def _check(self, wallet) -> list:
+        state = self.wallets.get(wallet)
+        if state is None:
+            return []
+
+        alerts = []
+        for pattern in STREAM_PATTERNS:
+            hit = self._matches(pattern, state)
+
+            if hit and pattern not in state.active:
+                state.active.add(pattern)
+                alerts.append(self._alert(wallet, pattern, state))
+            elif not hit:
+                state.active.discard(pattern)
+
+        return alerts
+
+    def _matches(self, pattern, state) -> bool:
+        t = self.thresholds[pattern]
+
+        if pattern == "fan_out":
+            return state.out_count >= t["min_out"] and state.in_count <= t["max_in"]
+        if pattern == "fan_in":
+            return state.in_count >= t["min_in"] and state.out_count <= t["max_out"]
+
+        total = state.inflow + state.outflow
+        imbalance = abs(state.inflow - state.outflow) / (total + 1e-9)
+        return (
+            state.in_count >= t["min_in"] and
+            state.out_count >= t["min_out"] and
+            imbalance <= t["imbalance_thresh"]
+        )
+
+    def _alert(self, wallet, pattern, state) -> dict:
+        return {
+            "wallet": wallet,
+            "pattern": pattern,
+            "reason": PATTERN_REASONS[pattern],
+            "timestamp": pd.Timestamp(self.now).isoformat(),
+            "window_seconds": self.window_seconds,
+            "in_count": state.in_count,
+            "out_count": state.out_count,
+            "inflow": round(state.inflow, 8),
+            "outflow": round(state.outflow, 8),
+        }
+
+
+def detect_stream(transactions, window_seconds=DEFAULT_WINDOW_SECONDS, thresholds=None):
+    """
+    Generator API: consume (src, dst, amount, timestamp_ns) tuples in
+    timestamp order and yield alerts as soon as they fire.
+    """
+    detector = StreamingDetector(window_seconds, thresholds)
+    for src, dst, amount, timestamp in transactions:
+        yield from detector.process(src, dst, amount, timestamp)
+
+
+def replay_graph(G, batch_size: int = 65_536, start: int = 0):
+    """
+    (src wallet, dst wallet, amount, timestamp_ns) tuples of a
+    ColumnarGraph in timestamp order (row order among equal timestamps),
+    materialized `batch_size` rows at a time.
+
+    start: only rows from this index on (e.g. the rows of an append).
+    """
+    order = start + np.argsort(G.timestamp[start:], kind="stable")
+
+    for start in range(0, len(order), batch_size):
+        rows = order[start:start + batch_size]
+        yield from zip(
+            G.wallets[G.src[rows]].tolist(),
+            G.wallets[G.dst[rows]].tolist(),
+            G.amount[rows].tolist(),
+            G.timestamp[rows].tolist(),
+        )
@@ -0,0 +1,270 @@
+"""
+CPU training for SimpleRiskGNN.
+
+The best weights (lowest validation loss) are checkpointed with
+save_model(); the GNN phase serves them once GNN_WEIGHTS_PATH points at
+the file.
+
+Targets are labels read from CSVs (wallet id + 0/1 label or [0, 1]
+score). The rule-based risks are model inputs, so they are never used as
+targets: a model fit to them only learns to echo base_risk. The
+normalized sparse adjacency is built once per graph; an epoch is one
+sparse matmul plus the model's linear layer, over all nodes at once.
+
+Usage (from backend/):
+    python -m core.train_gnn tx.csv --labels labels.csv [--labels more.csv]
+        [--epochs 300] [--lr 0.05] [--threads 4] [--output models/x.pt]
+"""
+
+import argparse
+import copy
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn.functional as F
+
+from core.gnn_cpu import (
+    SimpleRiskGNN,
+    build_normalized_adjacency,
+    csr_adjacency,
+    from_numpy,
+    TRAINED_TARGET,
+    save_model,
+    set_inference_threads,
+    weights_path,
+)
+from core.gnn_preparer import GNN_FEATURES, prepare_gnn_data
+from core.pipeline import run_full_analysis
+
+DEFAULT_EPOCHS = 300
+DEFAULT_LR = 0.05
+VALIDATION_FRACTION = 0.2
+# Stop after this many epochs without a better validation loss
+DEFAULT_PATIENCE = 30
+
+WALLET_COLUMN = "Wallet_ID"
+LABEL_COLUMN = "Label"
+
+
+def load_labels(paths, wallet_column: str = WALLET_COLUMN, label_column: str = LABEL_COLUMN) -> dict:
+    """
+    {wallet: target} from labeled CSVs; later files override earlier ones.
+    Raises ValueError for missing columns or targets outside [0, 1].
+    """
+    labels = {}
+    for path in paths:
+        df = pd.read_csv(path, usecols=lambda c: c in (wallet_column, label_column))
+        if wallet_column not in df or label_column not in df:
+            raise ValueError(f"{path}: needs {wallet_column} and {label_column} columns")
+
+        values = df[label_column].astype(float)
+        if ((values < 0) | (values > 1)).any():
+            raise ValueError(f"{path}: {label_column} must be within [0, 1]")
+        labels.update(zip(df[wallet_column].astype(str), values.tolist()))
+    return labels
+
+
+def training_targets(graph, labels: dict):
+    """
+    (targets, mask) over graph nodes: float32 `labels` and the nodes that
+    have one. Raises ValueError if no label matches a wallet of the graph.
+    """
+    index = graph.wallet_index
+    known = [(index[w], t) for w, t in labels.items() if w in index]
+    if not known:
+        raise ValueError("No training targets match wallets of the graph")
+
+    rows, values = zip(*known)
+    targets = np.zeros(graph.num_nodes, dtype=np.float32)
+    mask = np.zeros(graph.num_nodes, dtype=bool)
+    targets[list(rows)] = values
+    mask[list(rows)] = True
+    return targets, mask
+
+
+def split_nodes(mask, validation: float = VALIDATION_FRACTION, seed: int = 0):
+    """
+    Shuffled (train, validation) node ids of `mask`. With fewer than two
+    nodes both sets are the same.
+    """
+    nodes = np.flatnonzero(mask)
+    np.random.default_rng(seed).shuffle(nodes)
+
+    n_val = int(len(nodes) * validation)
+    if n_val == 0 or n_val == len(nodes):
+        return nodes, nodes
+    return nodes[n_val:], nodes[:n_val]
+
+
+def train(
+    gnn_data,
+    targets,
+    mask,
+    epochs: int = DEFAULT_EPOCHS,
+    lr: float = DEFAULT_LR,
+    validation: float = VALIDATION_FRACTION,
+    patience: int = DEFAULT_PATIENCE,
+    seed: int = 0,
+    num_threads: int = None,
+    log=print,
+    model=None,
+) -> dict:
+    """
+    Full-batch Adam on binary cross-entropy against `targets` (nodes in
+    `mask`). Returns {"model", "epoch", "val_loss", "history"}; the model
+    carries the best weights seen. Ctrl-C stops early and keeps them.
+    """
+    set_inference_threads(num_threads)
+    torch.manual_seed(seed)
+
+    X = from_numpy(gnn_data["X"])
+    n = X.size(0)
+    if gnn_data.get("in_csr") is not None:
+        adj = csr_adjacency(*gnn_data["in_csr"], n)
+    else:
+        adj = build_normalized_adjacency(
+            torch.from_numpy(np.asarray(gnn_data["edge_index"], dtype=np.int64)), n
+        )
+    num_edges = adj.values().numel()
+
+    y = torch.from_numpy(targets)
+    train_idx, val_idx = (torch.from_numpy(a) for a in split_nodes(mask, validation, seed))
+
+    model = model or SimpleRiskGNN(X.size(1))
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+
+    best = {"epoch": 0, "val_loss": float("inf"), "state": None}
+    history = []
+    stale = 0
+
+    try:
+        for epoch in range(1, epochs + 1):
+            started = time.perf_counter()
+            model.train()
+            optimizer.zero_grad()
+
+            pred = model(X, adj=adj).reshape(-1)
+            loss = F.binary_cross_entropy(pred[train_idx], y[train_idx])
+            val_loss = F.binary_cross_entropy(pred[val_idx].detach(), y[val_idx]).item()
+
+            # pred comes from the weights before this step: keep those
+            if val_loss < best["val_loss"]:
+                best = {
+                    "epoch": epoch,
+                    "val_loss": val_loss,
+                    "state": copy.deepcopy(model.state_dict()),
+                }
+                stale = 0
+            else:
+                stale += 1
+
+            loss.backward()
+            optimizer.step()
+
+            seconds = time.perf_counter() - started
+            history.append({
+                "epoch": epoch,
+                "loss": loss.item(),
+                "val_loss": val_loss,
+                "seconds": seconds,
+            })
+            log(
+                f"epoch {epoch:4d}  loss {loss.item():.5f}  val {val_loss:.5f}"
+                f"  {seconds * 1000:8.1f} ms  {n / seconds:12,.0f} nodes/s"
+                f"  {num_edges / seconds:12,.0f} edges/s"
+            )
+
+            if stale >= patience:
+                log(f"no improvement for {patience} epochs, stopping")
+                break
+    except KeyboardInterrupt:
+        log("interrupted, keeping the best weights so far")
+
+    if best["state"] is not None:
+        model.load_state_dict(best["state"])
+    model.eval()
+
+    return {
+        "model": model,
+        "epoch": best["epoch"],
+        "val_loss": best["val_loss"],
+        "history": history,
+    }
+
+
+def train_from_analysis(results: dict, labels: dict, path: str = None, **options) -> dict:
+    """
+    Train on one run_full_analysis() result against `labels` and
+    checkpoint the best weights to `path` (default weights_path()).
+    Returns train()'s result plus "path".
+    """
+    if not labels:
+        raise ValueError("Labels are required: base_risk is a model input, not a target")
+
+    graph = results["graph"]
+    gnn_data = prepare_gnn_data(
+        graph, results["node_features"], results["base_risks"], normalize=True
+    )
+    targets, mask = training_targets(graph, labels)
+
+    trained = train(gnn_data, targets, mask, **options)
+    trained["path"] = save_model(
+        trained["model"],
+        path,
+        features=list(GNN_FEATURES),
+        target=TRAINED_TARGET,
+        epoch=trained["epoch"],
+        val_loss=trained["val_loss"],
+    )
+    return trained
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the CPU GNN risk model.")
+    parser.add_argument("csv", help="transactions CSV")
+    parser.add_argument("--labels", action="append", required=True,
+                        help="labeled CSV (repeatable)")
+    parser.add_argument("--wallet-column", default=WALLET_COLUMN)
+    parser.add_argument("--label-column", default=LABEL_COLUMN)
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
+    parser.add_argument("--lr", type=float, default=DEFAULT_LR)
+    parser.add_argument("--validation", type=float, default=VALIDATION_FRACTION)
+    parser.add_argument("--patience", type=int, default=DEFAULT_PATIENCE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=None,
+                        help="torch intra-op threads (default GNN_NUM_THREADS / torch's)")
+    parser.add_argument("--output", default=weights_path(),
+                        help="checkpoint path (default GNN_WEIGHTS_PATH)")
+    parser.add_argument("--cache-dir", default=None, help="columnar graph cache")
+    args = parser.parse_args()
+    if args.output is None:
+        parser.error("--output is required when GNN_WEIGHTS_PATH is not set")
+
+    labels = load_labels(args.labels, args.wallet_column, args.label_column)
+
+    started = time.perf_counter()
+    results = run_full_analysis(args.csv, cache_dir=args.cache_dir, memoize=False)
+    graph = results["graph"]
+    print(f"analysis: {time.perf_counter() - started:.1f}s  nodes: {graph.num_nodes:,}"
+          f"  pairs: {graph.num_pairs:,}  transactions: {graph.num_edges:,}")
+
+    started = time.perf_counter()
+    trained = train_from_analysis(
+        results,
+        labels=labels,
+        path=args.output,
+        epochs=args.epochs,
+        lr=args.lr,
+        validation=args.validation,
+        patience=args.patience,
+        seed=args.seed,
+        num_threads=args.threads,
+    )
+    print(f"training: {time.perf_counter() - started:.1f}s  best epoch {trained['epoch']}"
+          f"  val loss {trained['val_loss']:.5f}  -> {trained['path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Fast JSON responses for large analysis payloads.
+
+    dumps()          -> orjson (NumPy arrays serialized natively) when
+                        installed, else the standard json module
+    FastJSONRenderer -> DRF renderer on top of dumps()
+    ndjson_batch(),
+    csv_batch()      -> encoded chunks of a streaming export
+    cached_json()    -> response body built once per analysis and query,
+                        kept as bytes (plus gzip / brotli variants) next to
+                        the results, so repeated GETs only copy bytes
+"""
+
+import csv
+import gzip
+import io
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from django.http import HttpResponse
+from rest_framework.renderers import BaseRenderer
+
+# Optional (fast JSON with NumPy support)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional (brotli content encoding)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Cached bodies per analysis (distinct queries); oldest dropped first
+MAX_CACHED_PAYLOADS = 32
+
+_LOCK = threading.Lock()
+
+
+def _default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data) -> bytes:
+    """
+    Compact UTF-8 JSON. NumPy arrays and scalars are accepted as values.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        data, default=_default, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+class FastJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(data)
+
+
+# Streaming endpoints answer with their own response class; these only let
+# such clients through content negotiation (errors are still JSON)
+class EventStreamRenderer(FastJSONRenderer):
+    media_type = "text/event-stream"
+    format = "event-stream"
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+class CSVRenderer(FastJSONRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+def ndjson_batch(rows: list) -> bytes:
+    """
+    One JSON object per line.
+    """
+    return b"".join(dumps(row) + b"\n" for row in rows)
+
+
+def csv_batch(rows: list, fields, header: bool = False) -> bytes:
+    """
+    CSV lines for `rows`; list values (reasons) are joined with "; ".
+    """
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    if header:
+        writer.writerow(fields)
+    writer.writerows(
+        [
+            "; ".join(value) if isinstance(value, list) else value
+            for value in (row[f] for f in fields)
+        ]
+        for row in rows
+    )
+    return out.getvalue().encode()
+
+
+def accepted_encoding(request) -> str:
+    """
+    Best content encoding the client accepts: "br", "gzip" or None.
+    """
+    header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    parts = [part.replace(" ", "").lower() for part in header.split(",")]
+    offered = {
+        part.split(";")[0] for part in parts
+        if not part.endswith(("q=0", "q=0.0"))
+    }
+    if BROTLI_AVAILABLE and "br" in offered:
+        return "br"
+    if "gzip" in offered:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+
+def cached_json(request, results: dict, name: str, build, account=None) -> HttpResponse:
+    """
+    JSON response for `name` built by build() at most once per analysis
+    and query string; the encoded bytes are reused afterwards.
+
+    build() may raise ValueError for bad parameters; nothing is cached
+    then.
+
+    account: optional callable(delta) told how many bytes the cached
+    bodies grew or shrank by (e.g. ResultStore.add_nbytes for the entry
+    holding `results`), so they count against the store's budget.
+    """
+    cache, delta = _payload_cache(results)
+
+    # The ids only select the analysis, which `results` already is
+    query = sorted(
+        (k, v) for k, v in request.query_params.lists()
+        if k not in ("dataset_id", "analysis_id")
+    )
+    key = json.dumps([name, query])
+
+    with _LOCK:
+        entry = cache.get(key)
+        if entry is not None:
+            cache.move_to_end(key)
+
+    if entry is None:
+        # Built outside the lock; concurrent misses just build twice
+        entry = {None: dumps(build())}
+        with _LOCK:
+            replaced = cache.pop(key, None)
+            cache[key] = entry
+            delta += _entry_nbytes(entry) - _entry_nbytes(replaced)
+            while len(cache) > MAX_CACHED_PAYLOADS:
+                delta -= _entry_nbytes(cache.popitem(last=False)[1])
+
+    body = entry[None]
+    encoding = accepted_encoding(request) if len(body) >= MIN_COMPRESS_BYTES else None
+    if encoding:
+        if encoding not in entry:
+            compressed = compress(body, encoding)
+            with _LOCK:
+                if encoding not in entry and cache.get(key) is entry:
+                    delta += len(compressed)
+                entry[encoding] = compressed
+        body = entry[encoding]
+
+    if account is not None and delta:
+        account(delta)
+
+    response = HttpResponse(body, content_type="application/json")
+    response["Vary"] = "Accept-Encoding"
+    if encoding:
+        response["Content-Encoding"] = encoding
+    return response
+
+
+def _entry_nbytes(entry) -> int:
+    return sum(len(body) for body in entry.values()) if entry else 0
+
+
+def _payload_cache(results: dict):
+    """
+    Per-analysis body cache, reset when the scores object changes (an
+    appended analysis starts out as a shallow copy of its parent).
+
+    Returns (cache, -bytes of the bodies dropped by a reset).
+    """
+    owner = (results.get("graph"), results.get("base_risks"), results.get("gnn_risks"))
+
+    with _LOCK:
+        cached = results.get("payloads")
+        dropped = 0
+        if cached is None or any(a is not b for a, b in zip(cached["owner"], owner)):
+            if cached is not None:
+                dropped = sum(_entry_nbytes(e) for e in cached["bodies"].values())
+            cached = {"owner": owner, "bodies": OrderedDict()}
+            results["payloads"] = cached
+        return cached["bodies"], -dropped
@@ -2,17 +2,30 @@ from django.urls import path
 from .views import (
     upload_csv,
     analyze,
+    analysis_status,
+    append_transactions,
     get_graph,
+    get_wallet_subgraph,
     get_risk_scores,
+    get_top_risk,
+    export_risk_scores,
     health,
     get_final_risk,
+    stream_alerts,
 )
 
 urlpatterns = [
     path("health/", health),
     path("upload-csv/", upload_csv),
     path("analyze/", analyze),
+    path("analyze/<str:job_id>/", analysis_status),
+    path("transactions/append/", append_transactions),
     path("graph/", get_graph),
+    path("wallet/<str:wallet_id>/subgraph/", get_wallet_subgraph),
     path("risk-scores/", get_risk_scores),
+    path("risk-scores/top/", get_top_risk),
     path("final-risk/", get_final_risk),
+    path("risk-scores/export/", export_risk_scores, {"kind": "risk-scores"}),
+    path("final-risk/export/", export_risk_scores, {"kind": "final-risk"}),
+    path("stream/alerts/", stream_alerts),
 ]
@@ -1,22 +1,178 @@
 import os
+import json
 import tempfile
-import time
 import logging
 
-from rest_framework.decorators import api_view
+import pandas as pd
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
 
-from core.pipeline import run_full_analysis
+from .payloads import (
+    CSVRenderer,
+    EventStreamRenderer,
+    FastJSONRenderer,
+    NDJSONRenderer,
+    cached_json,
+    csv_batch,
+    ndjson_batch,
+)
+
+from core.append_feed import follow_appends, publish_append
+from core.columnar_cache import file_digest, has_bundle, load_bundle, save_bundle
+from core.graph_builder import load_columnar_graph
+from core.graph_view import (
+    DEFAULT_HOPS,
+    DEFAULT_MAX_DEGREE,
+    DEFAULT_MAX_NODES,
+    MAX_HOPS,
+    MAX_NODES,
+    ego_subgraph,
+    graph_page,
+)
+from core import incremental
+from core.jobs import AnalysisJobs
+from core.pipeline import analysis_keys
+from core.result_store import DiskBackend, ResultStore
+from core.risk_index import risk_index
+from core.risk_table import (
+    EXPORT_BATCH_SIZE,
+    FINAL_RISK_FIELDS,
+    RISK_COMPONENTS,
+    RISK_SCORE_FIELDS,
+    export_rows,
+    risk_columns,
+    risk_records,
+)
+from core.streaming import DEFAULT_WINDOW_SECONDS, StreamingDetector, replay_graph
 
 # -------------------------------------------------
 # Logging
 # -------------------------------------------------
 logger = logging.getLogger(__name__)
 
-# ----------------------------------------------------------------------------
-# In-memory session cache this is done for being on the safe of the hackathon
-# ----------------------------------------------------------------------------
-ANALYSIS_CACHE = {}
+# Binary columnar bundles of uploaded CSVs, keyed by content hash
+COLUMNAR_CACHE_DIR = str(getattr(settings, "COLUMNAR_CACHE_DIR", "")) or None
+
+# Memoized pipeline phases, shared by every analysis worker
+PHASE_CACHE_DIR = str(getattr(settings, "PHASE_CACHE_DIR", "")) or None
+
+# Parent -> appended dataset links, followed by live alert streams
+APPEND_FEED_DIR = str(getattr(settings, "APPEND_FEED_DIR", "")) or None
+MAX_FOLLOW_SECONDS = 60 * 60
+
+# Analyses run in a bounded background process pool; job records live in
+# a directory shared by every worker process
+ANALYSIS_JOBS = AnalysisJobs(
+    max_workers=getattr(settings, "ANALYSIS_WORKERS", 2),
+    state_dir=str(getattr(settings, "JOB_STATE_DIR", "")) or None,
+)
+
+# -------------------------------------------------
+# Analysis results, keyed by analysis id: the risk phase key of the
+# dataset id (content hash) plus the weights / thresholds overrides
+# -------------------------------------------------
+RESULT_STORE_DIR = str(getattr(settings, "RESULT_STORE_DIR", "")) or None
+RESULT_STORE_TTL = getattr(settings, "RESULT_STORE_TTL_SECONDS", 60 * 60)
+
+RESULT_STORE = ResultStore(
+    max_entries=getattr(settings, "RESULT_STORE_MAX_ENTRIES", 8),
+    ttl_seconds=RESULT_STORE_TTL,
+    max_bytes=getattr(settings, "RESULT_STORE_MAX_BYTES", 2 * 1024 ** 3),
+    # Shared on disk so any worker can serve any analysis
+    backend=DiskBackend(
+        RESULT_STORE_DIR,
+        RESULT_STORE_TTL,
+        max_bytes=getattr(settings, "RESULT_STORE_DISK_MAX_BYTES", 8 * 1024 ** 3),
+    ) if RESULT_STORE_DIR else None,
+)
+
+# Every dataset-scoped request names its dataset: a process-wide "latest
+# upload" would let one analyst's upload change what another one reads
+DATASET_ID_REQUIRED = "dataset_id is required (returned by upload-csv)"
+
+
+def _dataset_id(request):
+    """
+    dataset_id from the query string or body; None if missing.
+    """
+    dataset_id = request.query_params.get("dataset_id")
+    if not dataset_id and hasattr(request.data, "get"):
+        dataset_id = request.data.get("dataset_id")
+    return dataset_id or None
+
+
+def _analysis_id(request, dataset_id):
+    """
+    analysis_id from the query string or body (returned by analyze);
+    defaults to the analysis of `dataset_id` with default parameters.
+    """
+    analysis_id = request.query_params.get("analysis_id")
+    if not analysis_id and hasattr(request.data, "get"):
+        analysis_id = request.data.get("analysis_id")
+    return analysis_id or analysis_keys(dataset_id)["risk"]
+
+
+def _cached_json(request, results, name, build):
+    """
+    cached_json() whose cached bodies count against RESULT_STORE's byte
+    budget, under the entry holding `results`.
+    """
+    return cached_json(
+        request, results, name, build,
+        account=lambda delta: RESULT_STORE.add_nbytes(results["analysis_id"], delta),
+    )
+
+
+def _columnar(request) -> bool:
+    """
+    ?shape=columnar asks for {field: [values]} instead of row objects.
+    """
+    return request.query_params.get("shape") == "columnar"
+
+
+def _current_results(request, action):
+    """
+    Analysis results for the request's dataset.
+
+    Returns (results, None) or (None, error Response).
+    """
+    dataset_id = _dataset_id(request)
+    if dataset_id is None:
+        return None, Response(
+            {"error": DATASET_ID_REQUIRED},
+            status=400
+        )
+
+    analysis_id = _analysis_id(request, dataset_id)
+
+    # The analysis' latest job (from any worker) has the final say while it runs
+    job_id = ANALYSIS_JOBS.latest(analysis_id)
+    status = ANALYSIS_JOBS.status(job_id) if job_id else None
+
+    if status and status["state"] == "failed":
+        return None, Response(
+            {"error": "Analysis failed", "details": status["error"]},
+            status=500
+        )
+
+    if status and status["state"] in ("queued", "running"):
+        return None, Response(
+            {"error": "Analysis still running", "job": status},
+            status=409
+        )
+
+    # A done job has already handed its results to the store
+    results = RESULT_STORE.get(analysis_id)
+
+    if results is None or results["ingest"]["dataset_id"] != dataset_id:
+        return None, Response(
+            {"error": f"Run analysis before requesting {action}."},
+            status=400
+        )
+
+    return results, None
 
 
 # -------------------------------------------------
@@ -54,14 +210,6 @@ def upload_csv(request):
             status=400
         )
 
-    # Clean up old temp file if exists
-    old_csv = ANALYSIS_CACHE.get("csv_path")
-    if old_csv and os.path.exists(old_csv):
-        try:
-            os.remove(old_csv)
-        except Exception:
-            logger.warning("Failed to delete old CSV temp file")
-
     try:
         tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
         for chunk in file.chunks():
@@ -78,12 +226,34 @@ def upload_csv(request):
             status=500
         )
 
-    ANALYSIS_CACHE.clear()
-    ANALYSIS_CACHE["csv_path"] = tmp.name
+    # Convert once to the binary columnar cache; analyses load that instead,
+    # so the uploaded CSV is not kept
+    try:
+        dataset_id = file_digest(tmp.name)
+        _, ingest = load_columnar_graph(tmp.name, COLUMNAR_CACHE_DIR, dataset_id)
+
+    except ValueError as e:
+        return Response(
+            {"error": str(e)},
+            status=400
+        )
+
+    finally:
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            logger.warning("Failed to delete CSV temp file")
 
-    logger.info("CSV uploaded: %s", file.name)
+    logger.info(
+        "CSV uploaded: %s (dataset %s, %s in %.3fs)",
+        file.name, dataset_id[:12], ingest["source"], ingest["seconds"],
+    )
 
-    return Response({"message": "CSV uploaded successfully"})
+    return Response({
+        "message": "CSV uploaded successfully",
+        "dataset_id": dataset_id,
+        "ingest": ingest,
+    })
 
 
 # -------------------------------------------------
@@ -91,29 +261,63 @@ def upload_csv(request):
 # -------------------------------------------------
 @api_view(["POST"])
 def analyze(request):
-    csv_path = ANALYSIS_CACHE.get("csv_path")
-
-    if not csv_path or not os.path.exists(csv_path):
+    dataset_id = _dataset_id(request)
+    if dataset_id is None:
+        return Response(
+            {"error": DATASET_ID_REQUIRED},
+            status=400
+        )
+    # Any worker can analyze an upload converted into the columnar cache
+    if not has_bundle(dataset_id, COLUMNAR_CACHE_DIR):
         logger.warning("Analyze called without CSV")
         return Response(
             {"error": "No CSV uploaded. Upload CSV before analysis."},
             status=400
         )
 
+    # Optional overrides: {"weights": [4 floats], "thresholds": {...}}
+    weights = request.data.get("weights") if hasattr(request.data, "get") else None
+    thresholds = request.data.get("thresholds") if hasattr(request.data, "get") else None
+
+    if weights is not None and (
+        not isinstance(weights, list) or len(weights) != 4
+        or not all(isinstance(w, (int, float)) for w in weights)
+    ):
+        return Response(
+            {"error": "weights must be a list of 4 numbers"},
+            status=400
+        )
+
+    if thresholds is not None and not isinstance(thresholds, dict):
+        return Response(
+            {"error": "thresholds must be an object keyed by pattern"},
+            status=400
+        )
+
+    # Results and in-flight jobs are keyed by the parameterized analysis,
+    # so runs of one dataset with different overrides do not collide
     try:
-        start = time.time()
-        results = run_full_analysis(csv_path)
-        duration = time.time() - start
+        analysis_id = analysis_keys(dataset_id, thresholds, weights)["risk"]
+    except ValueError as e:
+        return Response(
+            {"error": str(e)},
+            status=400
+        )
 
-        if duration > 5:
-            logger.error("Analysis timeout: %.2fs", duration)
-            return Response(
-                {"error": "Analysis exceeded time limit"},
-                status=500
-            )
+    try:
+        job_id = ANALYSIS_JOBS.submit(
+            None,
+            on_done=lambda results: RESULT_STORE.put(analysis_id, results),
+            key=analysis_id,
+            cache_dir=COLUMNAR_CACHE_DIR,
+            dataset_id=dataset_id,
+            weights=weights,
+            thresholds=thresholds,
+            phase_cache_dir=PHASE_CACHE_DIR,
+        )
 
     except Exception as e:
-        logger.exception("Analysis failed")
+        logger.exception("Analysis submission failed")
         return Response(
             {
                 "error": "Analysis failed",
@@ -122,138 +326,499 @@ def analyze(request):
             status=500
         )
 
-    ANALYSIS_CACHE["results"] = results
-    logger.info("Analysis completed in %.2fs", duration)
+    logger.info("Analysis job %s queued for dataset %s", job_id, dataset_id[:12])
+
+    return Response(
+        {
+            "message": "Analysis started",
+            "job_id": job_id,
+            "dataset_id": dataset_id,
+            "analysis_id": analysis_id,
+            "status_url": request.build_absolute_uri(f"{job_id}/"),
+        },
+        status=202
+    )
+
+
+# -------------------------------------------------
+# Analysis Job Status
+# -------------------------------------------------
+@api_view(["GET"])
+def analysis_status(request, job_id):
+    status = ANALYSIS_JOBS.status(job_id)
+
+    if status is None:
+        return Response(
+            {"error": "Unknown analysis job"},
+            status=404
+        )
+
+    if status["state"] == "done":
+        # The results themselves were handed to RESULT_STORE
+        results = ANALYSIS_JOBS.summary(job_id)
+        status["graph_summary"] = results["graph_summary"]
+        status["timings"] = {
+            "total_seconds": status["elapsed_seconds"],
+            "ingest": results["ingest"],
+            "phases": results["phase_seconds"],
+        }
+        status["phase_cache"] = results["phase_cache"]
+
+    return Response(status)
+
+
+# -------------------------------------------------
+# Incremental Append
+# -------------------------------------------------
+@api_view(["POST"])
+def append_transactions(request):
+    """
+    Append new transactions to an analyzed dataset: a CSV `file` in the
+    upload layout, or JSON {"transactions": [{Source_Wallet_ID, ...}]}.
+
+    Only the affected part of the analysis is recomputed. The result is
+    stored under a new dataset_id (old id + new rows) and the matching
+    analysis_id, which are returned.
+    """
+    results, error = _current_results(request, "an append")
+    if error:
+        return error
+
+    file = request.FILES.get("file")
+    rows = None if file else request.data.get("transactions")
+
+    if not file and not isinstance(rows, list):
+        return Response(
+            {"error": "CSV file or transactions list required"},
+            status=400
+        )
+
+    try:
+        df = pd.read_csv(file) if file else pd.DataFrame(rows)
+        if df.empty:
+            return Response(
+                {"error": "No transactions to append"},
+                status=400
+            )
+
+        updated = incremental.append_transactions(results, df)
+
+    except (ValueError, TypeError) as e:
+        return Response(
+            {"error": str(e)},
+            status=400
+        )
+
+    dataset_id = updated["ingest"]["dataset_id"]
+
+    # Re-analyzing the new dataset id starts from the appended graph
+    save_bundle(updated["graph"], dataset_id, COLUMNAR_CACHE_DIR)
+    RESULT_STORE.put(updated["analysis_id"], updated)
+
+    # Streams following the parent dataset pick up the new rows
+    if APPEND_FEED_DIR:
+        publish_append(
+            APPEND_FEED_DIR,
+            updated["append"]["parent_dataset_id"],
+            dataset_id,
+            updated["graph"].num_edges - updated["append"]["new_transactions"],
+        )
 
-    return Response({"message": "Analysis completed"})
+    logger.info(
+        "Appended %d transactions to dataset %s -> %s in %.3fs",
+        updated["append"]["new_transactions"],
+        updated["append"]["parent_dataset_id"][:12],
+        dataset_id[:12],
+        updated["append"]["seconds"],
+    )
+
+    return Response({
+        "message": "Transactions appended",
+        "dataset_id": dataset_id,
+        "analysis_id": updated["analysis_id"],
+        "graph_summary": updated["graph_summary"],
+        "append": updated["append"],
+    })
 
 
 # -------------------------------------------------
 # Graph Endpoint
 # -------------------------------------------------
 @api_view(["GET"])
+@renderer_classes([FastJSONRenderer])
 def get_graph(request):
-    results = ANALYSIS_CACHE.get("results")
+    """
+    Graph nodes and edges. Optional query parameters:
+
+        min_risk, pattern (comma list), entity_type, token_type -> filters
+        top_k                  -> highest-risk nodes only (risk order)
+        page, page_size        -> pagination over the matching nodes
+        fields, edge_fields    -> comma lists of the keys to return
+        shape=columnar         -> {field: [values]} instead of row objects
+
+    Nodes carry both risk (base) and final_risk, so clients need not
+    download /final-risk/ or /risk-scores/ for the same wallets. Edges
+    are the wallet pairs between returned nodes.
+    """
+    results, error = _current_results(request, "graph")
+    if error:
+        return error
+
+    params = request.query_params
+
+    def number(name, cast, minimum):
+        value = params.get(name)
+        if value in (None, ""):
+            return None
+        value = cast(value)
+        if value < minimum:
+            raise ValueError(f"{name} must be >= {minimum}")
+        return value
+
+    def names(name):
+        value = params.get(name)
+        return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+    def build():
+        return graph_page(
+            results,
+            min_risk=number("min_risk", float, 0),
+            patterns=names("pattern"),
+            entity_type=params.get("entity_type") or None,
+            token_type=params.get("token_type") or None,
+            top_k=number("top_k", int, 1),
+            page=number("page", int, 1) or 1,
+            page_size=number("page_size", int, 1),
+            fields=names("fields"),
+            edge_fields=names("edge_fields"),
+            columnar=_columnar(request),
+        )
 
-    if not results:
+    try:
+        return _cached_json(request, results, "graph", build)
+
+    except ValueError as e:
         return Response(
-            {"error": "Run analysis before requesting graph."},
+            {"error": str(e)},
             status=400
         )
 
-    G = results.get("graph")
-    base_risks = results.get("base_risks", {})
-    patterns = results.get("patterns", {})
-
-    involved_wallets = {
-        w for w, p in patterns.items()
-        if any(v is True for k, v in p.items() if not k.endswith("_reason"))
-    }
-
-    nodes = []
-    for node in G.nodes():
-        risk_info = base_risks.get(node, {})
-        risk = risk_info.get("base_risk", 0.0)
-
-        is_wallet = node.startswith("0x")
-
-        nodes.append({
-            "id": node,
-            "risk": risk,
-            "is_risky": risk >= 0.5,
-            "is_involved": node in involved_wallets,
-            "entity_type": "wallet" if is_wallet else "service",
-            "reasons": risk_info.get("reasons", []),
-        })
-
-    edges = []
-    for u, v, data in G.edges(data=True):
-        p = patterns.get(u, {})
-        edges.append({
-            "source": u,
-            "target": v,
-            "amount": data.get("amount", 0.0),
-            "is_suspicious": p.get("fan_out", False) or p.get("peeling_chain", False),
-            "pattern": (
-                "smurfing" if p.get("fan_out")
-                else "peeling" if p.get("peeling_chain")
-                else None
-            )
-        })
 
-    return Response({"nodes": nodes, "edges": edges})
+# -------------------------------------------------
+# Wallet Neighborhood
+# -------------------------------------------------
+@api_view(["GET"])
+def get_wallet_subgraph(request, wallet_id):
+    """
+    k-hop neighborhood of one wallet: ?hops=k&max_nodes=N&max_degree=D.
+    """
+    results, error = _current_results(request, "a wallet subgraph")
+    if error:
+        return error
+
+    params = request.query_params
+
+    try:
+        hops = int(params.get("hops", DEFAULT_HOPS))
+        max_nodes = int(params.get("max_nodes", DEFAULT_MAX_NODES))
+        max_degree = int(params.get("max_degree", DEFAULT_MAX_DEGREE))
+
+        if not 1 <= hops <= MAX_HOPS:
+            raise ValueError(f"hops must be between 1 and {MAX_HOPS}")
+        if not 1 <= max_nodes <= MAX_NODES:
+            raise ValueError(f"max_nodes must be between 1 and {MAX_NODES}")
+        if max_degree < 1:
+            raise ValueError("max_degree must be >= 1")
+
+    except ValueError as e:
+        return Response(
+            {"error": str(e)},
+            status=400
+        )
+
+    try:
+        subgraph = ego_subgraph(
+            results, wallet_id,
+            hops=hops, max_nodes=max_nodes, max_degree=max_degree,
+        )
+
+    except KeyError:
+        return Response(
+            {"error": f"Unknown wallet: {wallet_id}"},
+            status=404
+        )
+
+    return Response(subgraph)
 
 
 # -------------------------------------------------
 # Risk Scores Endpoint (Phase 5.4)
 # -------------------------------------------------
 @api_view(["GET"])
+@renderer_classes([FastJSONRenderer])
 def get_risk_scores(request):
-    results = ANALYSIS_CACHE.get("results")
+    results, error = _current_results(request, "risk scores")
+    if error:
+        return error
+
+    def build():
+        columns = risk_columns(results)
+        return {
+            "wallets": risk_records(
+                columns, RISK_SCORE_FIELDS, columnar=_columnar(request)
+            ),
+        }
+
+    return _cached_json(request, results, "risk-scores", build)
+
+
+# -------------------------------------------------
+# Top Risky Wallets (sorted index)
+# -------------------------------------------------
+TOP_FIELDS = ("id", "base_risk", "final_risk", "gnn_risk", *RISK_COMPONENTS, "entity_type", "reasons")
+MAX_TOP_K = 10_000
+
+
+@api_view(["GET"])
+@renderer_classes([FastJSONRenderer])
+def get_top_risk(request):
+    """
+    Highest-scoring wallets from the analysis' sorted risk index:
+
+        ?by=base_risk|final_risk|<component>   (default final_risk)
+        &k=N                                   (default 10)
+        &min=..&max=..   -> only scores in [min, max], highest first
+        &wallet=<id>     -> rank of one wallet instead
+    """
+    results, error = _current_results(request, "top risk scores")
+    if error:
+        return error
+
+    params = request.query_params
+    index = risk_index(results)
+
+    try:
+        by = params.get("by", "final_risk")
+        k = int(params.get("k", 10))
+        if not 1 <= k <= MAX_TOP_K:
+            raise ValueError(f"k must be between 1 and {MAX_TOP_K}")
+
+        low = float(params["min"]) if params.get("min") else None
+        high = float(params["max"]) if params.get("max") else None
+
+        if params.get("wallet"):
+            return Response(index.rank(by, params["wallet"]))
+
+        if low is None and high is None:
+            rows = index.top_k(by, k)
+            matches = len(index)
+        else:
+            rows = index.range(by, low, high)[:k]
+            matches = index.count(by, low, high)
 
-    if not results:
+    except ValueError as e:
         return Response(
-            {"error": "Run analysis before requesting risk scores."},
+            {"error": str(e)},
             status=400
         )
 
-    base_risks = results.get("base_risks", {})
-
-    wallets = []
-    for wallet, risk_info in base_risks.items():
-        base = risk_info.get("base_risk", 0.0)
+    except KeyError:
+        return Response(
+            {"error": f"Unknown wallet: {params['wallet']}"},
+            status=404
+        )
 
-        wallets.append({
-            "id": wallet,
-            "base_risk": base,
-            "structural_risk": risk_info.get("structural_risk", 0.0),
-            "flow_risk": risk_info.get("flow_risk", 0.0),
-            "temporal_risk": risk_info.get("temporal_risk", 0.0),
-            "proximity_risk": risk_info.get("proximity_risk", 0.0),
-            "is_risky": base >= 0.5,
-            "entity_type": "wallet" if wallet.startswith("0x") else "service",
-            "reasons": risk_info.get("reasons", []),
-        })
+    wallets = risk_records(index.columns, TOP_FIELDS, rows=rows)
+    positions = index.position[by][rows] + 1
+    for row, position in zip(wallets, positions.tolist()):
+        row["position"] = position
 
-    return Response({"wallets": wallets})
+    return Response({
+        "by": by,
+        "matches": matches,
+        "total": len(index),
+        "wallets": wallets,
+    })
 
 
 # -------------------------------------------------
 # Final Risk Fusion (Phase 5.5 Optional)
 # -------------------------------------------------
 @api_view(["GET"])
+@renderer_classes([FastJSONRenderer])
 def get_final_risk(request):
-    results = ANALYSIS_CACHE.get("results")
+    results, error = _current_results(request, "final risk")
+    if error:
+        return error
+
+    def build():
+        columns = risk_columns(results)
+        return {
+            "alpha": columns["alpha"],
+            "gnn_enabled": columns["gnn_enabled"],
+            "wallets": risk_records(
+                columns, FINAL_RISK_FIELDS, columnar=_columnar(request)
+            ),
+        }
+
+    return _cached_json(request, results, "final-risk", build)
+
+
+# -------------------------------------------------
+# Streaming Export (NDJSON / CSV)
+# -------------------------------------------------
+EXPORTS = {
+    "risk-scores": RISK_SCORE_FIELDS,
+    "final-risk": FINAL_RISK_FIELDS,
+}
 
-    if not results:
+
+@api_view(["GET"])
+@renderer_classes([FastJSONRenderer, NDJSONRenderer, CSVRenderer])
+def export_risk_scores(request, kind):
+    """
+    Stream every wallet's scores without building the full list:
+
+        ?output=ndjson|csv           (default ndjson)
+        &sort=base_risk|final_risk   (default: analysis order)
+        &order=desc|asc              (default desc)
+        &batch_size=N
+    """
+    results, error = _current_results(request, "an export")
+    if error:
+        return error
+
+    params = request.query_params
+    output = params.get("output", "ndjson")
+    fields = EXPORTS[kind]
+
+    try:
+        if output not in ("ndjson", "csv"):
+            raise ValueError("output must be ndjson or csv")
+        if params.get("order", "desc") not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+
+        batches = export_rows(
+            risk_columns(results),
+            fields,
+            sort=params.get("sort") or None,
+            descending=params.get("order", "desc") == "desc",
+            batch_size=int(params.get("batch_size", EXPORT_BATCH_SIZE)),
+        )
+
+    except ValueError as e:
         return Response(
-            {"error": "Run analysis before requesting final risk."},
+            {"error": str(e)},
             status=400
         )
 
-    base_risks = results.get("base_risks", {})
-    gnn_risks = results.get("gnn_risks") or {}
+    def chunks():
+        for i, rows in enumerate(batches):
+            if output == "csv":
+                yield csv_batch(rows, fields, header=i == 0)
+            else:
+                yield ndjson_batch(rows)
 
-    ALPHA = 0.6
-    wallets = []
+    content_type = "text/csv" if output == "csv" else "application/x-ndjson"
+    dataset_id = results["ingest"]["dataset_id"]
 
-    for wallet, info in base_risks.items():
-        base = info.get("base_risk", 0.0)
-        gnn = gnn_risks.get(wallet, base)
+    response = StreamingHttpResponse(chunks(), content_type=content_type)
+    response["Content-Disposition"] = (
+        f'attachment; filename="{kind}-{dataset_id[:12]}.{output}"'
+    )
+    return response
 
-        final = round(ALPHA * base + (1 - ALPHA) * gnn, 3)
 
-        wallets.append({
-            "id": wallet,
-            "base_risk": base,
-            "gnn_risk": round(gnn, 3),
-            "final_risk": final,
-            "delta": round(final - base, 3),
-            "reasons": info.get("reasons", []),
-        })
+# -------------------------------------------------
+# Streaming Alerts (server-sent events)
+# -------------------------------------------------
+def _dataset_graph(dataset_id):
+    """
+    Columnar graph of a dataset: from its analysis, else from the columnar
+    cache. None if unknown.
+    """
+    results = RESULT_STORE.get(analysis_keys(dataset_id)["risk"])
+    if results is not None:
+        return results["graph"]
 
-    return Response({
-        "alpha": ALPHA,
-        "gnn_enabled": bool(gnn_risks),
-        "wallets": wallets
-    })
+    return load_bundle(dataset_id, COLUMNAR_CACHE_DIR)
+
+
+@api_view(["GET"])
+@renderer_classes([FastJSONRenderer, EventStreamRenderer])
+def stream_alerts(request):
+    """
+    Replay a dataset in timestamp order through the sliding-window
+    detector and push fan-in / fan-out / mule alerts as they fire.
+
+    ?dataset_id=<id> (required), ?window=<seconds> (default 3600).
+
+    ?follow=<seconds> keeps the stream open after the replay: transactions
+    appended to the dataset (from any worker) are fed to the same detector
+    as they arrive, until no append comes for that long (default 0, i.e.
+    replay only; at most MAX_FOLLOW_SECONDS). Appended rows older than the
+    newest transaction already seen are skipped and counted as "late".
+    """
+    dataset_id = _dataset_id(request)
+    if dataset_id is None:
+        return Response(
+            {"error": DATASET_ID_REQUIRED},
+            status=400
+        )
+    graph = _dataset_graph(dataset_id)
+
+    if graph is None:
+        return Response(
+            {"error": "No CSV uploaded. Upload CSV before streaming alerts."},
+            status=404
+        )
+
+    try:
+        window_seconds = float(request.query_params.get("window", DEFAULT_WINDOW_SECONDS))
+        if window_seconds <= 0:
+            raise ValueError
+    except ValueError:
+        return Response(
+            {"error": "window must be a positive number of seconds"},
+            status=400
+        )
+
+    try:
+        follow_seconds = float(request.query_params.get("follow", 0))
+        if not 0 <= follow_seconds <= MAX_FOLLOW_SECONDS:
+            raise ValueError
+    except ValueError:
+        return Response(
+            {"error": f"follow must be between 0 and {MAX_FOLLOW_SECONDS} seconds"},
+            status=400
+        )
+
+    detector = StreamingDetector(window_seconds)
+    counts = {"alerts": 0, "late": 0}
+
+    def feed(transactions):
+        for src, dst, amount, timestamp in transactions:
+            if detector.now is not None and timestamp < detector.now:
+                counts["late"] += 1
+                continue
+            for alert in detector.process(src, dst, amount, timestamp):
+                counts["alerts"] += 1
+                yield f"event: alert\ndata: {json.dumps(alert)}\n\n"
+
+    def events():
+        yield from feed(replay_graph(graph))
+
+        if follow_seconds and APPEND_FEED_DIR:
+            for link in follow_appends(APPEND_FEED_DIR, dataset_id, follow_seconds):
+                appended = load_bundle(link["dataset_id"], COLUMNAR_CACHE_DIR)
+                if appended is None:
+                    break
+                yield from feed(replay_graph(appended, start=link["start"]))
+                yield f"event: append\ndata: {json.dumps(link)}\n\n"
+
+        yield f"event: done\ndata: {json.dumps(counts)}\n\n"
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
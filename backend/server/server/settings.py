@@ -121,3 +121,43 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+
+
+# Binary columnar cache of uploaded transaction files (core.columnar_cache).
+# Least recently used bundles are removed beyond 8 GiB or after 7 days
+# unused (SMURF_PROOF_CACHE_MAX_BYTES / SMURF_PROOF_CACHE_MAX_AGE_SECONDS)
+
+COLUMNAR_CACHE_DIR = BASE_DIR / '.columnar_cache'
+
+
+# Concurrent background analyses (core.jobs) across all worker processes
+# sharing JOB_STATE_DIR; further jobs queue. Job records and progress live
+# there so any worker can answer a status poll.
+
+ANALYSIS_WORKERS = 2
+JOB_STATE_DIR = BASE_DIR / '.jobs'
+
+
+# Analysis results per dataset (core.result_store). The directory is
+# shared by every worker process; set it to '' for memory only. Expired
+# files, then the oldest ones beyond RESULT_STORE_DISK_MAX_BYTES, are
+# removed whenever a result is written.
+
+RESULT_STORE_DIR = BASE_DIR / '.result_store'
+RESULT_STORE_MAX_ENTRIES = 8
+RESULT_STORE_MAX_BYTES = 2 * 1024 ** 3
+RESULT_STORE_TTL_SECONDS = 60 * 60
+RESULT_STORE_DISK_MAX_BYTES = 8 * 1024 ** 3
+
+
+# Memoized pipeline phase results (core.phase_cache), keyed by content
+# and parameter hash. Files expire after a day and the directory is kept
+# under 4 GiB (SMURF_PROOF_PHASE_CACHE_TTL_SECONDS / _MAX_BYTES)
+
+PHASE_CACHE_DIR = BASE_DIR / '.phase_cache'
+
+
+# Appended dataset links (core.append_feed), so alert streams with
+# ?follow= on any worker receive transactions appended on another
+
+APPEND_FEED_DIR = BASE_DIR / '.append_feed'
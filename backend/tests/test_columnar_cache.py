@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+import numpy as np
+
+import core.columnar_cache as columnar_cache
+from core.graph_builder import (
+    load_transactions,
+    build_columnar_graph,
+    load_columnar_graph,
+)
+
+CSV_PATH = os.path.join(BASE_DIR, "data", "Refined_Ethereum_Transactions.csv")
+
+expected = build_columnar_graph(load_transactions(CSV_PATH))
+arrow_installed = columnar_cache.ARROW_AVAILABLE
+
+for use_arrow in sorted({False, arrow_installed}):
+    columnar_cache.ARROW_AVAILABLE = use_arrow
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        first, first_info = load_columnar_graph(CSV_PATH, cache_dir)
+        again, again_info = load_columnar_graph(CSV_PATH, cache_dir)
+
+        assert first_info["source"] == "csv"
+        assert again_info["source"] == "cache"
+
+        for name in ("src", "dst", "amount", "timestamp", "token_codes"):
+            assert np.array_equal(getattr(again, name), getattr(expected, name))
+        assert list(again.wallets) == list(expected.wallets)
+        assert list(again.token_types) == list(expected.token_types)
+
+        # load_transactions reads the bundle instead of the CSV
+        df = load_transactions(CSV_PATH, cache_dir=cache_dir)
+        assert build_columnar_graph(df).wallets.tolist() == expected.wallets.tolist()
+
+        print("arrow" if use_arrow else "npy  ",
+              "parse:", first_info["seconds"], "s  load:", again_info["seconds"], "s")
+
+columnar_cache.ARROW_AVAILABLE = arrow_installed
+
+# The cache is pruned to its age and byte budgets, least recently used first
+import time
+
+with tempfile.TemporaryDirectory() as cache_dir:
+    for digest in ("a", "b", "c"):
+        columnar_cache.save_bundle(expected, digest, cache_dir)
+    size = sum(e.stat().st_size for e in os.scandir(columnar_cache.bundle_dir("a", cache_dir)))
+
+    past = time.time() - 100
+    for age, digest in enumerate(("a", "b", "c")):
+        os.utime(columnar_cache.bundle_dir(digest, cache_dir), (past + age, past + age))
+    assert columnar_cache.load_bundle("a", cache_dir) is not None  # now the most recent
+
+    removed = columnar_cache.prune_bundles(cache_dir, max_bytes=2 * size, max_age_seconds=3600)
+    assert removed == ["b"]
+    assert columnar_cache.prune_bundles(cache_dir, max_bytes=10 * size, max_age_seconds=50) == ["c"]
+    assert columnar_cache.has_bundle("a", cache_dir)
+
+    # The bundle just written is never the one evicted
+    columnar_cache.save_bundle(expected, "d", cache_dir, max_bytes=size)
+    assert sorted(os.listdir(cache_dir)) == ["d"]
+    assert columnar_cache.load_bundle("a", cache_dir) is None
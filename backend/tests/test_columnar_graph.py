@@ -0,0 +1,90 @@
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+import networkx as nx
+
+from core.graph_builder import (
+    load_transactions,
+    build_columnar_graph,
+    build_transaction_graph,
+    stream_columnar_graph,
+    graph_summary,
+)
+
+CSV_PATH = os.path.join(BASE_DIR, "data", "Refined_Ethereum_Transactions.csv")
+
+df = load_transactions(CSV_PATH)
+cg = build_columnar_graph(df)
+
+# -------------------------------------------------
+# Reference: the original row-by-row builder
+# -------------------------------------------------
+reference = nx.DiGraph()
+for _, row in df.iterrows():
+    reference.add_edge(
+        row["Source_Wallet_ID"],
+        row["Dest_Wallet_ID"],
+        amount=row["Amount"],
+        timestamp=row["Timestamp"],
+        token_type=row["Token_Type"],
+    )
+
+G = build_transaction_graph(df)
+
+assert list(G.nodes()) == list(reference.nodes())
+assert list(G.edges(data=True)) == list(reference.edges(data=True))
+assert cg.nx_graph is cg.nx_graph
+
+# CSR groups every transaction under its source wallet
+indptr, edge_ids = cg.csr()
+assert indptr[-1] == cg.num_edges
+for node in range(cg.num_nodes):
+    assert (cg.src[cg.out_edges(node)] == node).all()
+    assert (cg.dst[cg.in_edges(node)] == node).all()
+
+# Chunked ingestion builds the same graph as a full load
+streamed = stream_columnar_graph(CSV_PATH, chunksize=3)
+assert list(streamed.wallets) == list(cg.wallets)
+assert (streamed.src == cg.src).all() and (streamed.dst == cg.dst).all()
+assert (streamed.timestamp == cg.timestamp).all()
+assert (streamed.amount == cg.amount).all()
+
+# A missing wallet id is rejected (pandas codes it -1, i.e. the last wallet)
+import tempfile
+
+broken = df.copy()
+broken.loc[4, "Dest_Wallet_ID"] = None
+broken.loc[7, "Source_Wallet_ID"] = float("nan")
+try:
+    build_columnar_graph(broken)
+    raise AssertionError("missing wallet id accepted")
+except ValueError as e:
+    assert "2 row(s): [4, 7]" in str(e)
+
+with tempfile.TemporaryDirectory() as tmp:
+    broken_csv = os.path.join(tmp, "broken.csv")
+    broken.to_csv(broken_csv, index=False)
+    try:
+        stream_columnar_graph(broken_csv, chunksize=3)
+        raise AssertionError("missing wallet id accepted")
+    except ValueError as e:
+        assert "row(s): [4]" in str(e)  # first failing chunk
+
+# So are a missing timestamp (NaT, i.e. INT64_MIN) and a missing token
+# (coded -1, i.e. the last token)
+for column, row in (("Timestamp", 2), ("Token_Type", 5)):
+    broken = df.copy()
+    broken[column] = broken[column].astype(object)
+    broken.loc[row, column] = None
+    try:
+        build_columnar_graph(broken)
+        raise AssertionError(f"missing {column} accepted")
+    except ValueError as e:
+        assert f"Missing {column} in 1 row(s): [{row}]" in str(e)
+
+print("Columnar Summary:", graph_summary(cg))
+print("NetworkX Summary:", graph_summary(G))
+print("Token types:", list(cg.token_types))
@@ -0,0 +1,60 @@
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+import networkx as nx
+import pandas as pd
+
+from core.graph_builder import load_transactions, build_columnar_graph
+from core.feature_extractor import extract_node_features, extract_edge_features
+
+CSV_PATH = os.path.join(BASE_DIR, "data", "Refined_Ethereum_Transactions.csv")
+
+df = load_transactions(CSV_PATH)
+graph = build_columnar_graph(df)
+store = graph.pairs
+
+# -------------------------------------------------
+# Pair store vs a MultiDiGraph of the same rows
+# -------------------------------------------------
+multi = nx.MultiDiGraph()
+for _, row in df.iterrows():
+    multi.add_edge(
+        row["Source_Wallet_ID"],
+        row["Dest_Wallet_ID"],
+        amount=row["Amount"],
+        timestamp=row["Timestamp"],
+    )
+
+assert store.pair_count.sum() == multi.number_of_edges()
+assert store.num_pairs == nx.DiGraph(multi).number_of_edges()
+
+for pair in range(store.num_pairs):
+    u = graph.wallets[store.pair_src[pair]]
+    v = graph.wallets[store.pair_dst[pair]]
+    parallel = multi.get_edge_data(u, v)
+
+    assert store.pair_count[pair] == len(parallel)
+    assert sorted(store.amounts(pair, graph.amount)) == sorted(
+        d["amount"] for d in parallel.values()
+    )
+    assert pd.Timestamp(store.pair_first_ts[pair]) == min(
+        d["timestamp"] for d in parallel.values()
+    )
+
+# -------------------------------------------------
+# Features count every transfer
+# -------------------------------------------------
+node_features = extract_node_features(graph)
+edge_features = extract_edge_features(graph)
+
+for wallet, feats in node_features.items():
+    assert feats["in_degree"] == multi.in_degree(wallet)
+    assert feats["out_degree"] == multi.out_degree(wallet)
+
+repeated = {k: v for k, v in edge_features.items() if v["tx_count"] > 1}
+
+print("Transactions:", int(store.pair_count.sum()), "Pairs:", store.num_pairs)
+print("Repeated transfers:", repeated)
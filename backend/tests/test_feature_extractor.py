@@ -5,7 +5,12 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(BASE_DIR)
 
 from core.graph_builder import load_transactions, build_transaction_graph
-from core.feature_extractor import extract_node_features, extract_edge_features
+from core.graph_builder import build_columnar_graph
+from core.feature_extractor import (
+    extract_node_features,
+    extract_edge_features,
+    extract_edge_feature_arrays,
+)
 from core.normalizer import min_max_normalize
 
 CSV_PATH = os.path.join(BASE_DIR, "data", "Refined_Ethereum_Transactions.csv")
@@ -27,3 +32,21 @@ print("Normalized Node Features:", norm_node_features[sample_node])
 
 print("\nSample Edge:", sample_edge)
 print("Normalized Edge Features:", norm_edge_features[sample_edge])
+
+# Dense matrix and dict view agree
+for wallet, feats in node_features.items():
+    row = node_features.matrix[node_features.index[wallet]]
+    assert [feats[c] for c in node_features.columns] == row.tolist()
+
+print("\nNode feature matrix:", node_features.matrix.shape)
+
+# Columnar edge arrays vs a brute-force scan per transaction
+cg = build_columnar_graph(df)
+arrays = extract_edge_feature_arrays(cg)
+for i in range(cg.num_edges):
+    out_ts = cg.timestamp[cg.src == cg.src[i]]
+    prev = out_ts[out_ts < cg.timestamp[i]]
+    expected = (cg.timestamp[i] - prev.max()) / 1e9 if len(prev) else 0.0
+    assert arrays["time_delta"][i] == expected
+
+print("Edge feature arrays:", {k: v.shape for k, v in arrays.items()})
@@ -16,7 +16,9 @@ from core.pattern_detector import (
 )
 from core.risk_scorer import compute_base_risk
 from core.gnn_preparer import prepare_gnn_data
-from core.gnn_cpu import run_gnn_inference
+import torch
+
+from core.gnn_cpu import SimpleRiskGNN, build_normalized_adjacency, run_gnn_inference
 
 CSV_PATH = os.path.join(BASE_DIR, "data", "Refined_Ethereum_Transactions.csv")
 
@@ -44,3 +46,158 @@ print("\n=== GNN Risk Refinement (CPU) ===")
 for i, risk in enumerate(gnn_risk[:5]):
     wallet = gnn_data["idx_to_wallet"][i]
     print(wallet, "→ GNN Risk:", round(float(risk), 3))
+
+# Scatter and sparse-adjacency message passing agree with a per-edge loop
+X = torch.tensor(gnn_data["X"], dtype=torch.float32)
+edge_index = torch.tensor(gnn_data["edge_index"], dtype=torch.long)
+model = SimpleRiskGNN(X.shape[1]).eval()
+
+with torch.no_grad():
+    agg = torch.zeros_like(X)
+    deg = torch.zeros(X.size(0), 1)
+    for s, d in edge_index.t().tolist():
+        agg[d] += X[s]
+        deg[d] += 1
+    expected = torch.sigmoid(model.linear(agg / deg.clamp(min=1))).squeeze()
+
+    scatter = model(X, edge_index)
+    sparse = model(X, adj=build_normalized_adjacency(edge_index, X.size(0)))
+
+assert torch.allclose(scatter, expected, atol=1e-6)
+assert torch.allclose(sparse, expected, atol=1e-6)
+
+# Columnar inputs match the nx.DiGraph path
+import tempfile
+
+import numpy as np
+
+from core.graph_builder import build_columnar_graph
+from core.feature_extractor import extract_node_features as columnar_node_features
+from core.gnn_cpu import csr_adjacency, load_model, run_gnn_refinement, save_model
+
+graph = build_columnar_graph(df)
+table = min_max_normalize(columnar_node_features(graph))
+columnar_data = prepare_gnn_data(graph, table, base_risks)
+nx_data = prepare_gnn_data(graph.to_networkx(), table, base_risks)
+
+assert np.array_equal(columnar_data["X"], nx_data["X"])
+assert np.array_equal(np.stack(columnar_data["edge_index"]), nx_data["edge_index"])
+
+# Risk columns can come from prebuilt score arrays; edge features from a
+# FeatureTable or any {(src, dst): {...}} mapping
+from core.risk_table import score_columns
+
+scored = prepare_gnn_data(graph, table, base_risks, scores=score_columns(base_risks))
+assert np.array_equal(scored["X"], columnar_data["X"])
+
+pair_feats = extract_edge_features(graph)
+from_table = prepare_gnn_data(graph, table, base_risks, pair_feats)["edge_attr"]
+from_dict = prepare_gnn_data(graph, table, base_risks, dict(pair_feats.items()))["edge_attr"]
+assert from_table.shape == (graph.num_pairs, 3)
+assert np.array_equal(from_table, from_dict)
+assert np.array_equal(from_table, prepare_gnn_data(graph.to_networkx(), table, base_risks, pair_feats)["edge_attr"])
+
+# Normalizing while writing into a preallocated buffer matches normalizing first
+raw = columnar_node_features(graph)
+buffer = np.empty_like(columnar_data["X"])
+direct = prepare_gnn_data(graph, raw, base_risks, normalize=True, out=buffer)
+assert direct["X"] is buffer
+assert np.allclose(buffer, columnar_data["X"], atol=1e-6)
+
+# The pair CSR arrays are handed to torch as is and give the same operator
+pair_index = torch.from_numpy(np.stack(columnar_data["edge_index"]))
+adj = csr_adjacency(*columnar_data["in_csr"], graph.num_nodes)
+assert np.shares_memory(adj.col_indices().numpy(), columnar_data["in_csr"][1])
+assert torch.allclose(
+    adj.to_dense(), build_normalized_adjacency(pair_index, graph.num_nodes).to_dense()
+)
+
+# Trained weights are loaded once and the model stays resident
+import warnings
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = save_model(model, os.path.join(tmp, "gnn.pt"), target="labels")
+    resident, digest = load_model(path)
+    assert load_model(path)[0] is resident
+    assert torch.equal(resident.linear.weight, model.linear.weight)
+    assert load_model(os.path.join(tmp, "missing.pt")) is None
+
+    # Nothing is served unless configured, nor weights fit to base_risk
+    if "GNN_WEIGHTS_PATH" not in os.environ:
+        assert load_model() is None
+    echo = save_model(model, os.path.join(tmp, "echo.pt"), target="base_risk")
+    with warnings.catch_warnings(record=True):
+        warnings.simplefilter("always")
+        assert load_model(echo) is None
+        assert load_model(save_model(model, os.path.join(tmp, "bare.pt"))) is None
+
+    gnn_risks = run_gnn_refinement(graph, columnar_node_features(graph), base_risks, model=resident)
+
+with torch.no_grad():
+    expected = model(torch.tensor(columnar_data["X"]), pair_index)
+assert list(gnn_risks) == graph.wallets.tolist()
+assert np.allclose(list(gnn_risks.values()), expected.numpy(), atol=1e-6)
+
+# Mini-batch inference matches full-batch, whatever the batch size
+from core.gnn_cpu import node_batches, run_gnn_minibatch
+
+full = run_gnn_inference(columnar_data, model=model)
+indptr = columnar_data["in_csr"][0]
+
+for max_edges in (1, 7, 1_000_000):
+    batches = node_batches(indptr, max_edges)
+    assert batches[0][0] == 0 and batches[-1][1] == graph.num_nodes
+    assert all(a[1] == b[0] for a, b in zip(batches, batches[1:]))
+    assert all(
+        stop - start == 1 or indptr[stop] - indptr[start] <= max_edges
+        for start, stop in batches
+    )
+
+    mini = run_gnn_minibatch(columnar_data, model=model, max_edges=max_edges, num_workers=4)
+    assert np.allclose(mini, full, atol=1e-6)
+
+# nx inputs (no CSR) and a memory-mapped X
+with tempfile.TemporaryDirectory() as tmp:
+    mapped = np.lib.format.open_memmap(
+        os.path.join(tmp, "X.npy"), mode="w+", dtype=np.float32, shape=nx_data["X"].shape
+    )
+    mapped[:] = nx_data["X"]
+    mini = run_gnn_minibatch({**nx_data, "X": mapped}, model=model, max_edges=5)
+    assert np.allclose(mini, run_gnn_inference(nx_data, model=model), atol=1e-6)
+    del mapped
+
+# Refinement switches to mini-batches above the edge budget
+batched = run_gnn_refinement(graph, columnar_node_features(graph), base_risks, model=model, max_edges=3)
+assert np.allclose(list(batched.values()), list(gnn_risks.values()), atol=1e-6)
+
+# TorchScript / int8 deployments stay within tolerance of eager scores
+from core.gnn_cpu import deploy_model, export_model, gnn_runtime, load_exported
+
+scripted = deploy_model(model, "script")
+quantized = deploy_model(model, "quantized")
+assert np.allclose(run_gnn_inference(columnar_data, model=scripted), full, atol=1e-6)
+assert np.allclose(run_gnn_inference(nx_data, model=scripted), run_gnn_inference(nx_data, model=model), atol=1e-6)
+assert np.allclose(run_gnn_minibatch(columnar_data, model=scripted, max_edges=7), full, atol=1e-6)
+assert np.abs(run_gnn_inference(columnar_data, model=quantized) - full).max() < 1e-2
+
+try:
+    gnn_runtime("onnx")
+    raise AssertionError("unknown runtime accepted")
+except ValueError:
+    pass
+
+with tempfile.TemporaryDirectory() as tmp:
+    exported = load_exported(export_model(model, os.path.join(tmp, "gnn.ts"), quantize=True))
+    assert np.allclose(
+        run_gnn_inference(columnar_data, model=exported),
+        run_gnn_inference(columnar_data, model=quantized),
+        atol=1e-6,
+    )
+
+    # The resident model is deployed per runtime, with its own digest
+    path = save_model(model, os.path.join(tmp, "gnn.pt"), target="labels")
+    eager_model, eager_digest = load_model(path, runtime="eager")
+    script_model, script_digest = load_model(path, runtime="script")
+    assert script_digest == f"{eager_digest}:script"
+    assert isinstance(script_model, torch.jit.ScriptModule)
+    assert load_model(path, runtime="script")[0] is script_model
@@ -0,0 +1,136 @@
+import os, sys, tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+import numpy as np
+
+from benchmarks.synthetic import make_transactions
+from core.graph_view import ego_subgraph, graph_arrays, graph_page
+from core.pipeline import run_full_analysis
+
+rows = make_transactions(4000, n_wallets=600, seed=3)
+# A few non-wallet entities and a second token
+rows.loc[:199, "Target_Wallet_ID"] = [f"exchange_{i % 7}" for i in range(200)]
+rows.loc[::5, "Token_Type"] = "USDT"
+
+with tempfile.TemporaryDirectory() as tmp:
+    csv_path = os.path.join(tmp, "tx.csv")
+    rows.to_csv(csv_path, index=False)
+    results = run_full_analysis(csv_path, cache_dir=tmp, memoize=False)
+
+G = results["graph"]
+base_risks = results["base_risks"]
+patterns = results["patterns"]
+
+# Arrays are built once per analysis
+assert graph_arrays(results) is graph_arrays(results)
+
+# No arguments: the whole graph, as the old per-node walk produced it
+full = graph_page(results)
+assert [n["id"] for n in full["nodes"]] == G.wallets.tolist()
+assert len(full["edges"]) == G.num_pairs
+for node in full["nodes"][:200]:
+    info = base_risks.get(node["id"], {})
+    assert node["risk"] == info.get("base_risk", 0.0)
+    assert node["is_involved"] == any(
+        v for k, v in patterns[node["id"]].items() if not k.endswith("_reason")
+    )
+    assert node["entity_type"] == ("wallet" if node["id"].startswith("0x") else "service")
+    assert node["reasons"] == info.get("reasons", [])
+
+# final_risk matches /api/final-risk/ (risk_columns) per wallet
+final = dict(zip(results["risk_columns"]["id"].tolist(), results["risk_columns"]["final_risk"].tolist()))
+assert all(node["final_risk"] == final.get(node["id"], 0.0) for node in full["nodes"])
+
+# Filters match a brute-force scan
+pair_tokens = {}
+for src, dst, token in zip(
+    G.wallets[G.src].tolist(), G.wallets[G.dst].tolist(),
+    G.token_types[G.token_codes].tolist(),
+):
+    pair_tokens.setdefault((src, dst), set()).add(token)
+
+def risk(w):
+    return base_risks.get(w, {}).get("base_risk", 0.0)
+
+page = graph_page(results, min_risk=0.3, patterns=["fan_out", "mule_wallet"])
+expected = [
+    w for w in G.wallets.tolist()
+    if risk(w) >= 0.3 and (patterns[w]["fan_out"] or patterns[w]["mule_wallet"])
+]
+assert [n["id"] for n in page["nodes"]] == expected
+
+page = graph_page(results, entity_type="service", token_type="USDT")
+usdt = {w for (u, v), ts in pair_tokens.items() if "USDT" in ts for w in (u, v)}
+expected = [w for w in G.wallets.tolist() if not w.startswith("0x") and w in usdt]
+assert [n["id"] for n in page["nodes"]] == expected
+assert all("USDT" in pair_tokens[(e["source"], e["target"])] for e in page["edges"])
+
+# Top-K is risk order; pages slice it; edges stay inside the page
+top = graph_page(results, top_k=50)
+ranked = sorted(G.wallets.tolist(), key=lambda w: (-risk(w), G.wallet_index[w]))[:50]
+assert [n["id"] for n in top["nodes"]] == ranked
+
+page2 = graph_page(results, top_k=50, page=2, page_size=20)
+assert [n["id"] for n in page2["nodes"]] == ranked[20:40]
+assert page2["page"]["total_nodes"] == 50
+
+ids = set(ranked[20:40])
+expected_edges = sorted(p for p in pair_tokens if p[0] in ids and p[1] in ids)
+assert sorted((e["source"], e["target"]) for e in page2["edges"]) == expected_edges
+
+# Projection
+slim = graph_page(results, top_k=5, fields=["risk", "id"], edge_fields=["source", "target"])
+assert all(list(n) == ["id", "risk"] for n in slim["nodes"])
+assert all(list(e) == ["source", "target"] for e in slim["edges"])
+
+for bad in ({"patterns": ["nope"]}, {"entity_type": "bank"}, {"fields": ["x"]}):
+    try:
+        graph_page(results, **bad)
+        raise AssertionError(f"expected ValueError for {bad}")
+    except ValueError:
+        pass
+
+# Ego subgraph: uncapped, it is the undirected k-hop ball
+neighbors = {}
+for u, v in pair_tokens:
+    neighbors.setdefault(u, set()).add(v)
+    neighbors.setdefault(v, set()).add(u)
+
+center = ranked[0]
+hop_of = {center: 0}
+frontier = [center]
+for hop in (1, 2):
+    frontier = sorted({n for w in frontier for n in neighbors[w]} - set(hop_of))
+    hop_of.update((n, hop) for n in frontier)
+
+ego = ego_subgraph(results, center, hops=2, max_nodes=10 ** 6, max_degree=10 ** 6)
+assert {n["id"]: n["hop"] for n in ego["nodes"]} == hop_of
+assert not ego["truncated"]
+assert sorted((e["source"], e["target"]) for e in ego["edges"]) == sorted(
+    p for p in pair_tokens if p[0] in hop_of and p[1] in hop_of
+)
+for node in ego["nodes"]:
+    assert node["degree"] == sum((u == node["id"]) + (v == node["id"]) for u, v in pair_tokens)
+    assert set(node["patterns"]) == {
+        k for k, v in patterns[node["id"]].items() if v is True
+    }
+
+# Hubs keep only their highest-risk neighbors; max_nodes bounds the result
+hub = max(neighbors, key=lambda w: len(neighbors[w]))
+capped = ego_subgraph(results, hub, hops=1, max_degree=5)
+assert capped["truncated"] and capped["nodes"][0]["truncated"]
+assert {n["id"] for n in capped["nodes"][1:]} == set(
+    sorted(neighbors[hub], key=lambda w: (-risk(w), G.wallet_index[w]))[:5]
+)
+assert len(ego_subgraph(results, center, hops=3, max_nodes=40)["nodes"]) <= 40
+
+try:
+    ego_subgraph(results, "0xnot-a-wallet")
+    raise AssertionError("expected KeyError")
+except KeyError:
+    pass
+
+print("\n=== Graph Page ===")
+print(top["page"], top["nodes"][:3])
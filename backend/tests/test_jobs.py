@@ -0,0 +1,96 @@
+import os, sys, tempfile, time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from core.jobs import AnalysisJobs
+from core.pipeline import PHASES, run_full_analysis
+
+CSV_PATH = os.path.join(BASE_DIR, "data", "Refined_Ethereum_Transactions.csv")
+
+# Spawned workers re-import this script as __mp_main__; only the parent runs it
+if __name__ != "__mp_main__":
+    state_dir = tempfile.mkdtemp()
+    jobs = AnalysisJobs(max_workers=1, state_dir=state_dir)
+
+    job_id = jobs.submit(CSV_PATH, key="sample")
+    bad_id = jobs.submit(os.path.join(BASE_DIR, "data", "missing.csv"))
+
+    assert jobs.status("unknown") is None
+    assert jobs.status(job_id)["state"] in ("queued", "running", "done")
+
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if all(jobs.status(j)["state"] in ("done", "failed") for j in (job_id, bad_id)):
+            break
+        time.sleep(0.1)
+
+    status = jobs.status(job_id)
+    print("\n=== Analysis Job ===")
+    print(status)
+
+    assert status["state"] == "done"
+    assert list(status["phases"]) == list(PHASES)
+    assert all(p["state"] in ("done", "cached", "skipped") for p in status["phases"].values())
+
+    results = jobs.result(job_id)
+    expected = run_full_analysis(CSV_PATH)
+    assert results["graph_summary"] == expected["graph_summary"]
+    assert results["base_risks"] == expected["base_risks"]
+
+    failed = jobs.status(bad_id)
+    assert failed["state"] == "failed" and failed["error"]
+
+    # Any process sharing the state directory sees the same records
+    other = AnalysisJobs(max_workers=1, state_dir=state_dir)
+    assert other.status(job_id) == {**status, "elapsed_seconds": other.status(job_id)["elapsed_seconds"]}
+    assert other.summary(job_id)["graph_summary"] == expected["graph_summary"]
+    assert other.latest("sample") == job_id and other.latest("unknown") is None
+    assert other.result(job_id) is None  # results stay with the submitting process
+
+    # Worker slots are shared too: while this process holds the only
+    # slot, the other instance's job stays queued
+    from core.jobs import FCNTL_AVAILABLE, worker_slot
+
+    if FCNTL_AVAILABLE:
+        with worker_slot(state_dir, 1):
+            waiting = other.submit(CSV_PATH)
+            time.sleep(3)
+            assert other.status(waiting)["state"] == "queued"
+
+        deadline = time.time() + 120
+        while time.time() < deadline and other.status(waiting)["state"] != "done":
+            time.sleep(0.1)
+        assert other.status(waiting)["state"] == "done"
+    other.shutdown()
+
+    # on_done receives the results; the job keeps only a summary
+    stored = {}
+
+    def store(results):
+        stored["results"] = results
+
+    def broken_store(results):
+        raise OSError("disk full")
+
+    handed_id = jobs.submit(CSV_PATH, on_done=store)
+    broken_id = jobs.submit(CSV_PATH, on_done=broken_store)
+
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if all(jobs.status(j)["state"] in ("done", "failed") for j in (handed_id, broken_id)):
+            break
+        time.sleep(0.1)
+
+    assert jobs.status(handed_id)["state"] == "done"
+    assert stored["results"]["base_risks"] == expected["base_risks"]
+    assert jobs.result(handed_id) is None
+    assert jobs.jobs[handed_id]["future"] is None
+    assert jobs.summary(handed_id)["graph_summary"] == expected["graph_summary"]
+
+    # A failing hook fails the job instead of reporting success
+    broken = jobs.status(broken_id)
+    assert broken["state"] == "failed" and "disk full" in broken["error"]
+    assert jobs.summary("unknown") is None
+
+    jobs.shutdown()
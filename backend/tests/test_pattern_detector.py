@@ -15,6 +15,8 @@ from core.pattern_detector import (
     detect_peeling_chains,
     detect_mule_wallets,
     aggregate_patterns,
+    detect_patterns,
+    resolve_thresholds,
 )
 
 # -------------------------------------------------
@@ -67,3 +69,117 @@ print(f"Suspicious wallets found : {suspicious_count}")
 
 if suspicious_count == 0:
     print("Note: Dataset is mostly benign (expected for real Ethereum data).")
+
+from core.graph_search import SCIPY_AVAILABLE
+
+# -------------------------------------------------
+# Bit-packed rule engine == dict detectors
+# -------------------------------------------------
+matrix = detect_patterns(G, node_features, edge_features)
+assert dict(matrix.items()) == patterns
+assert sorted(matrix.flagged_wallets()) == sorted(
+    w for w, p in patterns.items()
+    if any(v is True for k, v in p.items() if not k.endswith("_reason"))
+)
+
+# -------------------------------------------------
+# Convergence matches the original shortest-path detector
+# -------------------------------------------------
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from core.graph_builder import build_columnar_graph
+from core.graph_search import downstream_reach, downstream_reach_sparse
+from core.pattern_detector import multi_hop_convergence_mask
+
+
+def legacy_convergence(G, max_hops=3):
+    results = {}
+    for node in G.nodes():
+        paths = nx.single_source_shortest_path(G, node, cutoff=max_hops)
+        endpoints = [path[-1] for path in paths.values() if len(path) > 2]
+        results[node] = (
+            len(endpoints),
+            len(endpoints) >= 3 and len(set(endpoints)) < len(endpoints),
+        )
+    return results
+
+
+def edge_graph(edges):
+    return build_columnar_graph(pd.DataFrame({
+        "Source_Wallet_ID": [u for u, _ in edges],
+        "Dest_Wallet_ID": [v for _, v in edges],
+        "Timestamp": pd.date_range("2025-01-01", periods=len(edges), freq="h"),
+        "Amount": 1.0,
+        "Token_Type": "ETH",
+    }))
+
+
+rng = np.random.default_rng(7)
+random_edges = [
+    (f"w{u}", f"w{v}") for u, v in rng.integers(0, 60, size=(240, 2)).tolist()
+]
+cases = {
+    # Two routes into d, but one shortest path per endpoint
+    "diamond": [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d"), ("d", "e"), ("d", "f")],
+    # Cycles back to the source and repeated nodes within max_hops
+    "cycle": [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("d", "b"), ("b", "e")],
+    "self_loop": [("a", "a"), ("a", "b"), ("b", "b"), ("b", "c"), ("c", "d")],
+    "parallel": [("a", "b"), ("a", "b"), ("b", "c"), ("b", "c"), ("c", "d"), ("b", "e")],
+    # Distances beyond max_hops are cut off
+    "chain": [(f"n{i}", f"n{i + 1}") for i in range(8)],
+    "random": random_edges,
+}
+
+for name, edges in cases.items():
+    graph = edge_graph(edges)
+    indptr, successors = graph.pairs.out_adjacency()
+
+    for max_hops in (2, 3, 4):
+        legacy = legacy_convergence(graph.to_networkx(), max_hops)
+        order = graph.wallets.tolist()
+        expected_reach = [legacy[w][0] for w in order]
+        expected_flags = [legacy[w][1] for w in order]
+
+        reach = downstream_reach(indptr, successors, max_hops, batch_size=3)
+        assert reach.tolist() == expected_reach, (name, max_hops)
+
+        # Batches over the key budget are split down to single sources
+        small = downstream_reach(indptr, successors, max_hops, max_keys=4)
+        assert small.tolist() == expected_reach, (name, max_hops)
+        if SCIPY_AVAILABLE:
+            sparse = downstream_reach_sparse(
+                graph.num_nodes, graph.pairs.pair_src, graph.pairs.pair_dst, max_hops
+            )
+            assert sparse.tolist() == expected_reach, (name, max_hops)
+
+        # The original rule never fires
+        mask = multi_hop_convergence_mask(graph, max_hops)
+        assert mask.tolist() == expected_flags == [False] * graph.num_nodes, (name, max_hops)
+
+        subset = np.array([0, graph.num_nodes - 1])
+        assert (
+            multi_hop_convergence_mask(graph, max_hops, nodes=subset).tolist()
+            == [expected_flags[i] for i in subset.tolist()]
+        )
+
+# Empty inputs give empty results, as the dict detectors always did
+assert detect_fan_out({}) == detect_fan_in({}) == detect_mule_wallets({}) == {}
+assert detect_peeling_chains({}) == {}
+
+# Threshold overrides must name known patterns and thresholds, with numbers
+assert resolve_thresholds({"fan_out": {"out_thresh": 0.5}})["fan_out"]["out_thresh"] == 0.5
+for bad in (
+    {"fan_outs": {}},
+    {"fan_out": {"out_threshold": 0.5}},
+    {"fan_out": {"out_thresh": "0.5"}},
+    {"fan_out": {"out_thresh": True}},
+    {"fan_out": 0.5},
+):
+    try:
+        resolve_thresholds(bad)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"accepted {bad}")
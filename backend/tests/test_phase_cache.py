@@ -0,0 +1,61 @@
+import os, sys, tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from core import phase_cache
+from core.pipeline import analysis_keys, run_full_analysis
+
+CSV_PATH = os.path.join(BASE_DIR, "data", "Refined_Ethereum_Transactions.csv")
+
+with tempfile.TemporaryDirectory() as tmp:
+    def analyze(**kwargs):
+        return run_full_analysis(CSV_PATH, phase_cache_dir=tmp, **kwargs)
+
+    first = analyze()
+    assert first["phase_cache"]["phases"]["features"] == "miss"
+
+    # Same content, same parameters: nothing is recomputed
+    again = analyze()
+    phases = again["phase_cache"]["phases"]
+    assert all(phases[p] == "hit" for p in ("features", "patterns", "risk"))
+
+    # The analysis id is the risk key of the dataset + overrides
+    assert first["analysis_id"] == analysis_keys(first["ingest"]["dataset_id"])["risk"]
+
+    # New weights: only risk is recomputed
+    weights = (0.25, 0.25, 0.25, 0.25)
+    reweighted = analyze(weights=weights)
+    phases = reweighted["phase_cache"]["phases"]
+    assert phases["patterns"] == "hit" and phases["risk"] == "miss"
+    assert reweighted["analysis_id"] != first["analysis_id"]
+
+    # New threshold: patterns and everything downstream
+    thresholds = {"fan_out": {"out_thresh": 0.5}}
+    rethresholded = analyze(thresholds=thresholds)
+    phases = rethresholded["phase_cache"]["phases"]
+    assert phases["features"] == "hit"
+    assert phases["patterns"] == "miss" and phases["risk"] == "miss"
+
+    # A fresh process reads the disk layer; results match a cold run
+    phase_cache._CACHES.clear()
+    cold = run_full_analysis(CSV_PATH, memoize=False, weights=weights)
+    warm = analyze(weights=weights)
+    assert warm["phase_cache"]["misses"] == 0
+    assert warm["base_risks"] == cold["base_risks"]
+    assert dict(warm["patterns"].items()) == dict(cold["patterns"].items())
+    assert dict(warm["node_features"].items()) == dict(cold["node_features"].items())
+    assert warm["node_features"].keys_array is warm["graph"].wallets
+
+# The disk layer expires and is bounded (see core.result_store.DiskBackend)
+with tempfile.TemporaryDirectory() as tmp:
+    bounded = phase_cache.PhaseCache(tmp, disk_max_bytes=1)
+    bounded.run("features", "a", lambda: list(range(100)))
+    bounded.run("features", "b", lambda: list(range(100)))
+    assert os.listdir(tmp) == ["b.result"]
+
+    expired = phase_cache.PhaseCache(tmp, ttl_seconds=-1)
+    assert expired.store.backend.sweep() == 1
+
+print("\n=== Phase Cache ===")
+print(warm["phase_cache"])
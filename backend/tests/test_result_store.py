@@ -0,0 +1,91 @@
+import os, sys, tempfile, time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+import numpy as np
+
+from core.pipeline import run_full_analysis
+from core.result_store import DiskBackend, ResultStore, estimate_nbytes
+
+CSV_PATH = os.path.join(BASE_DIR, "data", "Refined_Ethereum_Transactions.csv")
+
+results = run_full_analysis(CSV_PATH)
+
+# LRU by entry count
+store = ResultStore(max_entries=2)
+store.put("a", 1)
+store.put("b", 2)
+store.get("a")
+store.put("c", 3)
+assert store.get("b") is None
+assert store.get("a") == 1 and store.get("c") == 3
+
+# Byte budget: the newest entry stays even if it alone is over budget
+array = np.zeros(1000)
+store = ResultStore(max_bytes=array.nbytes * 2)
+store.put("x", array)
+store.put("y", array.copy())
+store.put("z", array.copy())
+assert store.get("x") is None and store.get("z") is not None
+assert store.stats()["nbytes"] <= array.nbytes * 2
+
+# Bytes added next to an entry later (e.g. cached bodies) count too
+store.add_nbytes("z", array.nbytes)
+assert store.get("y") is None and store.get("z") is not None
+assert store.stats()["nbytes"] == array.nbytes * 2
+store.add_nbytes("gone", 10 ** 9)
+assert store.stats()["nbytes"] == array.nbytes * 2
+
+# TTL
+store = ResultStore(ttl_seconds=0.05)
+store.put("a", 1)
+time.sleep(0.1)
+assert store.get("a") is None
+
+assert estimate_nbytes(results) >= results["graph"].src.nbytes
+
+# Shared disk backend: a second store (another worker) sees the entry
+with tempfile.TemporaryDirectory() as tmp:
+    ResultStore(backend=DiskBackend(tmp)).put("dataset", results)
+    loaded = ResultStore(backend=DiskBackend(tmp)).get("dataset")
+
+    graph = loaded["graph"]
+    assert np.array_equal(graph.src, results["graph"].src)
+    assert list(graph.wallets) == list(results["graph"].wallets)
+    assert loaded["base_risks"] == results["base_risks"]
+    assert dict(loaded["patterns"].items()) == dict(results["patterns"].items())
+    assert dict(loaded["node_features"].items()) == dict(results["node_features"].items())
+
+    # Array columns are memory-mapped, not copied
+    assert not graph.src.flags.writeable
+
+    del graph, loaded
+
+    # Expired files are dropped
+    assert DiskBackend(tmp, ttl_seconds=-1).load("dataset") is None
+    assert not os.path.exists(os.path.join(tmp, "dataset.result"))
+
+# Disk budget: saves sweep expired and oldest files, never the new one
+with tempfile.TemporaryDirectory() as tmp:
+    payload = np.zeros(1024, dtype=np.uint8)
+    disk = DiskBackend(tmp, max_bytes=3000)
+    now = time.time()
+    for i, key in enumerate(("a", "b", "c")):
+        disk.save(key, payload)
+        os.utime(os.path.join(tmp, f"{key}.result"), (now - 10 + i, now - 10 + i))
+    assert disk.load("a") is None and disk.load("b") is not None
+    assert disk.load("c") is not None
+
+    # An entry larger than the budget is still kept
+    DiskBackend(tmp, max_bytes=1).save("big", payload)
+    assert sorted(os.listdir(tmp)) == ["big.result"]
+
+    # Expired entries go on the next save (or sweep) even under budget
+    DiskBackend(tmp, ttl_seconds=None).save("d", payload)
+    os.utime(os.path.join(tmp, "big.result"), (0, 0))
+    assert DiskBackend(tmp).sweep() == 1
+    assert sorted(os.listdir(tmp)) == ["d.result"]
+
+print("\n=== Result Store ===")
+print(store.stats())
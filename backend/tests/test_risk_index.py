@@ -0,0 +1,71 @@
+import os, sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+import numpy as np
+
+from core.risk_index import INDEX_FIELDS, RiskIndex, risk_index
+from core.risk_table import RISK_COMPONENTS
+
+rng = np.random.default_rng(7)
+
+# Coarse scores, so ties are common
+base_risks = {
+    f"0x{i:040x}": {
+        "base_risk": round(float(rng.integers(0, 20)) / 20, 3),
+        **{c: round(float(rng.integers(0, 5)) / 4, 3) for c in RISK_COMPONENTS},
+        "reasons": [],
+    }
+    for i in range(2000)
+}
+gnn_risks = {w: float(rng.random()) for w in list(base_risks)[::3]}
+results = {"base_risks": base_risks, "gnn_risks": gnn_risks}
+
+index = risk_index(results)
+assert risk_index(results) is index
+columns = index.columns
+ids = columns["id"].tolist()
+
+for field in INDEX_FIELDS:
+    values = columns[field].tolist()
+
+    # Highest first, ties in base_risks order
+    ranked = sorted(range(len(ids)), key=lambda i: (-values[i], i))
+    assert index.top_k(field, 25).tolist() == ranked[:25]
+    assert index.top_k(field, 10 ** 6).tolist() == ranked
+
+    for low, high in ((0.5, None), (None, 0.25), (0.25, 0.75), (0.8, 0.2)):
+        expected = [
+            i for i in ranked
+            if (low is None or values[i] >= low) and (high is None or values[i] <= high)
+        ]
+        assert index.range(field, low, high).tolist() == expected
+        assert index.count(field, low, high) == len(expected)
+
+    for i in (0, 17, 1999):
+        info = index.rank(field, ids[i])
+        assert info["score"] == values[i]
+        assert info["rank"] == 1 + sum(v > values[i] for v in values)
+        assert ranked[info["position"] - 1] == i
+
+for bad in (lambda: index.top_k("risk", 3), lambda: index.range("gnn", 0.1)):
+    try:
+        bad()
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+
+try:
+    index.rank("base_risk", "0xunknown")
+    raise AssertionError("expected KeyError")
+except KeyError:
+    pass
+
+# New scores (e.g. after an append) get a new index
+results["base_risks"] = dict(base_risks)
+assert risk_index(results) is not index
+
+print("\n=== Top Final Risk ===")
+for row in index.top_k("final_risk", 5).tolist():
+    print(ids[row], columns["final_risk"][row])
@@ -1,6 +1,8 @@
 import os
 import sys
 
+import networkx as nx
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.append(BASE_DIR)
 
@@ -15,7 +17,9 @@ from core.pattern_detector import (
     detect_mule_wallets,
     aggregate_patterns,
 )
-from core.risk_scorer import compute_base_risk
+from core.risk_index import RiskIndex
+from core.risk_scorer import compute_base_risk, compute_proximity_scores
+from core.risk_table import risk_columns
 
 CSV_PATH = os.path.join(BASE_DIR, "data", "Refined_Ethereum_Transactions.csv")
 
@@ -37,12 +41,19 @@ base_risks = compute_base_risk(G, node_feats, patterns)
 
 print("\n=== Phase 4: Base Risk Scores ===")
 
-for wallet, data in sorted(
-    base_risks.items(),
-    key=lambda x: x[1]["base_risk"],
-    reverse=True
-)[:5]:
+index = RiskIndex(risk_columns({"base_risks": base_risks}))
+
+for wallet in index.ids[index.top_k("base_risk", 5)].tolist():
+    data = base_risks[wallet]
     print(f"\nWallet: {wallet}")
     print("Base Risk:", data["base_risk"])
     for r in data["reasons"]:
         print("  -", r)
+
+# Multi-source BFS proximity == nearest suspicious wallet within 3 hops
+suspicious = list(G.nodes())[::4]
+scores = compute_proximity_scores(G, suspicious, max_hops=3)
+for i, wallet in enumerate(G.nodes()):
+    reachable = nx.single_source_shortest_path_length(G, wallet, cutoff=3)
+    hops = [reachable[s] for s in suspicious if s in reachable]
+    assert scores[i] == (1.0 / (min(hops) + 1) if hops else 0.0)
@@ -0,0 +1,101 @@
+import os, sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+from core.risk_table import (
+    FINAL_RISK_FIELDS,
+    RISK_SCORE_FIELDS,
+    export_rows,
+    risk_columns,
+    risk_records,
+    score_columns,
+)
+
+base_risks = {
+    "0xaaa": {"base_risk": 0.62, "structural_risk": 1.0, "flow_risk": 0.5,
+              "temporal_risk": 0.2, "proximity_risk": 0.1, "reasons": ["a"]},
+    "0xbbb": {"base_risk": 0.0, "structural_risk": 0.0, "flow_risk": 0.0,
+              "temporal_risk": 0.0, "proximity_risk": 0.0, "reasons": []},
+    "exchange": {"base_risk": 0.4, "reasons": ["b"]},
+}
+gnn_risks = {"0xaaa": 0.91234}
+results = {"base_risks": base_risks, "gnn_risks": gnn_risks}
+
+columns = risk_columns(results)
+assert risk_columns(results) is columns
+assert risk_columns({"base_risks": base_risks}) is not columns
+
+# Without GNN scores the columns stay memoized too
+no_gnn = {"base_risks": base_risks, "gnn_risks": None}
+assert risk_columns(no_gnn) is risk_columns(no_gnn)
+
+# Prebuilt score arrays of the same base_risks are reused
+seeded = {"base_risks": base_risks, "gnn_risks": gnn_risks,
+          "risk_columns": score_columns(base_risks)}
+reused = risk_columns(seeded)
+assert reused["id"] is seeded["risk_columns"]["id"]
+assert reused["final_risk"].tolist() == columns["final_risk"].tolist()
+
+# Same rows the endpoints used to build by walking the dicts
+ALPHA = 0.6
+expected_final = []
+for wallet, info in base_risks.items():
+    base = info.get("base_risk", 0.0)
+    gnn = gnn_risks.get(wallet, base)
+    final = round(ALPHA * base + (1 - ALPHA) * gnn, 3)
+    expected_final.append({
+        "id": wallet,
+        "base_risk": base,
+        "gnn_risk": round(gnn, 3),
+        "final_risk": final,
+        "delta": round(final - base, 3),
+        "reasons": info.get("reasons", []),
+    })
+assert risk_records(columns, FINAL_RISK_FIELDS) == expected_final
+
+expected_scores = [
+    {
+        "id": wallet,
+        "base_risk": info.get("base_risk", 0.0),
+        "structural_risk": info.get("structural_risk", 0.0),
+        "flow_risk": info.get("flow_risk", 0.0),
+        "temporal_risk": info.get("temporal_risk", 0.0),
+        "proximity_risk": info.get("proximity_risk", 0.0),
+        "is_risky": info.get("base_risk", 0.0) >= 0.5,
+        "entity_type": "wallet" if wallet.startswith("0x") else "service",
+        "reasons": info.get("reasons", []),
+    }
+    for wallet, info in base_risks.items()
+]
+assert risk_records(columns, RISK_SCORE_FIELDS) == expected_scores
+
+# Columnar shape carries the same values; rows can be selected
+flat = risk_records(columns, RISK_SCORE_FIELDS, columnar=True)
+assert list(flat) == list(RISK_SCORE_FIELDS)
+assert flat["base_risk"].tolist() == [0.62, 0.0, 0.4]
+assert risk_records(columns, ("id",), rows=[2, 0]) == [{"id": "exchange"}, {"id": "0xaaa"}]
+
+# Export batches cover every row once, in order or sorted by a score
+batches = list(export_rows(columns, FINAL_RISK_FIELDS, batch_size=2))
+assert [len(b) for b in batches] == [2, 1]
+assert sum(batches, []) == expected_final
+
+by_final = sum(export_rows(columns, FINAL_RISK_FIELDS, sort="final_risk"), [])
+assert [r["id"] for r in by_final] == ["0xaaa", "exchange", "0xbbb"]
+by_base = sum(export_rows(columns, ("id",), sort="base_risk", descending=False), [])
+assert [r["id"] for r in by_base] == ["0xbbb", "exchange", "0xaaa"]
+
+try:
+    export_rows(columns, ("id",), sort="temporal_risk")
+    raise AssertionError("expected ValueError")
+except ValueError:
+    pass
+
+# New score objects (e.g. after an append) rebuild the columns
+results["gnn_risks"] = {}
+assert risk_columns(results) is not columns
+assert risk_columns(results)["gnn_enabled"] is False
+
+print("\n=== Risk Columns ===")
+print(risk_records(columns, FINAL_RISK_FIELDS))
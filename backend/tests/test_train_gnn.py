@@ -0,0 +1,81 @@
+import os, sys, tempfile
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BASE_DIR)
+
+import numpy as np
+import pandas as pd
+import torch
+
+from benchmarks.synthetic import make_labels, make_transactions
+from core.gnn_cpu import load_model, run_gnn_refinement
+from core.pipeline import run_full_analysis
+from core.train_gnn import load_labels, split_nodes, train_from_analysis, training_targets
+
+with tempfile.TemporaryDirectory() as tmp:
+    csv_path = os.path.join(tmp, "tx.csv")
+    make_transactions(5000, seed=3).to_csv(csv_path, index=False)
+    results = run_full_analysis(csv_path, cache_dir=tmp, memoize=False)
+    graph = results["graph"]
+
+    # base_risk is a model input, so it is never a training target
+    for missing in (None, {}):
+        try:
+            train_from_analysis(results, labels=missing, path=os.path.join(tmp, "x.pt"))
+            raise AssertionError("trained without labels")
+        except ValueError:
+            pass
+
+    synthetic = make_labels(graph)
+    targets, mask = training_targets(graph, synthetic)
+    assert mask.all() and 0 < targets.sum() < graph.num_nodes
+
+    train_ids, val_ids = split_nodes(mask, 0.2)
+    assert not set(train_ids) & set(val_ids)
+    assert len(train_ids) + len(val_ids) == mask.sum()
+
+    # Best weights are checkpointed where inference loads them
+    path = os.path.join(tmp, "gnn.pt")
+    trained = train_from_analysis(results, labels=synthetic, path=path, epochs=60, log=lambda line: None)
+    history = trained["history"]
+    print("best epoch:", trained["epoch"], "val loss:", round(trained["val_loss"], 5))
+
+    assert trained["val_loss"] == min(h["val_loss"] for h in history)
+    assert trained["val_loss"] < history[0]["val_loss"]
+
+    model, _ = load_model(path)
+    assert torch.equal(model.linear.weight, trained["model"].linear.weight)
+    checkpoint = torch.load(path, weights_only=True)
+    assert checkpoint["target"] == "labels" and checkpoint["epoch"] == trained["epoch"]
+
+    scores = run_gnn_refinement(graph, results["node_features"], results["base_risks"], model=model)
+    assert len(scores) == graph.num_nodes
+
+    # Labeled CSVs: later files win, unknown wallets are ignored
+    wallets = graph.wallets.tolist()
+    first = os.path.join(tmp, "labels1.csv")
+    second = os.path.join(tmp, "labels2.csv")
+    pd.DataFrame({"Wallet_ID": wallets[:3] + ["0xunknown"], "Label": [1, 0, 1, 1]}).to_csv(first, index=False)
+    pd.DataFrame({"Wallet_ID": wallets[:1], "Label": [0]}).to_csv(second, index=False)
+
+    labels = load_labels([first, second])
+    assert labels[wallets[0]] == 0.0 and labels[wallets[2]] == 1.0
+
+    targets, mask = training_targets(graph, labels)
+    assert mask.sum() == 3 and targets[mask].tolist() == [0.0, 0.0, 1.0]
+
+    trained = train_from_analysis(results, labels=labels, path=path, epochs=5, log=lambda line: None)
+    assert torch.load(path, weights_only=True)["target"] == "labels"
+
+    try:
+        training_targets(graph, {"0xunknown": 1.0})
+        raise AssertionError("labels without graph wallets accepted")
+    except ValueError:
+        pass
+
+    pd.DataFrame({"Wallet_ID": wallets[:1], "Label": [2]}).to_csv(second, index=False)
+    try:
+        load_labels([second])
+        raise AssertionError("out-of-range label accepted")
+    except ValueError:
+        pass
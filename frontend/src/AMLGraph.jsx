@@ -3,16 +3,23 @@ import * as d3 from "d3";
 
 const BASE_URL = "http://127.0.0.1:8000/api";
 
-export default function AMLGraph() {
+// Highest-risk nodes drawn; the full graph is too large for the force layout
+const GRAPH_TOP_K = 500;
+
+export default function AMLGraph({ datasetId, analysisId }) {
   const svgRef = useRef(null);
 
   useEffect(() => {
-    Promise.all([
-      fetch(`${BASE_URL}/graph/`).then(r => r.json()),
-      fetch(`${BASE_URL}/final-risk/`).then(r => r.json()),
-      fetch(`${BASE_URL}/risk-scores/`).then(r => r.json())
-    ])
-      .then(([graph, finalRisk, riskScores]) => {
+    // The API only serves an explicitly named dataset
+    if (!datasetId) return;
+    // analysisId names the parameterized run (defaults apply without it)
+    const query = `?dataset_id=${datasetId}` + (analysisId ? `&analysis_id=${analysisId}` : "");
+
+    // Graph nodes carry their base and final risk, so the full score
+    // lists are not downloaded for the few hundred nodes drawn
+    fetch(`${BASE_URL}/graph/${query}&top_k=${GRAPH_TOP_K}`)
+      .then(r => r.json())
+      .then(graph => {
 
         /* ============================
            📊 CONSOLE LOGGING (DEBUG / JUDGES)
@@ -22,44 +29,21 @@ export default function AMLGraph() {
         console.log(graph);
         console.groupEnd();
 
-        console.group("🎯 API RESPONSE — /api/final-risk");
-        console.log("Timestamp:", new Date().toISOString());
-        console.log(finalRisk);
-        console.groupEnd();
-
-        console.group("🔥 API RESPONSE — /api/risk-scores");
-        console.log("Timestamp:", new Date().toISOString());
-        console.log(riskScores);
-        console.groupEnd();
-
-        renderGraph(graph, finalRisk, riskScores);
+        renderGraph(graph);
       })
       .catch(err => {
         console.group("❌ API ERROR");
         console.error(err);
         console.groupEnd();
       });
-  }, []);
+  }, [datasetId, analysisId]);
 
-  const renderGraph = (graph, finalRisk, riskScores) => {
+  const renderGraph = graph => {
     if (!svgRef.current) return;
 
     const width = window.innerWidth;
     const height = window.innerHeight;
 
-    /* ============================
-       RISK MAPS
-    ============================ */
-    const riskMap = {};
-    (finalRisk?.wallets || []).forEach(w => {
-      riskMap[w.id] = w;
-    });
-
-    const riskScoresMap = {};
-    (riskScores?.wallets || []).forEach(w => {
-      riskScoresMap[w.id] = w;
-    });
-
     const svg = d3
       .select(svgRef.current)
       .attr("width", width)
@@ -174,25 +158,23 @@ export default function AMLGraph() {
       .append("circle")
       .attr("r", d => radius(degree[d.id] || 1))
       .attr("fill", d => {
-        const r = riskMap[d.id]?.final_risk ?? 0;
+        const r = d.final_risk ?? 0;
         if (r >= 0.85) return "#dc2626";
         if (r >= 0.6) return "#f97316";
         if (r >= 0.3) return "#22c55e";
         return "#2563eb";
       })
       .attr("filter", d =>
-        riskMap[d.id]?.final_risk >= 0.85 ? "url(#glow)" : null
+        d.final_risk >= 0.85 ? "url(#glow)" : null
       )
       .on("mouseover", (e, d) => {
-        const info = riskMap[d.id];
-        const base = riskScoresMap[d.id]?.base_risk;
         tooltip
           .style("opacity", 1)
           .html(`
             <strong>${d.id}</strong><br/>
-            Final Risk: ${(info?.final_risk * 100).toFixed(1)}%<br/>
-            Base Risk: ${(base * 100).toFixed(1)}%<br/>
-            ${info?.reasons?.map(r => `• ${r}`).join("<br/>") || ""}
+            Final Risk: ${(d.final_risk * 100).toFixed(1)}%<br/>
+            Base Risk: ${(d.risk * 100).toFixed(1)}%<br/>
+            ${d.reasons?.map(r => `• ${r}`).join("<br/>") || ""}
           `);
       })
       .on("mousemove", e => {
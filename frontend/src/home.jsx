@@ -199,6 +199,8 @@ export default function GraphGuardHome() {
   const [popupType, setPopupType] = useState("success");
   const [showGraph, setShowGraph] = useState(false);
   const [showUploader, setShowUploader] = useState(false);
+  const [datasetId, setDatasetId] = useState(null);
+  const [analysisId, setAnalysisId] = useState(null);
 
   useEffect(() => {
     const csvInput = csvInputRef.current;
@@ -259,7 +261,9 @@ export default function GraphGuardHome() {
       });
 
       if (!res.ok) throw new Error();
+      const { dataset_id } = await res.json();
 
+      setDatasetId(dataset_id);
       setCanAnalyze(true);
       showSuccess("CSV uploaded successfully.");
     } catch {
@@ -272,11 +276,28 @@ export default function GraphGuardHome() {
       const res = await fetch(`${BASE_URL}/analyze/`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ dataset_id: datasetId }),
       });
 
       if (!res.ok) throw new Error();
+      const { job_id, analysis_id } = await res.json();
 
-      showSuccess("Analysis started. Rendering graph…");
+      showSuccess("Analysis started. Waiting for results…");
+
+      // Analysis runs in the background; poll until it finishes
+      for (;;) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+
+        const statusRes = await fetch(`${BASE_URL}/analyze/${job_id}/`);
+        if (!statusRes.ok) throw new Error();
+
+        const status = await statusRes.json();
+        if (status.state === "failed") throw new Error();
+        if (status.state === "done") break;
+      }
+
+      setAnalysisId(analysis_id);
+      showSuccess("Analysis completed. Rendering graph…");
       setShowGraph(true);
     } catch {
       showError("Analysis failed.");
@@ -392,7 +413,7 @@ export default function GraphGuardHome() {
         </>
       )}
 
-      {showGraph && <AMLGraph />}
+      {showGraph && <AMLGraph datasetId={datasetId} analysisId={analysisId} />}
 
       <style>{`
         .animate-fadein { animation: fadein 0.4s ease-out }